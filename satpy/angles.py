@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Sun and satellite angles of an area, computed once and shared.
+
+The compositors and modifiers needing the sun or satellite angles of the data
+they work on get them from this module instead of computing them on their
+own. The angles are lazy dask arrays, cached in memory by area, time,
+satellite position and chunking, so that all the composites of a scene use
+the very same arrays, and the angles are computed only once when the
+composites are computed together.
+
+A few environment variables control the caching:
+
+- ``SATPY_ANGLE_CACHE_SIZE``: the number of arrays kept in memory (default
+  32).
+- ``SATPY_ANGLE_TIME_RESOLUTION``: if set to a number of seconds, the times
+  are rounded to a multiple of it before computing the angles, so that for
+  example all the segments or channels of a slot share the same angles.
+  Default is 0, meaning no rounding.
+- ``SATPY_ANGLE_CACHE_DIR``: a directory where the satellite angles of
+  fixed grids (:class:`~pyresample.geometry.AreaDefinition`) are saved as
+  memory-mapped ``.npy`` files, to be reused by later runs. As the
+  positions of geostationary satellites change slightly from one slot to the
+  next, the satellite position is rounded to 0.01 degrees and 1 km for
+  finding the files. Disabled by default.
+
+"""
+
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+import dask.array as da
+from pyresample.geometry import AreaDefinition
+
+from satpy import CHUNK_SIZE
+from satpy.utils import SizedLRUCache, save_npy_cache, load_npy_cache, get_area_lonlats
+
+LOG = logging.getLogger(__name__)
+
+ANGLE_CACHE_SIZE = int(os.getenv('SATPY_ANGLE_CACHE_SIZE', 32))
+ANGLE_TIME_RESOLUTION = float(os.getenv('SATPY_ANGLE_TIME_RESOLUTION', 0))
+ANGLE_CACHE_DIR = os.getenv('SATPY_ANGLE_CACHE_DIR')
+
+angle_cache = SizedLRUCache(ANGLE_CACHE_SIZE, sizeof=lambda val: 1)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _quantise_time(utc_time):
+    """Round *utc_time* to a multiple of `ANGLE_TIME_RESOLUTION` seconds."""
+    if not ANGLE_TIME_RESOLUTION or not isinstance(utc_time, datetime):
+        return utc_time
+    seconds = (utc_time - _EPOCH).total_seconds()
+    seconds = round(seconds / ANGLE_TIME_RESOLUTION) * ANGLE_TIME_RESOLUTION
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def _cached(key, func, *args):
+    try:
+        return angle_cache[key]
+    except KeyError:
+        pass
+    res = func(*args)
+    angle_cache[key] = res
+    return res
+
+
+def _compute_lonlats(area, chunks):
+    lons, lats = get_area_lonlats(area, chunks=chunks)
+    lons = da.where(lons >= 1e30, np.nan, lons)
+    lats = da.where(lats >= 1e30, np.nan, lats)
+    return lons, lats
+
+
+def get_lonlats(area, chunks=CHUNK_SIZE):
+    """Get the longitudes and latitudes of *area*, with invalid values set to NaN."""
+    return _cached(('lonlats', hash(area), chunks), _compute_lonlats, area, chunks)
+
+
+def _compute_cos_sza(area, utc_time, chunks):
+    from pyorbital.astronomy import cos_zen
+    lons, lats = get_lonlats(area, chunks)
+    return cos_zen(utc_time, lons, lats)
+
+
+def get_cos_sza(area, utc_time, chunks=CHUNK_SIZE):
+    """Get the cosine of the sun zenith angles of *area* at *utc_time*."""
+    utc_time = _quantise_time(utc_time)
+    return _cached(('cos_sza', hash(area), utc_time, chunks),
+                   _compute_cos_sza, area, utc_time, chunks)
+
+
+def _compute_sun_angles(area, utc_time, chunks):
+    from pyorbital.astronomy import get_alt_az, sun_zenith_angle
+    lons, lats = get_lonlats(area, chunks)
+    suna = get_alt_az(utc_time, lons, lats)[1]
+    suna = np.rad2deg(suna)
+    sunz = sun_zenith_angle(utc_time, lons, lats)
+    return suna, sunz
+
+
+def get_sun_angles(area, utc_time, chunks=CHUNK_SIZE):
+    """Get the sun azimuth and zenith angles (degrees) of *area* at *utc_time*."""
+    utc_time = _quantise_time(utc_time)
+    return _cached(('sun_angles', hash(area), utc_time, chunks),
+                   _compute_sun_angles, area, utc_time, chunks)
+
+
+def _compute_satellite_angles(area, utc_time, satpos, chunks):
+    from pyorbital.orbital import get_observer_look
+    lons, lats = get_lonlats(area, chunks)
+    sat_lon, sat_lat, sat_alt = satpos
+    sata, satel = get_observer_look(
+        sat_lon,
+        sat_lat,
+        sat_alt / 1000.0,  # km
+        utc_time,
+        lons, lats, 0)
+    satz = 90 - satel
+    return sata, satz
+
+
+def _get_satellite_angles_cache_filename(area, satpos):
+    the_hash = area.update_hash(hashlib.sha1())
+    sat_lon, sat_lat, sat_alt = satpos
+    the_hash.update(str((round(sat_lon, 2), round(sat_lat, 2), round(sat_alt / 1000.0))).encode())
+    return os.path.join(ANGLE_CACHE_DIR, 'sat_angles-{}.npy'.format(the_hash.hexdigest()))
+
+
+def _compute_or_load_satellite_angles(area, utc_time, satpos, chunks):
+    if not ANGLE_CACHE_DIR or not isinstance(area, AreaDefinition):
+        return _compute_satellite_angles(area, utc_time, satpos, chunks)
+    filename = _get_satellite_angles_cache_filename(area, satpos)
+    try:
+        cached = load_npy_cache(filename, ('azimuth', 'zenith'))
+        LOG.debug("Loading satellite angles from %s", filename)
+    except IOError:
+        sata, satz = _compute_satellite_angles(area, utc_time, satpos, chunks)
+        LOG.debug("Saving satellite angles to %s", filename)
+        save_npy_cache(filename, {'azimuth': sata, 'zenith': satz})
+        cached = load_npy_cache(filename, ('azimuth', 'zenith'))
+    return tuple(da.from_array(cached[name], chunks=chunks) for name in ('azimuth', 'zenith'))
+
+
+def get_satellite_angles(area, utc_time, satpos, chunks=CHUNK_SIZE):
+    """Get the satellite azimuth and zenith angles (degrees) of *area*.
+
+    Args:
+        area: Area of the data.
+        utc_time (datetime): Time of the observation.
+        satpos (tuple): Satellite longitude, latitude (degrees) and altitude
+            (meters), as returned by :func:`satpy.utils.get_satpos`.
+        chunks: Chunks of the returned arrays.
+
+    """
+    utc_time = _quantise_time(utc_time)
+    return _cached(('satellite_angles', hash(area), utc_time, tuple(satpos), chunks),
+                   _compute_or_load_satellite_angles, area, utc_time, satpos, chunks)
+
+
+def get_angles(area, utc_time, satpos, chunks=CHUNK_SIZE):
+    """Get the satellite and sun angles of *area*.
+
+    Returns:
+        Satellite azimuth, satellite zenith, sun azimuth and sun zenith angles
+        in degrees.
+
+    """
+    sata, satz = get_satellite_angles(area, utc_time, satpos, chunks)
+    suna, sunz = get_sun_angles(area, utc_time, chunks)
+    return sata, satz, suna, sunz
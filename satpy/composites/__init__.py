@@ -26,18 +26,14 @@ from weakref import WeakValueDictionary
 import dask.array as da
 import numpy as np
 import xarray as xr
-import yaml
 
-try:
-    from yaml import UnsafeLoader
-except ImportError:
-    from yaml import Loader as UnsafeLoader
-
-from satpy.config import CONFIG_PATH, config_search_paths, recursive_dict_update
+from satpy.angles import get_angles, get_cos_sza
+from satpy.config import CONFIG_PATH, config_search_paths, read_yaml_file, recursive_dict_update
 from satpy.config import get_environ_ancpath, get_entry_points_config_dirs
 from satpy.dataset import DATASET_KEYS, DatasetID, MetadataObject, combine_metadata
 from satpy.readers import DatasetDict
-from satpy.utils import sunzen_corr_cos, atmospheric_path_length_correction, get_satpos
+from satpy.utils import sunzen_corr_cos, atmospheric_path_length_correction, get_satpos, get_area_lonlats
+from satpy.utils import SizedLRUCache, match_float_dtype
 from satpy.writers import get_enhanced_image
 
 try:
@@ -72,8 +68,28 @@ class IncompatibleTimes(Exception):
     pass
 
 
+def _get_file_stamp(filename):
+    """Get the modification time and size of *filename*, `None` if missing."""
+    try:
+        stat = os.stat(filename)
+    except (OSError, TypeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# (sensor name, config files) -> (files read and their stamps,
+#                                 sensor id -> (compositors, modifiers))
+sensor_composites_cache = SizedLRUCache(64, sizeof=lambda val: 1)
+
+
 class CompositorLoader(object):
-    """Read composites using the configuration files on disk."""
+    """Read composites using the configuration files on disk.
+
+    The compositors created from the configuration files of a sensor are
+    shared by all the loaders, so that the scenes of a same sensor don't
+    create them again. They are created again if one of the files changed.
+
+    """
 
     def __init__(self, ppp_config_dir=None):
         """Initialize the compositor loader."""
@@ -82,6 +98,7 @@ class CompositorLoader(object):
         self.modifiers = {}
         self.compositors = {}
         self.ppp_config_dir = ppp_config_dir
+        self._read_configs = []
 
     def load_sensor_composites(self, sensor_name):
         """Load all compositor configs for the provided sensor."""
@@ -96,7 +113,26 @@ class CompositorLoader(object):
             LOG.debug("No composite config found called {}".format(
                 config_filename))
             return
+
+        cache_key = (sensor_name, tuple(composite_configs))
+        cached = sensor_composites_cache.get(cache_key)
+        if cached is not None and all(_get_file_stamp(filename) == stamp for filename, stamp in cached[0]):
+            LOG.debug("Using already loaded composites for %s", sensor_name)
+            self._read_configs.extend(cached[0])
+            for sensor_id, (compositors, modifiers) in cached[1].items():
+                self.compositors.setdefault(sensor_id, DatasetDict(compositors))
+                self.modifiers.setdefault(sensor_id, modifiers.copy())
+            return
+
+        first_config = len(self._read_configs)
+        known_sensors = set(self.compositors)
         self._load_config(composite_configs)
+        read_configs = self._read_configs[first_config:]
+        if all(stamp is not None for _, stamp in read_configs):
+            sensor_composites_cache[cache_key] = (
+                read_configs,
+                {sensor_id: (DatasetDict(self.compositors[sensor_id]), self.modifiers[sensor_id].copy())
+                 for sensor_id in set(self.compositors) - known_sensors})
 
     def get_compositor(self, key, sensor_names):
         """Get the modifier for *sensor_names*."""
@@ -203,8 +239,8 @@ class CompositorLoader(object):
 
         conf = {}
         for composite_config in composite_configs:
-            with open(composite_config) as conf_file:
-                conf = recursive_dict_update(conf, yaml.load(conf_file, Loader=UnsafeLoader))
+            self._read_configs.append((composite_config, _get_file_stamp(composite_config)))
+            conf = recursive_dict_update(conf, read_yaml_file(composite_config))
         try:
             sensor_name = conf['sensor_name']
         except KeyError:
@@ -362,9 +398,11 @@ class CompositeBase(MetadataObject):
 
 
 class SunZenithCorrectorBase(CompositeBase):
-    """Base class for sun zenith correction."""
+    """Base class for sun zenith correction.
 
-    coszen = WeakValueDictionary()
+    The sun zenith angles are taken from :mod:`satpy.angles`, so they are
+    only computed once for all the channels of the same area and time.
+    """
 
     def __init__(self, max_sza=95.0, **kwargs):
         """Collect custom configuration values.
@@ -386,31 +424,23 @@ class SunZenithCorrectorBase(CompositeBase):
             LOG.debug("Sun zen correction already applied")
             return vis
 
-        area_name = hash(vis.attrs['area'])
-        key = (vis.attrs["start_time"], area_name)
         tic = time.time()
         LOG.debug("Applying sun zen correction")
-        coszen = self.coszen.get(key)
-        if coszen is None and not info.get('optional_datasets'):
+        if not info.get('optional_datasets'):
             # we were not given SZA, generate SZA then calculate cos(SZA)
-            from pyorbital.astronomy import cos_zen
-            LOG.debug("Computing sun zenith angles.")
-            lons, lats = vis.attrs["area"].get_lonlats(chunks=vis.data.chunks)
-
+            LOG.debug("Getting sun zenith angles.")
             coords = {}
             if 'y' in vis.coords and 'x' in vis.coords:
                 coords['y'] = vis['y']
                 coords['x'] = vis['x']
-            coszen = xr.DataArray(cos_zen(vis.attrs["start_time"], lons, lats),
+            coszen = xr.DataArray(get_cos_sza(vis.attrs["area"], vis.attrs["start_time"],
+                                              chunks=vis.data.chunks),
                                   dims=['y', 'x'], coords=coords)
             if self.max_sza is not None:
                 coszen = coszen.where(coszen >= self.max_sza_cos)
-            self.coszen[key] = coszen
-        elif coszen is None:
+        else:
             # we were given the SZA, calculate the cos(SZA)
             coszen = np.cos(np.deg2rad(projectables[1]))
-            self.coszen[key] = coszen
-
         proj = self._apply_correction(vis, coszen)
         proj.attrs = vis.attrs.copy()
         self.apply_modifier_info(vis, proj)
@@ -513,25 +543,8 @@ class PSPRayleighReflectance(CompositeBase):
 
     def get_angles(self, vis):
         """Get the sun and satellite angles from the current dataarray."""
-        from pyorbital.astronomy import get_alt_az, sun_zenith_angle
-        from pyorbital.orbital import get_observer_look
-
-        lons, lats = vis.attrs['area'].get_lonlats(chunks=vis.data.chunks)
-        lons = da.where(lons >= 1e30, np.nan, lons)
-        lats = da.where(lats >= 1e30, np.nan, lats)
-        sunalt, suna = get_alt_az(vis.attrs['start_time'], lons, lats)
-        suna = np.rad2deg(suna)
-        sunz = sun_zenith_angle(vis.attrs['start_time'], lons, lats)
-
-        sat_lon, sat_lat, sat_alt = get_satpos(vis)
-        sata, satel = get_observer_look(
-            sat_lon,
-            sat_lat,
-            sat_alt / 1000.0,  # km
-            vis.attrs['start_time'],
-            lons, lats, 0)
-        satz = 90 - satel
-        return sata, satz, suna, sunz
+        return get_angles(vis.attrs['area'], vis.attrs['start_time'], get_satpos(vis),
+                          chunks=vis.data.chunks)
 
     def __call__(self, projectables, optional_datasets=None, **info):
         """Get the corrected reflectance when removing Rayleigh scattering.
@@ -612,11 +625,11 @@ class NIRReflectance(CompositeBase):
         Not supposed to be used for wavelength outside [3, 4] µm.
 
         """
-        self._init_refl3x(projectables)
+        refl3x = self._init_refl3x(projectables)
         _nir, _ = projectables
         projectables = self.match_data_arrays(projectables)
 
-        refl = self._get_reflectance(projectables, optional_datasets) * 100
+        refl = self._get_reflectance(refl3x, projectables, optional_datasets) * 100
         proj = xr.DataArray(refl, dims=_nir.dims,
                             coords=_nir.coords, attrs=_nir.attrs)
 
@@ -626,16 +639,22 @@ class NIRReflectance(CompositeBase):
         return proj
 
     def _init_refl3x(self, projectables):
-        """Initialize the 3.x reflectance derivations."""
+        """Initialize the 3.x reflectance derivations.
+
+        The calculator keeps the results of the last derivation, so a new one
+        is created for every call: the compositors are shared between the
+        scenes and must not hold any per-call state.
+
+        """
         if not Calculator:
             LOG.info("Couldn't load pyspectral")
             raise ImportError("No module named pyspectral.near_infrared_reflectance")
         _nir, _tb11 = projectables
-        self._refl3x = Calculator(_nir.attrs['platform_name'], _nir.attrs['sensor'], _nir.attrs['name'],
-                                  sunz_threshold=self.sunz_threshold)
+        return Calculator(_nir.attrs['platform_name'], _nir.attrs['sensor'], _nir.attrs['name'],
+                          sunz_threshold=self.sunz_threshold)
 
-    def _get_reflectance(self, projectables, optional_datasets):
-        """Calculate 3.x reflectance with pyspectral."""
+    def _get_reflectance(self, refl3x, projectables, optional_datasets):
+        """Calculate 3.x reflectance with the pyspectral calculator *refl3x*."""
         _nir, _tb11 = projectables
         LOG.info('Getting reflective part of %s', _nir.attrs['name'])
         da_nir = _nir.data
@@ -656,10 +675,10 @@ class NIRReflectance(CompositeBase):
         if sun_zenith is None:
             if sun_zenith_angle is None:
                 raise ImportError("No module named pyorbital.astronomy")
-            lons, lats = _nir.attrs["area"].get_lonlats(chunks=_nir.data.chunks)
+            lons, lats = get_area_lonlats(_nir.attrs["area"], chunks=_nir.data.chunks)
             sun_zenith = sun_zenith_angle(_nir.attrs['start_time'], lons, lats)
 
-        return self._refl3x.reflectance_from_tbs(sun_zenith, da_nir, da_tb11, tb_ir_co2=tb13_4)
+        return refl3x.reflectance_from_tbs(sun_zenith, da_nir, da_tb11, tb_ir_co2=tb13_4)
 
 
 class NIREmissivePartFromReflectance(NIRReflectance):
@@ -684,15 +703,15 @@ class NIREmissivePartFromReflectance(NIRReflectance):
 
         """
         projectables = self.match_data_arrays(projectables)
-        self._init_refl3x(projectables)
+        refl3x = self._init_refl3x(projectables)
         # Derive the sun-zenith angles, and use the nir and thermal ir
         # brightness tempertures and derive the reflectance using
         # PySpectral. The reflectance is stored internally in PySpectral and
         # needs to be derived first in order to get the emissive part.
-        _ = self._get_reflectance(projectables, optional_datasets)
+        _ = self._get_reflectance(refl3x, projectables, optional_datasets)
         _nir, _ = projectables
 
-        emis = self._refl3x.emissive_part_3x()
+        emis = refl3x.emissive_part_3x()
         proj = xr.DataArray(emis, attrs=_nir.attrs, dims=_nir.dims, coords=_nir.coords)
 
         proj.attrs['units'] = 'K'
@@ -717,7 +736,7 @@ class PSPAtmosphericalCorrection(CompositeBase):
             satz = optional_datasets[0]
         else:
             from pyorbital.orbital import get_observer_look
-            lons, lats = band.attrs['area'].get_lonlats(chunks=band.data.chunks)
+            lons, lats = get_area_lonlats(band.attrs['area'], chunks=band.data.chunks)
             sat_lon, sat_lat, sat_alt = get_satpos(band)
             try:
                 dummy, satel = get_observer_look(sat_lon,
@@ -1082,16 +1101,15 @@ class DayNightCompositor(GenericCompositor):
         try:
             coszen = np.cos(np.deg2rad(projectables[2]))
         except IndexError:
-            from pyorbital.astronomy import cos_zen
-            LOG.debug("Computing sun zenith angles.")
+            LOG.debug("Getting sun zenith angles.")
             # Get chunking that matches the data
             try:
                 chunks = day_data.sel(bands=day_data['bands'][0]).chunks
             except KeyError:
                 chunks = day_data.chunks
-            lons, lats = day_data.attrs["area"].get_lonlats(chunks=chunks)
-            coszen = xr.DataArray(cos_zen(day_data.attrs["start_time"],
-                                          lons, lats),
+            coszen = xr.DataArray(get_cos_sza(day_data.attrs["area"],
+                                              day_data.attrs["start_time"],
+                                              chunks=chunks),
                                   dims=['y', 'x'],
                                   coords=[day_data['y'], day_data['x']])
         # Calculate blending weights
@@ -1102,6 +1120,8 @@ class DayNightCompositor(GenericCompositor):
         # Apply enhancements to get images
         day_data = enhance2dataset(day_data)
         night_data = enhance2dataset(night_data)
+        # the weights from the 64-bit angles shouldn't upcast the images
+        coszen = match_float_dtype(coszen, day_data)
 
         # Adjust bands so that they match
         # L/RGB -> RGB/RGB
@@ -1131,8 +1151,8 @@ def enhance2dataset(dset):
     """Return the enhancemened to dataset *dset* as an array."""
     attrs = dset.attrs
     img = get_enhanced_image(dset)
-    # Clip image data to interval [0.0, 1.0]
-    data = img.data.clip(0.0, 1.0)
+    # Clip image data to interval [0.0, 1.0], in the precision of the data
+    data = match_float_dtype(img.data.clip(0.0, 1.0), dset)
     data.attrs = attrs
     # remove 'mode' if it is specified since it may have been updated
     data.attrs.pop('mode', None)
@@ -1546,11 +1566,12 @@ class StaticImageCompositor(GenericCompositor):
         """Call the compositor."""
         from satpy import Scene
         # Check if filename exists, if not then try from SATPY_ANCPATH
-        if not os.path.isfile(self.filename):
-            tmp_filename = os.path.join(get_environ_ancpath(), self.filename)
+        filename = self.filename
+        if not os.path.isfile(filename):
+            tmp_filename = os.path.join(get_environ_ancpath(), filename)
             if os.path.isfile(tmp_filename):
-                self.filename = tmp_filename
-        scn = Scene(reader='generic_image', filenames=[self.filename])
+                filename = tmp_filename
+        scn = Scene(reader='generic_image', filenames=[filename])
         scn.load(['image'])
         img = scn['image']
         # use compositor parameters as extra metadata
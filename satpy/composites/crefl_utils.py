@@ -26,6 +26,8 @@ import numpy as np
 import xarray as xr
 import dask.array as da
 
+from satpy.utils import match_float_dtype
+
 LOG = logging.getLogger(__name__)
 
 bUseV171 = False
@@ -449,6 +451,10 @@ def run_crefl(refl, coeffs,
         sphalb, rhoray, TtotraytH2O, tOG = get_atm_variables(mus, muv, phi, height, *coeffs)
 
     del solar_azimuth, solar_zenith, sensor_zenith, sensor_azimuth
+    # the atmospheric variables are computed from the 64-bit angles, apply
+    # them in the precision of the reflectances
+    sphalb, rhoray, TtotraytH2O, tOG = (match_float_dtype(var, refl)
+                                        for var in (sphalb, rhoray, TtotraytH2O, tOG))
     # Note: Assume that fill/invalid values are either NaN or we are dealing
     # with masked arrays
     if percent:
@@ -25,10 +25,11 @@ import dask
 import dask.array as da
 import xarray as xr
 
+from satpy.angles import get_angles
 from satpy.composites import CompositeBase, GenericCompositor
 from satpy.config import get_environ_ancpath
 from satpy.dataset import combine_metadata
-from satpy.utils import get_satpos
+from satpy.utils import get_satpos, get_area_lonlats, get_float_dtype
 
 LOG = logging.getLogger(__name__)
 
@@ -114,7 +115,7 @@ class ReflectanceCorrector(CompositeBase):
             nc = NCDataset(self.dem_file, "r")
             # average elevation is stored as a 16-bit signed integer but with
             # scale factor 1 and offset 0, convert it to float here
-            avg_elevation = nc.variables[self.dem_sds][:].astype(np.float)
+            avg_elevation = nc.variables[self.dem_sds][:].astype(get_float_dtype())
             if isinstance(avg_elevation, np.ma.MaskedArray):
                 avg_elevation = avg_elevation.filled(np.nan)
         else:
@@ -128,7 +129,7 @@ class ReflectanceCorrector(CompositeBase):
                                         refl_data.attrs["wavelength"],
                                         refl_data.attrs["resolution"])
         use_abi = vis.attrs['sensor'] == 'abi'
-        lons, lats = vis.attrs['area'].get_lonlats(chunks=vis.chunks)
+        lons, lats = get_area_lonlats(vis.attrs['area'], chunks=vis.chunks)
         results = run_crefl(refl_data,
                             coefficients,
                             lons,
@@ -150,23 +151,8 @@ class ReflectanceCorrector(CompositeBase):
 
     def get_angles(self, vis):
         """Get sun and satellite angles to use in crefl calculations."""
-        from pyorbital.astronomy import get_alt_az, sun_zenith_angle
-        from pyorbital.orbital import get_observer_look
-        lons, lats = vis.attrs['area'].get_lonlats(chunks=vis.data.chunks)
-        lons = da.where(lons >= 1e30, np.nan, lons)
-        lats = da.where(lats >= 1e30, np.nan, lats)
-        suna = get_alt_az(vis.attrs['start_time'], lons, lats)[1]
-        suna = np.rad2deg(suna)
-        sunz = sun_zenith_angle(vis.attrs['start_time'], lons, lats)
-        sat_lon, sat_lat, sat_alt = get_satpos(vis)
-        sata, satel = get_observer_look(
-            sat_lon,
-            sat_lat,
-            sat_alt / 1000.0,  # km
-            vis.attrs['start_time'],
-            lons, lats, 0)
-        satz = 90 - satel
-        return sata, satz, suna, sunz
+        return get_angles(vis.attrs['area'], vis.attrs['start_time'], get_satpos(vis),
+                          chunks=vis.data.chunks)
 
 
 class HistogramDNB(CompositeBase):
@@ -18,10 +18,15 @@
 """Satpy Configuration directory and file handling."""
 from __future__ import print_function
 
+import atexit
 import configparser
+import copy
 import glob
 import logging
 import os
+import pickle
+import tempfile
+import threading
 from collections import OrderedDict
 from collections.abc import Mapping
 
@@ -56,6 +61,9 @@ def get_environ_ancpath(default='.'):
 # FIXME: Old readers still use only this, but this may get updated by Scene
 CONFIG_PATH = get_environ_config_dir()
 
+# Directory where the parsed YAML configuration files are cached
+CONFIG_CACHE_DIR = os.environ.get('SATPY_CONFIG_CACHE_DIR')
+
 
 def runtime_import(object_path):
     """Import at runtime."""
@@ -148,6 +156,106 @@ def recursive_dict_update(d, u):
     return d
 
 
+class _YAMLConfigCache(object):
+    """Cache of the parsed YAML configuration files.
+
+    The parsed files are kept in memory, keyed by the file path, modification
+    time and size and the YAML loader used. If `CONFIG_CACHE_DIR` is set, they
+    are also pickled to a single file in that directory (one per satpy
+    version), so that new processes only need to load that file instead of
+    parsing all the YAML files they use. The file is written once, when the
+    process exits or :meth:`save` is called, if new files have been parsed.
+
+    """
+
+    def __init__(self):
+        """Initialize the empty cache."""
+        self._configs = {}
+        self._loaded_from = None
+        self._dirty = False
+        self._lock = threading.Lock()
+        atexit.register(self.save)
+
+    @staticmethod
+    def _get_cache_filename():
+        import satpy
+        version = getattr(satpy, '__version__', 'unknown')
+        return os.path.join(CONFIG_CACHE_DIR, "satpy_configs-{}.pickle".format(version))
+
+    def _load(self):
+        """Load the pickled configs from `CONFIG_CACHE_DIR` the first time it is used."""
+        if not CONFIG_CACHE_DIR or self._loaded_from == CONFIG_CACHE_DIR:
+            return
+        self._loaded_from = CONFIG_CACHE_DIR
+        filename = self._get_cache_filename()
+        try:
+            with open(filename, 'rb') as fd:
+                self._configs.update(pickle.load(fd))
+            LOG.debug("Loaded cached configs from %s", filename)
+        except (IOError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            LOG.debug("Could not load cached configs from %s", filename)
+
+    def save(self):
+        """Pickle the configs to `CONFIG_CACHE_DIR` if files were parsed since the last save."""
+        with self._lock:
+            if not CONFIG_CACHE_DIR or not self._dirty:
+                return
+            self._dirty = False
+            filename = self._get_cache_filename()
+            tmp_filename = None
+            try:
+                os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+                fd, tmp_filename = tempfile.mkstemp(dir=CONFIG_CACHE_DIR)
+                with os.fdopen(fd, 'wb') as fd:
+                    pickle.dump(self._configs, fd, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_filename, filename)
+            except (IOError, pickle.PicklingError, AttributeError, TypeError):
+                LOG.debug("Could not save the cached configs to %s", filename, exc_info=True)
+                if tmp_filename is not None and os.path.exists(tmp_filename):
+                    os.unlink(tmp_filename)
+
+    def get(self, filename, loader):
+        """Get the content of the YAML file *filename* parsed with *loader*."""
+        filename = os.path.abspath(filename)
+        stat = os.stat(filename)
+        key = (filename, stat.st_mtime_ns, stat.st_size, loader.__name__)
+        with self._lock:
+            self._load()
+            try:
+                return copy.deepcopy(self._configs[key])
+            except KeyError:
+                pass
+            with open(filename) as fd:
+                # use the libyaml based loader if available
+                config = yaml.load(fd, Loader=getattr(yaml, 'C' + loader.__name__, loader))
+            self._configs[key] = config
+            self._dirty = True
+            return copy.deepcopy(config)
+
+    def clear(self):
+        """Empty the in-memory cache."""
+        with self._lock:
+            self._configs.clear()
+            self._loaded_from = None
+            self._dirty = False
+
+
+config_cache = _YAMLConfigCache()
+
+
+def read_yaml_file(filename, loader=UnsafeLoader):
+    """Read the YAML file *filename*, using the cache of parsed configuration files.
+
+    The files are parsed with the libyaml version of *loader* if available,
+    and parsed only once per process as long as they are not modified. If the
+    ``SATPY_CONFIG_CACHE_DIR`` environment variable is set, the parsed files
+    are also cached in that directory for the other processes when this one
+    exits (or when ``config_cache.save()`` is called).
+
+    """
+    return config_cache.get(filename, loader)
+
+
 def check_yaml_configs(configs, key):
     """Get a diagnostic for the yaml *configs*.
 
@@ -15,17 +15,60 @@
 #
 # You should have received a copy of the GNU General Public License along with
 # satpy.  If not, see <http://www.gnu.org/licenses/>.
-"""Nodes to build trees."""
+"""Nodes to build trees.
+
+Resolving the dependencies of the datasets requested from a new `Scene` gives
+the same tree every time the readers, the available datasets, the compositors
+and the request are the same. These resolved trees (plans) are kept in
+`plan_cache` and copied into the trees of the following scenes instead of
+being resolved again. The number of plans kept can be set with the
+``SATPY_PLAN_CACHE_SIZE`` environment variable (default 32, 0 to disable).
+
+"""
+
+import os
 
 from satpy import DatasetDict, DatasetID, DATASET_KEYS
 from satpy.readers import TooManyResults
-from satpy.utils import get_logger
+from satpy.utils import get_logger, SizedLRUCache
 from satpy.dataset import create_filtered_dsid
 
 LOG = get_logger(__name__)
 # Empty leaf used for marking composites with no prerequisites
 EMPTY_LEAF_NAME = "__EMPTY_LEAF_SENTINEL__"
 
+PLAN_CACHE_SIZE = int(os.getenv('SATPY_PLAN_CACHE_SIZE', 32))
+plan_cache = SizedLRUCache(PLAN_CACHE_SIZE, sizeof=lambda val: 1)
+
+
+def _copy_plan_node(node, copies):
+    """Copy *node* and its children, including the node references in its data.
+
+    Args:
+        node (Node): Node to copy.
+        copies (dict): id of already copied nodes -> copy, to keep the
+                       nodes shared between several parents shared.
+
+    """
+    if node.name is EMPTY_LEAF_NAME:
+        return node
+    try:
+        return copies[id(node)]
+    except KeyError:
+        pass
+    new_node = Node(node.name, node.data)
+    copies[id(node)] = new_node
+    for child in node.children:
+        new_node.add_child(_copy_plan_node(child, copies))
+    if isinstance(node.data, dict):
+        new_node.data = node.data.copy()
+    elif isinstance(node.data, tuple):
+        compositor, prereqs, optional_prereqs = node.data
+        new_node.data = (compositor,
+                         [_copy_plan_node(prereq, copies) for prereq in prereqs],
+                         [_copy_plan_node(prereq, copies) for prereq in optional_prereqs])
+    return new_node
+
 
 class Node(object):
     """A node object."""
@@ -505,9 +548,56 @@ class DependencyTree(Node):
 
         return node, unknowns
 
+    def _get_plan_key(self, dataset_keys, dfilter):
+        """Get the key of the plan resolving *dataset_keys* in `plan_cache`.
+
+        Returns `None` when the plan can't be cached: the tree isn't empty or
+        the readers don't tell which datasets they know.
+
+        """
+        if self.children or self._all_nodes:
+            return None
+        try:
+            readers = tuple((reader_name, tuple(reader.config_files),
+                             frozenset(reader.all_ids), frozenset(reader.available_ids))
+                            for reader_name, reader in sorted(self.readers.items()))
+        except (AttributeError, TypeError):
+            return None
+        compositors = tuple((sensor_name, frozenset(comps.items()))
+                            for sensor_name, comps in sorted(self.compositors.items()))
+        modifiers = tuple((sensor_name, repr(sorted(mods.items(), key=lambda item: item[0])))
+                          for sensor_name, mods in sorted(self.modifiers.items()))
+        dfilter = tuple((key, tuple(val) if isinstance(val, list) else val)
+                        for key, val in sorted(dfilter.items()))
+        key = (readers, compositors, modifiers, self._available_only, frozenset(dataset_keys), dfilter)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _bind_plan(self, plan, dataset_keys):
+        """Copy the nodes of a cached *plan* into this tree."""
+        roots, nodes, resolved, unknown_datasets = plan
+        copies = {}
+        for root in roots:
+            self.add_child(self, _copy_plan_node(root, copies))
+        for node in nodes:
+            node = _copy_plan_node(node, copies)
+            self._all_nodes[node.name] = node
+        for key, name in resolved:
+            dataset_keys.discard(key)
+            if name is not None:
+                dataset_keys.add(name)
+        return unknown_datasets.copy()
+
     def find_dependencies(self, dataset_keys, **dfilter):
         """Create the dependency tree.
 
+        The first dependencies found in an empty tree are cached in
+        `plan_cache`, and the trees asked for the same datasets with the same
+        readers and compositors get a copy of the cached tree.
+
         Args:
             dataset_keys (iterable): Strings or DatasetIDs to find dependencies for
             **dfilter (dict): Additional filter parameters. See
@@ -517,17 +607,35 @@ class DependencyTree(Node):
             (Node, set): Root node of the dependency tree and a set of unknown datasets
 
         """
+        plan_key = self._get_plan_key(dataset_keys, dfilter) if PLAN_CACHE_SIZE else None
+        if plan_key is not None:
+            try:
+                plan = plan_cache[plan_key]
+            except KeyError:
+                pass
+            else:
+                LOG.debug("Using cached dependency tree for %s", ", ".join(str(key) for key in dataset_keys))
+                return self._bind_plan(plan, dataset_keys)
+
         unknown_datasets = set()
+        resolved = []
         for key in dataset_keys.copy():
             n, unknowns = self._find_dependencies(key, **dfilter)
 
             dataset_keys.discard(key)  # remove old non-DatasetID
             if n is not None:
                 dataset_keys.add(n.name)  # add equivalent DatasetID
+            resolved.append((key, None if n is None else n.name))
             if unknowns:
                 unknown_datasets.update(unknowns)
                 continue
 
             self.add_child(self, n)
 
+        if plan_key is not None:
+            # also keep the nodes found for the unknown datasets' parents
+            copies = {}
+            roots = [_copy_plan_node(child, copies) for child in self.children]
+            nodes = [_copy_plan_node(node, copies) for node in self._all_nodes.values()]
+            plan_cache[plan_key] = (roots, nodes, resolved, unknown_datasets.copy())
         return unknown_datasets
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Execution plans of the datasets loaded in a scene.
+
+Loading datasets in a :class:`~satpy.scene.Scene` only builds dask graphs:
+nothing is read or computed until the data is needed. An
+:class:`ExecutionPlan`, as returned by :meth:`satpy.scene.Scene.plan`, merges
+the graphs of several datasets into one, reading included, and describes it
+before anything is computed: the dependency tree of the datasets with the
+shape, type and estimated size in memory of every loaded product, and the
+number of dask tasks needed.
+
+Tasks doing the same work under different names, e.g. the same angles, masks
+or modifiers computed by several compositors, are merged by
+:func:`eliminate_common_subexpressions` so that :meth:`ExecutionPlan.compute`
+computes them only once::
+
+    scn.load(['natural_color', 'overview'], unload=False)
+    plan = scn.plan(['natural_color', 'overview'])
+    print(plan)
+    computed = plan.compute()
+
+Intermediate products of the composites are only described if they are still
+in the scene, i.e. if they were loaded with ``unload=False``.
+
+"""
+
+import logging
+
+import numpy as np
+from dask.base import collections_to_dsk, get_scheduler, is_dask_collection, tokenize
+from dask.core import get_dependencies, subs, toposort
+from dask.optimization import SubgraphCallable
+
+from satpy.dataset import DatasetID
+from satpy.readers import DatasetDict
+
+LOG = logging.getLogger(__name__)
+
+
+def _normalize_task(task):
+    """Get a version of *task* that doesn't depend on the name of its output.
+
+    The functions of blockwise operations are named after their output, so
+    the same operation done under two names gives different functions.
+
+    """
+    if isinstance(task, SubgraphCallable):
+        dsk = {('_out' if key == task.outkey else key): val for key, val in task.dsk.items()}
+        return 'subgraph', tokenize(dsk, task.inkeys)
+    if isinstance(task, (tuple, list)):
+        return type(task)(_normalize_task(item) for item in task)
+    return task
+
+
+def eliminate_common_subexpressions(dsk):
+    """Merge the tasks of *dsk* doing the same work under different keys.
+
+    The tasks are visited from the inputs to the outputs. A task identical to
+    an already visited one once its dependencies are replaced by their merged
+    versions is turned into an alias of the latter, so it is computed only
+    once.
+
+    Args:
+        dsk (dict): Dask graph.
+
+    Returns:
+        The new graph and the number of tasks turned into aliases.
+
+    """
+    dependencies = {key: get_dependencies(dsk, key) for key in dsk}
+    canonical = {}
+    seen = {}
+    new_dsk = {}
+    for key in toposort(dsk, dependencies=dependencies):
+        task = dsk[key]
+        for dep in dependencies[key]:
+            if canonical[dep] != dep:
+                task = subs(task, dep, canonical[dep])
+        token = tokenize(_normalize_task(task))
+        if token in seen:
+            canonical[key] = seen[token]
+            new_dsk[key] = seen[token]
+        else:
+            seen[token] = key
+            canonical[key] = key
+            new_dsk[key] = task
+    return new_dsk, sum(1 for key in dsk if canonical[key] != key)
+
+
+def _format_nbytes(nbytes):
+    for unit in ('B', 'kB', 'MB', 'GB'):
+        if nbytes < 1000:
+            break
+        nbytes /= 1000.
+    else:
+        unit = 'TB'
+    return "{:.1f} {}".format(nbytes, unit)
+
+
+def _format_id(ds_id):
+    name = ds_id.name if ds_id.name is not None else str(ds_id.wavelength)
+    if ds_id.modifiers:
+        name += " ({})".format(", ".join(ds_id.modifiers))
+    return name
+
+
+class PlanNode(object):
+    """Description of one dataset of an execution plan.
+
+    Attributes:
+        name (DatasetID): ID of the dataset.
+        kind (str): ``'reader'`` for datasets read from files, ``'modifier'``
+                    or ``'composite'`` for generated ones, ``'user'`` for
+                    datasets added to the scene by the user.
+        depth (int): Depth of the node in the dependency tree.
+        shape (tuple): Shape of the data, `None` if it isn't loaded.
+        dtype (numpy.dtype): Type of the data, `None` if it isn't loaded.
+        nbytes (int): Estimated size of the data in memory.
+        chunk_nbytes (int): Estimated size of the biggest chunk of the data.
+        tasks (int): Number of tasks in the dask graph of the data.
+
+    """
+
+    def __init__(self, name, kind, depth, data=None):
+        """Describe the dataset *name*, with its *data* if loaded."""
+        self.name = name
+        self.kind = kind
+        self.depth = depth
+        self.shape = self.dtype = None
+        self.nbytes = self.chunk_nbytes = self.tasks = 0
+        if data is not None:
+            self.shape = data.shape
+            self.dtype = data.dtype
+            self.nbytes = int(np.prod(data.shape)) * data.dtype.itemsize
+            chunks = getattr(data.data, 'chunks', None)
+            if chunks is not None:
+                self.chunk_nbytes = int(np.prod([max(dim_chunks) for dim_chunks in chunks])) * data.dtype.itemsize
+                self.tasks = len(data.data.__dask_graph__())
+            else:
+                self.chunk_nbytes = self.nbytes
+
+    def __str__(self):
+        """Describe the node on one line."""
+        res = "{}{} [{}]".format(" +" * self.depth, _format_id(self.name), self.kind)
+        if self.shape is None:
+            return res + " (not loaded)"
+        return res + " {} {} {} (chunks {}), {} tasks".format(
+            self.shape, self.dtype, _format_nbytes(self.nbytes), _format_nbytes(self.chunk_nbytes), self.tasks)
+
+
+class ExecutionPlan(object):
+    """Merged dask graph of datasets, described before being computed.
+
+    Args:
+        datasets (list): `DataArray` objects to compute.
+        dep_tree (DependencyTree): Dependency tree the datasets come from.
+        available (DatasetDict): All the datasets loaded, including the
+                                 intermediate ones.
+
+    """
+
+    def __init__(self, datasets, dep_tree=None, available=None):
+        """Build the graph and the description of *datasets*."""
+        self.datasets = list(datasets)
+        self.ids = [DatasetID.from_dict(ds.attrs) for ds in self.datasets]
+        available = available if available is not None else DatasetDict()
+        self.nodes = []
+        seen = set()
+        # the nodes of generated composites are renamed after their data
+        tree_nodes = dep_tree.flatten() if dep_tree is not None else {}
+        for ds_id, dataset in zip(self.ids, self.datasets):
+            node = tree_nodes.get(ds_id)
+            if node is None and dep_tree is not None:
+                try:
+                    node = dep_tree[ds_id]
+                except KeyError:
+                    pass
+            self._add_nodes(ds_id, node, dataset, available, 0, seen)
+
+        self._arrays = [ds.data for ds in self.datasets if is_dask_collection(ds.data)]
+        dsk = dict(collections_to_dsk(self._arrays, optimize_graph=False)) if self._arrays else {}
+        self.graph, self.duplicate_tasks = eliminate_common_subexpressions(dsk)
+        keys_per_dataset = [set(arr.__dask_graph__().keys()) for arr in self._arrays]
+        counts = {}
+        for keys in keys_per_dataset:
+            for key in keys:
+                counts[key] = counts.get(key, 0) + 1
+        self.shared_tasks = sum(1 for count in counts.values() if count > 1)
+
+    def _add_nodes(self, ds_id, node, dataset, available, depth, seen):
+        """Add the description of *node* and its children, depth first."""
+        if node is None:
+            kind = 'user'
+        elif isinstance(node.data, dict):
+            kind = 'reader'
+        elif isinstance(node.data, tuple):
+            kind = 'modifier' if ds_id.modifiers else 'composite'
+        else:
+            kind = 'user'
+        self.nodes.append(PlanNode(ds_id, kind, depth, data=dataset))
+        if ds_id in seen or node is None:
+            return
+        seen.add(ds_id)
+        for child in node.children:
+            if not isinstance(child.name, DatasetID):
+                # empty leaf of composites without prerequisites
+                continue
+            child_data = available.get(child.name) if available.contains(child.name) else None
+            self._add_nodes(child.name, child, child_data, available, depth + 1, seen)
+
+    @property
+    def tasks(self):
+        """Get the number of tasks to compute, shared ones counted once."""
+        return len(self.graph) - self.duplicate_tasks
+
+    @property
+    def nbytes(self):
+        """Get the estimated size in memory of the computed datasets."""
+        return sum(node.nbytes for node in self.nodes if node.depth == 0)
+
+    def __str__(self):
+        """Describe the plan."""
+        lines = [str(node) for node in self.nodes]
+        lines.append("{} datasets, {} in memory, {} tasks ({} shared, {} duplicates merged)".format(
+            len(self.datasets), _format_nbytes(self.nbytes), self.tasks, self.shared_tasks, self.duplicate_tasks))
+        return "\n".join(lines)
+
+    def compute(self, **kwargs):
+        """Compute all the datasets at once.
+
+        Args:
+            kwargs: Passed to the dask scheduler, e.g. ``scheduler`` or
+                    ``num_workers``.
+
+        Returns:
+            `DatasetDict` of computed `DataArray` objects.
+
+        """
+        res = DatasetDict()
+        results = []
+        if self._arrays:
+            LOG.debug("Computing %d tasks for %d datasets", self.tasks, len(self.datasets))
+            schedule = get_scheduler(scheduler=kwargs.pop('scheduler', None), collections=self._arrays)
+            keys = [arr.__dask_keys__() for arr in self._arrays]
+            results = schedule(self.graph, keys, **kwargs)
+        results = iter(results)
+        for ds_id, dataset in zip(self.ids, self.datasets):
+            if is_dask_collection(dataset.data):
+                finalize, args = dataset.data.__dask_postcompute__()
+                dataset = dataset.copy(data=finalize(next(results), *args))
+            res[ds_id] = dataset
+        return res
@@ -20,14 +20,7 @@
 
 import logging
 
-import yaml
-
-try:
-    from yaml import UnsafeLoader
-except ImportError:
-    from yaml import Loader as UnsafeLoader
-
-from satpy.config import config_search_paths, get_environ_config_dir, recursive_dict_update
+from satpy.config import config_search_paths, get_environ_config_dir, read_yaml_file, recursive_dict_update
 
 LOG = logging.getLogger(__name__)
 
@@ -68,5 +61,4 @@ class Plugin(object):
 
     def load_yaml_config(self, conf):
         """Load a YAML configuration file and recursively update the overall configuration."""
-        with open(conf) as fd:
-            self.config = recursive_dict_update(self.config, yaml.load(fd, Loader=UnsafeLoader))
+        self.config = recursive_dict_update(self.config, read_yaml_file(conf))
@@ -17,6 +17,7 @@
 # satpy.  If not, see <http://www.gnu.org/licenses/>.
 """Shared objects of the various reader classes."""
 
+import bisect
 import logging
 import numbers
 import os
@@ -30,7 +31,7 @@ except ImportError:
     from yaml import Loader as UnsafeLoader
 
 from satpy.config import (config_search_paths, get_environ_config_dir,
-                          glob_config)
+                          glob_config, read_yaml_file)
 from satpy.dataset import DATASET_KEYS, DatasetID
 from satpy import CALIBRATION_ORDER
 
@@ -118,6 +119,136 @@ def get_best_dataset_key(key, choices):
     return choices
 
 
+class DatasetIDIndex(object):
+    """Set of `DatasetID` objects indexed for fast queries.
+
+    Besides the keys themselves, the index keeps a mapping from every value of
+    the ``name``, ``resolution``, ``polarization``, ``calibration``, ``level``
+    and ``modifiers`` elements to the keys having it, and the wavelength
+    intervals sorted by their lower bound. Queries made through
+    :func:`filter_keys_by_dataset_id` (and thus :func:`get_key`) then only
+    look at the keys sharing the queried values instead of scanning all the
+    keys, with the same results.
+
+    Args:
+        keys (iterable): `DatasetID` objects to index.
+        sort_results (bool): Return the query results sorted instead of in the
+                             order the keys were added.
+
+    """
+
+    _indexed_keys = tuple(key for key in DATASET_KEYS if key != 'wavelength')
+
+    def __init__(self, keys=(), sort_results=False):
+        """Index the provided keys."""
+        self.sort_results = sort_results
+        self._order = {}
+        self._counter = 0
+        self._indexes = {key: {} for key in self._indexed_keys}
+        # keys with a (min, nominal, max) wavelength, and all the others
+        self._intervals = {}
+        self._other_wavelengths = set()
+        self._sorted_intervals = None
+        for key in keys:
+            self.add(key)
+
+    def __len__(self):
+        """Get the number of keys."""
+        return len(self._order)
+
+    def __iter__(self):
+        """Iterate over the keys in the order they were added."""
+        return iter(self._order)
+
+    def __contains__(self, key):
+        """Check if *key* is indexed."""
+        return key in self._order
+
+    def add(self, key):
+        """Add *key* to the index."""
+        if key in self._order:
+            return
+        self._order[key] = self._counter
+        self._counter += 1
+        for name in self._indexed_keys:
+            val = getattr(key, name)
+            if val is not None:
+                self._indexes[name].setdefault(val, set()).add(key)
+        wavelength = key.wavelength
+        if wavelength is None:
+            return
+        if isinstance(wavelength, (list, tuple)) and len(wavelength) == 3:
+            self._intervals[key] = (wavelength[0], wavelength[2])
+            self._sorted_intervals = None
+        else:
+            self._other_wavelengths.add(key)
+
+    def discard(self, key):
+        """Remove *key* from the index if present."""
+        if self._order.pop(key, None) is None:
+            return
+        for name in self._indexed_keys:
+            val = getattr(key, name)
+            if val is not None:
+                keys = self._indexes[name][val]
+                keys.discard(key)
+                if not keys:
+                    del self._indexes[name][val]
+        if self._intervals.pop(key, None) is not None:
+            self._sorted_intervals = None
+        self._other_wavelengths.discard(key)
+
+    def clear(self):
+        """Remove all the keys."""
+        self._order.clear()
+        for index in self._indexes.values():
+            index.clear()
+        self._intervals.clear()
+        self._other_wavelengths.clear()
+        self._sorted_intervals = None
+
+    def _keys_with_value(self, name, val):
+        try:
+            return self._indexes[name].get(val, set())
+        except TypeError:
+            # unhashable query value, compare it to every indexed value
+            return set().union(*(keys for other, keys in self._indexes[name].items() if other == val))
+
+    def _keys_with_wavelength(self, wavelength):
+        """Get the keys whose wavelength may match *wavelength*."""
+        if not isinstance(wavelength, numbers.Number):
+            return set(self._intervals).union(self._other_wavelengths)
+        if self._sorted_intervals is None:
+            intervals = sorted(self._intervals.items(), key=lambda item: item[1][0])
+            self._sorted_intervals = ([interval[0] for _, interval in intervals], intervals)
+        mins, intervals = self._sorted_intervals
+        end = bisect.bisect_right(mins, wavelength)
+        keys = set(key for key, (_, max_wl) in intervals[:end] if max_wl >= wavelength)
+        return keys.union(self._other_wavelengths)
+
+    def filter(self, did):
+        """Get the keys matching *did*, like :func:`filter_keys_by_dataset_id`."""
+        candidates = None
+        for name in self._indexed_keys:
+            val = getattr(did, name)
+            if val is None:
+                continue
+            keys = self._keys_with_value(name, val)
+            candidates = set(keys) if candidates is None else candidates & keys
+            if not candidates:
+                return []
+        if did.wavelength is not None:
+            keys = self._keys_with_wavelength(did.wavelength)
+            candidates = keys if candidates is None else candidates & keys
+            candidates = [key for key in candidates
+                          if DatasetID.wavelength_match(key.wavelength, did.wavelength)]
+        elif candidates is None:
+            candidates = self._order
+        if self.sort_results:
+            return sorted(candidates)
+        return sorted(candidates, key=self._order.__getitem__)
+
+
 def filter_keys_by_dataset_id(did, key_container):
     """Filer provided key iterable by the provided `DatasetID`.
 
@@ -127,12 +258,15 @@ def filter_keys_by_dataset_id(did, key_container):
     Args:
         did (DatasetID): Query parameters to match in the `key_container`.
         key_container (iterable): Set, list, tuple, or dict of `DatasetID`
-                                  keys.
+                                  keys, or a `DatasetIDIndex`.
 
     Returns (list): List of keys matching the provided parameters in no
                     specific order.
 
     """
+    if isinstance(key_container, DatasetIDIndex):
+        return key_container.filter(did)
+
     keys = iter(key_container)
 
     for key in DATASET_KEYS:
@@ -169,6 +303,8 @@ def get_key(key, key_container, num_results=1, best=True,
                          accepted.
         key_container (dict or set): Container of DatasetID objects that
                                      uses hashing to quickly access items.
+                                     Use a `DatasetIDIndex` for the
+                                     fastest queries.
         num_results (int): Number of results to return. Use `0` for all
                            matching results. If `1` then the single matching
                            key is returned instead of a list of length 1.
@@ -258,8 +394,38 @@ class DatasetDict(dict):
 
     Note: Internal dictionary keys are `DatasetID` objects.
 
+    The keys are also kept in a `DatasetIDIndex`, so that looking them up by
+    name, wavelength or other `DatasetID` elements does not scan the whole
+    dictionary.
+
     """
 
+    def __init__(self, *args, **kwargs):
+        """Initialize the dictionary and its index."""
+        super(DatasetDict, self).__init__(*args, **kwargs)
+        self._index = DatasetIDIndex(super(DatasetDict, self).keys(), sort_results=True)
+
+    @property
+    def index(self):
+        """Get the `DatasetIDIndex` of the keys."""
+        try:
+            return self.__dict__['_index']
+        except KeyError:
+            # copied or unpickled without going through __init__
+            self._index = DatasetIDIndex(super(DatasetDict, self).keys(), sort_results=True)
+            return self._index
+
+    def __getstate__(self):
+        """Get the state to copy or pickle, without the index."""
+        state = self.__dict__.copy()
+        state.pop('_index', None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state and reindex the keys."""
+        self.__dict__.update(state)
+        self._index = DatasetIDIndex(super(DatasetDict, self).keys(), sort_results=True)
+
     def keys(self, names=False, wavelengths=False):
         """Give currently contained keys."""
         # sort keys so things are a little more deterministic (.keys() is not)
@@ -287,7 +453,7 @@ class DatasetDict(dict):
             **dfilter (dict): See `get_key` function for more information.
 
         """
-        return get_key(match_key, self.keys(), num_results=num_results,
+        return get_key(match_key, self.index, num_results=num_results,
                        best=best, **dfilter)
 
     def getitem(self, item):
@@ -355,7 +521,37 @@ class DatasetDict(dict):
             if "wavelength" in d and d["wavelength"] != key.wavelength:
                 raise TypeError("Can't change the wavelength of a dataset")
 
-        return super(DatasetDict, self).__setitem__(key, value)
+        super(DatasetDict, self).__setitem__(key, value)
+        self.index.add(key)
+
+    def setdefault(self, key, default=None):
+        """Get the value of *key*, setting it to *default* if missing."""
+        if not super(DatasetDict, self).__contains__(key):
+            super(DatasetDict, self).__setitem__(key, default)
+            self.index.add(key)
+        return super(DatasetDict, self).__getitem__(key)
+
+    def update(self, *args, **kwargs):
+        """Update the dictionary, with the keys used as they are."""
+        for key, value in dict(*args, **kwargs).items():
+            super(DatasetDict, self).__setitem__(key, value)
+            self.index.add(key)
+
+    def pop(self, key, *args):
+        """Remove *key* and return its value."""
+        self.index.discard(key)
+        return super(DatasetDict, self).pop(key, *args)
+
+    def popitem(self):
+        """Remove and return the last inserted item."""
+        key, value = super(DatasetDict, self).popitem()
+        self.index.discard(key)
+        return key, value
+
+    def clear(self):
+        """Remove all items."""
+        super(DatasetDict, self).clear()
+        self.index.clear()
 
     def contains(self, item):
         """Check contains when we know the *exact* DatasetID."""
@@ -371,12 +567,10 @@ class DatasetDict(dict):
 
     def __delitem__(self, key):
         """Delete item from container."""
-        try:
-            # short circuit - try to get the object without more work
-            return super(DatasetDict, self).__delitem__(key)
-        except KeyError:
+        if not super(DatasetDict, self).__contains__(key):
             key = self.get_key(key)
-            return super(DatasetDict, self).__delitem__(key)
+        super(DatasetDict, self).__delitem__(key)
+        self.index.discard(key)
 
 
 def group_files(files_to_sort, reader=None, time_threshold=10,
@@ -485,8 +679,7 @@ def read_reader_config(config_files, loader=UnsafeLoader):
     conf = {}
     LOG.debug('Reading %s', str(config_files))
     for config_file in config_files:
-        with open(config_file) as fd:
-            conf.update(yaml.load(fd.read(), Loader=loader))
+        conf.update(read_yaml_file(config_file, loader=loader))
 
     try:
         reader_info = conf['reader']
@@ -704,7 +897,8 @@ def load_readers(filenames=None, reader=None, reader_kwargs=None,
     reader_instances = {}
     reader_kwargs = reader_kwargs or {}
     reader_kwargs_without_filter = reader_kwargs.copy()
-    reader_kwargs_without_filter.pop('filter_parameters', None)
+    for reader_only_kwarg in ('filter_parameters', 'filehandler_workers', 'filehandler_pool', 'lazy_segments'):
+        reader_kwargs_without_filter.pop(reader_only_kwarg, None)
 
     if ppp_config_dir is None:
         ppp_config_dir = get_environ_config_dir()
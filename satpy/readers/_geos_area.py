@@ -27,6 +27,11 @@ correct area definition.
 import numpy as np
 from pyresample import geometry
 
+from satpy.readers.utils import get_header_cache
+
+# parameters of `get_area_definition` the area definitions depend on
+_AREA_KEYS = ('a', 'b', 'h', 'ssp_lon', 'ncols', 'nlines', 'a_name', 'a_desc', 'p_id')
+
 
 def get_xy_from_linecol(line, col, offsets, factors):
     """Get the intermediate coordinates from line & col.
@@ -127,7 +132,16 @@ def get_area_definition(pdict, a_ext):
     Returns:
         a_def: An area definition for the scene
 
+    The area definitions are taken from the header cache (see
+    :class:`satpy.readers.utils.HeaderCache`) when the same parameters were
+    used before, e.g. for the same segment of a previous time slot.
+
     """
+    key = ('geos_area',) + tuple((name, pdict[name]) for name in _AREA_KEYS) + (tuple(a_ext),)
+    return get_header_cache().get_or_create(key, _make_area_definition, pdict, a_ext)
+
+
+def _make_area_definition(pdict, a_ext):
     proj_dict = {'a': float(pdict['a']),
                  'b': float(pdict['b']),
                  'lon_0': float(pdict['ssp_lon']),
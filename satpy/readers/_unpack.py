@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Unpacking of the n-bit words packed in byte streams.
+
+Many level 1 formats (e.g. SEVIRI HRIT and native files) store the counts as
+10, 12 or 14-bit words packed one after the other in a byte stream. The bytes
+are processed in groups holding a whole number of words (5 bytes for 4 10-bit
+words, 3 bytes for 2 12-bit words, 7 bytes for 4 14-bit words): the n-th word
+of all the groups is extracted at once from the 2 or 3 bytes it spans, with
+shifts and masks on 32-bit integers. Dask arrays are unpacked chunk by
+chunk, so the chunks of the unpacked data follow the chunks of the packed
+bytes.
+
+The benchmark in ``utils/benchmark_unpacking.py`` compares this with the
+previous SEVIRI implementation.
+
+"""
+
+import math
+
+import dask.array as da
+import numpy as np
+
+
+def _get_group_size(nbits):
+    """Get the number of bytes and words in the smallest groups holding whole words."""
+    if not 0 < nbits <= 16:
+        raise ValueError("Can't unpack {}-bit words to 16-bit words".format(nbits))
+    group_bits = nbits * 8 // math.gcd(nbits, 8)
+    return group_bits // 8, group_bits // nbits
+
+
+def _unpack_block(packed, nbits, byteorder='big'):
+    """Unpack the *nbits*-bit words of the uint8 array *packed* to uint16."""
+    group_bytes, group_words = _get_group_size(nbits)
+    ngroups = packed.size // group_bytes
+    groups = packed[:ngroups * group_bytes].reshape((ngroups, group_bytes))
+    mask = (1 << nbits) - 1
+    res = np.empty((ngroups, group_words), dtype=np.uint16)
+    for idx in range(group_words):
+        # a word spans up to 3 bytes of the group
+        first_bit = idx * nbits
+        first_byte = first_bit // 8
+        last_byte = (first_bit + nbits - 1) // 8
+        word = groups[:, first_byte].astype(np.uint32)
+        for byte in range(first_byte + 1, last_byte + 1):
+            if byteorder == 'big':
+                word = (word << 8) | groups[:, byte]
+            else:
+                word |= groups[:, byte].astype(np.uint32) << (8 * (byte - first_byte))
+        if byteorder == 'big':
+            word >>= 8 * (last_byte - first_byte + 1) - nbits - first_bit % 8
+        else:
+            word >>= first_bit % 8
+        word &= mask
+        res[:, idx] = word
+    return res.ravel()
+
+
+def unpack_bits(packed, nbits, byteorder='big'):
+    """Unpack the *nbits*-bit words packed in the byte array *packed* to uint16 words.
+
+    Args:
+        packed (numpy.ndarray or dask.array.Array): 1D array of bytes.
+        nbits (int): Number of bits of the words, up to 16.
+        byteorder (str): 'big' if the first word starts at the most
+                         significant bit of the first byte (as in the SEVIRI
+                         formats), 'little' if it starts at the least
+                         significant bit.
+
+    Returns:
+        Array of the same kind as *packed* with the unpacked words. The
+        trailing bytes not making a whole group are dropped.
+
+    """
+    if byteorder not in ('big', 'little'):
+        raise ValueError("Unknown byte order: {}".format(byteorder))
+    group_bytes, group_words = _get_group_size(nbits)
+    if not isinstance(packed, da.Array):
+        return _unpack_block(np.asarray(packed, dtype=np.uint8), nbits, byteorder)
+
+    packed = packed.astype(np.uint8)
+    size = packed.shape[0] - packed.shape[0] % group_bytes
+    packed = packed[:size]
+    if any(chunk % group_bytes for chunk in packed.chunks[0]):
+        chunk_size = max(max(packed.chunks[0]) // group_bytes, 1) * group_bytes
+        packed = packed.rechunk(chunk_size)
+    chunks = (tuple(chunk // group_bytes * group_words for chunk in packed.chunks[0]),)
+    return packed.map_blocks(_unpack_block, nbits, byteorder, chunks=chunks, dtype=np.uint16)
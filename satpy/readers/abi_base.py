@@ -25,6 +25,7 @@ import xarray as xr
 
 from pyresample import geometry
 from satpy.readers.file_handlers import BaseFileHandler
+from satpy.readers.utils import get_header_cache
 from satpy import CHUNK_SIZE
 
 logger = logging.getLogger(__name__)
@@ -145,12 +146,29 @@ class NC_ABI_BASE(BaseFileHandler):
     def get_area_def(self, key):
         """Get the area definition of the data at hand."""
         if 'goes_imager_projection' in self.nc:
-            return self._get_areadef_fixedgrid(key)
+            # the grid of a sector is the same from one time slot to the next
+            return get_header_cache().get_or_create(self._get_fixedgrid_cache_key(),
+                                                    self._get_areadef_fixedgrid, key)
         elif 'goes_lat_lon_projection' in self.nc:
             return self._get_areadef_latlon(key)
         else:
             raise ValueError('Unsupported projection found in the dataset')
 
+    def _get_fixedgrid_cache_key(self):
+        """Get the header values the fixed grid area definition depends on."""
+        projection = self.nc["goes_imager_projection"].attrs
+        key = ['abi_fixed_grid', self.nc.attrs.get('orbital_slot'), self.nc.attrs.get('spatial_resolution'),
+               self.ncols, self.nlines]
+        for name in ('semi_major_axis', 'semi_minor_axis', 'perspective_point_height',
+                     'longitude_of_projection_origin'):
+            key.append(float(projection[name]))
+        key.append(projection['sweep_angle_axis'])
+        for coord in ('x', 'y'):
+            raw = self.nc[coord]
+            key.extend([float(raw.attrs.get('scale_factor', 1)), float(raw.attrs.get('add_offset', 0)),
+                        float(raw[0]), float(raw[-1])])
+        return tuple(key)
+
     def _get_areadef_latlon(self, key):
         """Get the area definition of the data at hand."""
         projection = self.nc["goes_lat_lon_projection"]
@@ -40,11 +40,13 @@ import dask.array as da
 import xarray as xr
 import warnings
 import os
+from dask.base import tokenize
 
 from satpy import CHUNK_SIZE
 from satpy.readers.file_handlers import BaseFileHandler
 from satpy.readers.utils import unzip_file, get_geostationary_mask, \
-                                np2str, get_earth_radius
+                                np2str, get_earth_radius, apply_lut, \
+                                get_calibration_lut, get_header_cache
 from satpy.readers._geos_area import get_area_extent, get_area_definition
 
 AHI_CHANNEL_NAMES = ("1", "2", "3", "4", "5",
@@ -257,10 +259,18 @@ class AHIHSDFileHandler(BaseFileHandler):
 
     By default these updated coefficients are not used.
 
+    With ``calib_lut=True``, the calibration function of each band is
+    computed once for all the 16-bit counts, and the data is calibrated by
+    looking up the values of its counts in that table (in 32-bit floats)::
+
+        scene = satpy.Scene(filenames,
+                            reader='ahi_hsd',
+                            reader_kwargs={'calib_lut': True})
+
     """
 
     def __init__(self, filename, filename_info, filetype_info,
-                 mask_space=True, calib_mode='nominal'):
+                 mask_space=True, calib_mode='nominal', calib_lut=False):
         """Initialize the reader."""
         super(AHIHSDFileHandler, self).__init__(filename, filename_info,
                                                 filetype_info)
@@ -306,6 +316,7 @@ class AHIHSDFileHandler(BaseFileHandler):
             raise ValueError('Invalid calibration mode: {}. Choose one of {}'.format(
                 calib_mode, calib_mode_choices))
         self.calib_mode = calib_mode.upper()
+        self.calib_lut = calib_lut
 
     def __del__(self):
         if (self.is_zipped and os.path.exists(self.filename)):
@@ -557,16 +568,37 @@ class AHIHSDFileHandler(BaseFileHandler):
         if calibration == 'counts':
             return data
 
+        if self.calib_lut:
+            data = apply_lut(data, self._get_calibration_lut(calibration))
+        else:
+            data = self._calibrate_counts(data, calibration)
+
+        logger.debug("Calibration time " + str(datetime.now() - tic))
+        return data
+
+    def _calibrate_counts(self, data, calibration):
+        """Calibrate the counts of *data* to radiance, reflectance or brightness temperature."""
         if calibration in ['radiance', 'reflectance', 'brightness_temperature']:
             data = self.convert_to_radiance(data)
         if calibration == 'reflectance':
             data = self._vis_calibrate(data)
         elif calibration == 'brightness_temperature':
             data = self._ir_calibrate(data)
-
-        logger.debug("Calibration time " + str(datetime.now() - tic))
         return data
 
+    def _get_calibration_lut(self, calibration):
+        """Get the lookup table calibrating the 16-bit counts of the band.
+
+        The tables are kept in the header cache, so they are computed once for
+        the calibration blocks of a band.
+
+        """
+        key = ('ahi_calibration_lut', calibration, self.calib_mode,
+               tokenize(self._header['block5'], self._header['calibration']))
+        return get_header_cache().get_or_create(key, get_calibration_lut,
+                                                lambda counts: self._calibrate_counts(counts, calibration),
+                                                np.iinfo(np.uint16).max)
+
     def convert_to_radiance(self, data):
         """Calibrate to radiance."""
 
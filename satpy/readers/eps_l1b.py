@@ -20,6 +20,7 @@
 
 import logging
 import os
+from functools import lru_cache
 
 import numpy as np
 import xarray as xr
@@ -53,72 +54,100 @@ record_class = ["Reserved", "mphr", "sphr",
                 "veadr", "viadr", "mdr"]
 
 
+grh_dtype = np.dtype([("record_class", "|i1"),
+                      ("INSTRUMENT_GROUP", "|i1"),
+                      ("RECORD_SUBCLASS", "|i1"),
+                      ("RECORD_SUBCLASS_VERSION", "|i1"),
+                      ("RECORD_SIZE", ">u4"),
+                      ("RECORD_START_TIME", "S6"),
+                      ("RECORD_STOP_TIME", "S6")])
+
+
+@lru_cache(maxsize=1)
+def _get_format():
+    """Get the (parsed once) format description of the records."""
+    return XMLFormat(os.path.join(CONFIG_PATH, "eps_avhrrl1b_6.5.xml"))
+
+
+def index_records(buf):
+    """Index the records found in the uint8 array *buf*.
+
+    Consecutive records of the same class, subclass and size are found in one
+    go by looking at all the generic record headers (GRH) they would have if
+    the run of records continued until the end of the file, so the loop is
+    over the sections of the file rather than over its records.
+
+    Returns:
+        list of ``((record_class, record_subclass), offset, record_size, count)``
+
+    """
+    index = []
+    offset = 0
+    while offset + grh_dtype.itemsize <= buf.size:
+        grh = buf[offset:offset + grh_dtype.itemsize].view(grh_dtype)[0]
+        rec_class = record_class[int(grh["record_class"])]
+        sub_class = int(grh["RECORD_SUBCLASS"])
+        size = int(grh["RECORD_SIZE"])
+        max_count = (buf.size - offset) // size
+        if max_count == 0:
+            logger.warning("Truncated %s record at offset %d, skipping the end of the file.",
+                           rec_class, offset)
+            break
+        headers = np.ndarray((max_count,), dtype=grh_dtype, buffer=buf,
+                             offset=offset, strides=(size,))
+        same = ((headers["record_class"] == grh["record_class"]) &
+                (headers["RECORD_SUBCLASS"] == grh["RECORD_SUBCLASS"]) &
+                (headers["RECORD_SIZE"] == grh["RECORD_SIZE"]))
+        count = max_count if same.all() else int(np.argmin(same))
+        index.append(((rec_class, sub_class), offset, size, count))
+        offset += size * count
+    return index
+
+
 def read_records(filename):
-    """Read *filename* without scaling it afterwards."""
-    form = XMLFormat(os.path.join(CONFIG_PATH, "eps_avhrrl1b_6.5.xml"))
+    """Read *filename* without scaling it afterwards.
+
+    The file is memory-mapped and the sections are returned as views into it,
+    so nothing is copied until the data is actually used. The result is cached
+    per file (and modification time).
+    """
+    stat = os.stat(filename)
+    return _read_records(filename, stat.st_mtime, stat.st_size)
 
-    grh_dtype = np.dtype([("record_class", "|i1"),
-                          ("INSTRUMENT_GROUP", "|i1"),
-                          ("RECORD_SUBCLASS", "|i1"),
-                          ("RECORD_SUBCLASS_VERSION", "|i1"),
-                          ("RECORD_SIZE", ">u4"),
-                          ("RECORD_START_TIME", "S6"),
-                          ("RECORD_STOP_TIME", "S6")])
+
+@lru_cache(maxsize=8)
+def _read_records(filename, mtime, size):
+    form = _get_format()
 
     max_lines = np.floor((CHUNK_SIZE ** 2) / 2048)
 
-    dtypes = []
+    buf = np.memmap(filename, mode='r', dtype=np.uint8)
+
     cnt = 0
-    counts = []
-    classes = []
-    prev = None
-    with open(filename, "rb") as fdes:
-        while True:
-            grh = np.fromfile(fdes, grh_dtype, 1)
-            if grh.size == 0:
-                break
-            rec_class = record_class[int(grh["record_class"])]
-            sub_class = grh["RECORD_SUBCLASS"][0]
-
-            expected_size = int(grh["RECORD_SIZE"])
-            bare_size = expected_size - grh_dtype.itemsize
-            try:
-                the_type = form.dtype((rec_class, sub_class))
-                # the_descr = grh_dtype.descr + the_type.descr
-            except KeyError:
-                the_type = np.dtype([('unknown', 'V%d' % bare_size)])
-            the_descr = grh_dtype.descr + the_type.descr
-            the_type = np.dtype(the_descr)
-            if the_type.itemsize < expected_size:
-                padding = [('unknown%d' % cnt, 'V%d' % (expected_size - the_type.itemsize))]
-                cnt += 1
-                the_descr += padding
-            new_dtype = np.dtype(the_descr)
-            key = (rec_class, sub_class)
-            if key == prev:
-                counts[-1] += 1
-            else:
-                dtypes.append(new_dtype)
-                counts.append(1)
-                classes.append(key)
-                prev = key
-            fdes.seek(expected_size - grh_dtype.itemsize, 1)
-
-        sections = {}
-        offset = 0
-        for dtype, count, rec_class in zip(dtypes, counts, classes):
-            fdes.seek(offset)
-            if rec_class == ('mdr', 2):
-                record = da.from_array(np.memmap(fdes, mode='r', dtype=dtype, shape=count, offset=offset),
-                                       chunks=(max_lines,))
-            else:
-                record = np.fromfile(fdes, dtype=dtype, count=count)
-            offset += dtype.itemsize * count
-            if rec_class in sections:
-                logger.debug('Multiple records for ', str(rec_class))
-                sections[rec_class] = np.hstack((sections[rec_class], record))
-            else:
-                sections[rec_class] = record
+    sections = {}
+    for (rec_class, sub_class), offset, expected_size, count in index_records(buf):
+        bare_size = expected_size - grh_dtype.itemsize
+        try:
+            the_type = form.dtype((rec_class, sub_class))
+        except KeyError:
+            the_type = np.dtype([('unknown', 'V%d' % bare_size)])
+        the_descr = grh_dtype.descr + the_type.descr
+        the_type = np.dtype(the_descr)
+        if the_type.itemsize < expected_size:
+            padding = [('unknown%d' % cnt, 'V%d' % (expected_size - the_type.itemsize))]
+            cnt += 1
+            the_descr += padding
+        dtype = np.dtype(the_descr)
+
+        record = buf[offset:offset + expected_size * count].view(dtype)
+        key = (rec_class, sub_class)
+        if key == ('mdr', 2):
+            record = da.from_array(record, chunks=(max_lines,))
+        if key in sections:
+            logger.debug('Multiple records for %s', str(key))
+            sections[key] = np.hstack((sections[key], record))
+        else:
+            sections[key] = record
 
     return sections, form
 
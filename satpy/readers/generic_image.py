@@ -31,6 +31,7 @@ import numpy as np
 
 from satpy.readers.file_handlers import BaseFileHandler
 from satpy import CHUNK_SIZE
+from satpy.utils import get_float_dtype
 from pyresample import utils
 
 BANDS = {1: ['L'],
@@ -112,7 +113,7 @@ def mask_image_data(data):
         if not np.issubdtype(data.dtype, np.integer):
             raise ValueError("Only integer datatypes can be used as a mask.")
         mask = data.data[-1, :, :] == np.iinfo(data.dtype).min
-        data = data.astype(np.float64)
+        data = data.astype(get_float_dtype())
         masked_data = da.stack([da.where(mask, np.nan, data.data[i, :, :])
                                 for i in range(data.shape[0])])
         data.data = masked_data
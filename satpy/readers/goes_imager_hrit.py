@@ -37,6 +37,7 @@ from satpy.readers.eum_base import (time_cds_short, recarray2dict)
 from satpy.readers.hrit_base import (HRITFileHandler, ancillary_text,
                                      annotation_header, base_hdr_map,
                                      image_data_function)
+from satpy.readers.utils import get_header_cache
 
 
 class CalibrationError(Exception):
@@ -377,7 +378,8 @@ class HRITGOESFileHandler(HRITFileHandler):
         logger.debug("Getting raw data")
         res = super(HRITGOESFileHandler, self).get_dataset(key, info)
 
-        self.mda['calibration_parameters'] = self._get_calibration_params()
+        self.mda['calibration_parameters'] = get_header_cache().get_or_create(
+            ('goes_calibration_parameters', self.mda['image_data_function']), self._get_calibration_params)
 
         res = self.calibrate(res, key.calibration)
         new_attrs = info.copy()
@@ -199,7 +199,8 @@ from satpy import CHUNK_SIZE
 from satpy.readers.file_handlers import BaseFileHandler
 from satpy.readers.goes_imager_hrit import (SPACECRAFTS, EQUATOR_RADIUS, POLE_RADIUS,
                                             ALTITUDE)
-from satpy.readers.utils import bbox, get_geostationary_angle_extent
+from satpy.readers.utils import (bbox, get_geostationary_angle_extent, apply_lut,
+                                 get_calibration_lut, get_header_cache)
 
 logger = logging.getLogger(__name__)
 
@@ -996,10 +997,18 @@ class GOESNCFileHandler(GOESNCBaseFileHandler):
     vis_sectors = VIS_SECTORS
     ir_sectors = IR_SECTORS
 
-    def __init__(self, filename, filename_info, filetype_info):
-        """Initialize the reader."""
+    def __init__(self, filename, filename_info, filetype_info, calib_lut=False):
+        """Initialize the reader.
+
+        With `calib_lut` set to True, the calibration function of each channel
+        is computed once for all the counts, and the data is calibrated by
+        looking up the values of its counts in that table (in 32-bit floats).
+        Counts which aren't stored as integers are calibrated directly.
+
+        """
         super(GOESNCFileHandler, self).__init__(filename, filename_info,
                                                 filetype_info)
+        self.calib_lut = calib_lut
 
     def get_dataset(self, key, info):
         """Load dataset designated by the given key from file"""
@@ -1012,9 +1021,13 @@ class GOESNCFileHandler(GOESNCBaseFileHandler):
             data = self.geo_data['lat']
         else:
             tic = datetime.now()
-            data = self.calibrate(self.nc['data'].isel(time=0),
-                                  calibration=key.calibration,
-                                  channel=key.name)
+            counts = self.nc['data'].isel(time=0)
+            if self.calib_lut and key.calibration != 'counts' and np.issubdtype(counts.dtype, np.integer):
+                data = apply_lut(counts, self._get_calibration_lut(counts.dtype, key.calibration, key.name))
+            else:
+                data = self.calibrate(counts,
+                                      calibration=key.calibration,
+                                      channel=key.name)
             logger.debug('Calibration time: {}'.format(datetime.now() - tic))
 
         # Mask space pixels
@@ -1028,6 +1041,19 @@ class GOESNCFileHandler(GOESNCBaseFileHandler):
 
         return data
 
+    def _get_calibration_lut(self, dtype, calibration, channel):
+        """Get the lookup table calibrating the 16-bit counts of *channel*.
+
+        The tables are kept in the header cache, so they are computed once for
+        each channel.
+
+        """
+        def calibrate_counts(counts):
+            return self.calibrate(xr.DataArray(counts), calibration=calibration, channel=channel)
+
+        key = ('goes_imager_calibration_lut', self.platform_name, channel, calibration, np.dtype(dtype).str)
+        return get_header_cache().get_or_create(key, get_calibration_lut, calibrate_counts, np.iinfo(dtype).max)
+
     def calibrate(self, counts, calibration, channel):
         """Perform calibration"""
         # Convert 16bit counts from netCDF4 file to the original 10bit
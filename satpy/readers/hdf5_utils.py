@@ -24,14 +24,20 @@ import xarray as xr
 import dask.array as da
 
 from satpy.readers.file_handlers import BaseFileHandler
-from satpy.readers.utils import np2str
+from satpy.readers.utils import np2str, file_handle_pool, PooledVariable
 from satpy import CHUNK_SIZE
 
 LOG = logging.getLogger(__name__)
 
 
 class HDF5FileHandler(BaseFileHandler):
-    """Small class for inspecting a HDF5 file and retrieve its metadata/header data."""
+    """Small class for inspecting a HDF5 file and retrieve its metadata/header data.
+
+    The file is opened through the shared
+    :data:`satpy.readers.utils.file_handle_pool`, so the handle is reused for
+    reading the datasets while bounding the number of files open at once.
+
+    """
 
     def __init__(self, filename, filename_info, filetype_info):
         """Initialize file handler."""
@@ -40,15 +46,21 @@ class HDF5FileHandler(BaseFileHandler):
         self.file_content = {}
 
         try:
-            file_handle = h5py.File(self.filename, 'r')
+            with self._acquire() as file_handle:
+                file_handle.visititems(self.collect_metadata)
+                self._collect_attrs('', file_handle.attrs)
         except IOError:
             LOG.exception(
                 'Failed reading file %s. Possibly corrupted file', self.filename)
             raise
 
-        file_handle.visititems(self.collect_metadata)
-        self._collect_attrs('', file_handle.attrs)
-        file_handle.close()
+    def _acquire(self):
+        """Get the pooled handle of the file."""
+        return file_handle_pool.acquire(self.filename, _open_hdf5)
+
+    def __del__(self):
+        """Delete object."""
+        file_handle_pool.close(self.filename)
 
     def _collect_attrs(self, name, attrs):
         for key, value in attrs.items():
@@ -68,7 +80,7 @@ class HDF5FileHandler(BaseFileHandler):
 
     def get_reference(self, name, key):
         """Get reference."""
-        with h5py.File(self.filename, 'r') as hf:
+        with self._acquire() as hf:
             return self._get_reference(hf, hf[name].attrs[key])
 
     def _get_reference(self, hf, ref):
@@ -91,12 +103,16 @@ class HDF5FileHandler(BaseFileHandler):
         """Get item for given key."""
         val = self.file_content[key]
         if isinstance(val, h5py.Dataset):
-            # these datasets are closed and inaccessible when the file is closed, need to reopen
-            dset = h5py.File(self.filename, 'r')[key]
+            # these datasets are closed and inaccessible when the file is closed,
+            # read them through the pool which reopens the file if needed
+            with self._acquire() as file_handle:
+                dset = file_handle[key]
+                attrs = dict(dset.attrs)
+                dset = PooledVariable(self.filename, key, dset.shape, dset.dtype, _open_hdf5)
             dset_data = da.from_array(dset, chunks=CHUNK_SIZE)
             if dset.ndim == 2:
-                return xr.DataArray(dset_data, dims=['y', 'x'], attrs=dset.attrs)
-            return xr.DataArray(dset_data, attrs=dset.attrs)
+                return xr.DataArray(dset_data, dims=['y', 'x'], attrs=attrs)
+            return xr.DataArray(dset_data, attrs=attrs)
 
         return val
 
@@ -110,3 +126,8 @@ class HDF5FileHandler(BaseFileHandler):
             return self[item]
         else:
             return default
+
+
+def _open_hdf5(filename):
+    """Open *filename* with h5py."""
+    return h5py.File(filename, 'r')
@@ -20,17 +20,20 @@
 This module is the base module for all HRIT-based formats. Here, you will find
 the common building blocks for hrit reading.
 
-One of the features here is the on-the-fly decompression of hrit files. It needs
-a path to the xRITDecompress binary to be provided through the environment
-variable called XRIT_DECOMPRESS_PATH. When compressed hrit files are then
-encountered (files finishing with `.C_`), they are decompressed to the system's
-temporary directory for reading.
+One of the features here is the on-the-fly decompression of hrit files. When
+compressed hrit files are encountered (files finishing with `.C_`), they are
+decompressed in memory and the data is read directly from the decompressed
+buffer. If EUMETSAT's `pyPublicDecompWT` python package is installed the
+decompression is done in-process. Otherwise the xRITDecompress binary is used,
+which needs to be provided through the environment variable called
+XRIT_DECOMPRESS_PATH. In that case the file is decompressed to a private
+temporary directory that is removed as soon as the data has been read.
 
 """
 
 import logging
 from datetime import timedelta
-from tempfile import gettempdir
+from tempfile import TemporaryDirectory
 import os
 from io import BytesIO
 from subprocess import Popen, PIPE
@@ -38,6 +41,11 @@ from subprocess import Popen, PIPE
 import numpy as np
 import xarray as xr
 
+try:
+    from pyPublicDecompWT import xRITDecompress
+except ImportError:
+    xRITDecompress = None
+
 import dask.array as da
 from pyresample import geometry
 from satpy.readers.file_handlers import BaseFileHandler
@@ -131,13 +139,10 @@ def decompress(infile, outdir='.'):
     """
     cmd = get_xritdecompress_cmd()
     infile = os.path.abspath(infile)
-    cwd = os.getcwd()
-    os.chdir(outdir)
 
-    p = Popen([cmd, infile], stdout=PIPE)
+    p = Popen([cmd, infile], stdout=PIPE, cwd=outdir)
     stdout = BytesIO(p.communicate()[0])
     status = p.returncode
-    os.chdir(cwd)
 
     if status != 0:
         raise IOError("xrit_decompress '%s', failed, status=%d" % (infile, status))
@@ -150,6 +155,33 @@ def decompress(infile, outdir='.'):
     return os.path.join(outdir, outfile.decode('utf-8'))
 
 
+def decompress_file(infile):
+    """Decompress an XRIT data file and return the decompressed contents.
+
+    The decompression is done in-process with `pyPublicDecompWT` if it is
+    available, otherwise Eumetsat's xRITDecompress is run in a temporary
+    directory (see :func:`decompress`).
+    """
+    if xRITDecompress is not None:
+        with open(infile, 'rb') as fp:
+            xrit = xRITDecompress()
+            xrit.decompress(fp.read())
+        return bytes(xrit.data())
+
+    with TemporaryDirectory() as outdir:
+        outfile = decompress(infile, outdir)
+        with open(outfile, 'rb') as fp:
+            return fp.read()
+
+
+def _read_array(fp, dtype, count):
+    """Read *count* items of *dtype* from a file or an in-memory buffer."""
+    if isinstance(fp, BytesIO):
+        dtype = np.dtype(dtype)
+        return np.frombuffer(fp.read(dtype.itemsize * count), dtype=dtype, count=count)
+    return np.fromfile(fp, dtype=dtype, count=count)
+
+
 class HRITFileHandler(BaseFileHandler):
     """HRIT standard format reader."""
 
@@ -158,12 +190,13 @@ class HRITFileHandler(BaseFileHandler):
         super(HRITFileHandler, self).__init__(filename, filename_info,
                                               filetype_info)
         self.mda = {}
+        self._buffer = None
         self._get_hd(hdr_info)
 
         if self.mda.get('compression_flag_for_data'):
             logger.debug('Unpacking %s', filename)
             try:
-                self.filename = decompress(filename, gettempdir())
+                self._buffer = decompress_file(filename)
             except IOError as err:
                 logger.warning("Unpacking failed: %s", str(err))
             self.mda = {}
@@ -176,17 +209,15 @@ class HRITFileHandler(BaseFileHandler):
         """Open the file, read and get the basic file header info and set the mda dictionary."""
         hdr_map, variable_length_headers, text_headers = hdr_info
 
-        with open(self.filename) as fp:
+        with self._open() as fp:
             total_header_length = 16
             while fp.tell() < total_header_length:
-                hdr_id = np.fromfile(fp, dtype=common_hdr, count=1)[0]
+                hdr_id = _read_array(fp, common_hdr, 1)[0]
                 the_type = hdr_map[hdr_id['hdr_id']]
                 if the_type in variable_length_headers:
                     field_length = int((hdr_id['record_length'] - 3) /
                                        the_type.itemsize)
-                    current_hdr = np.fromfile(fp,
-                                              dtype=the_type,
-                                              count=field_length)
+                    current_hdr = _read_array(fp, the_type, field_length)
                     key = variable_length_headers[the_type]
                     if key in self.mda:
                         if not isinstance(self.mda[key], list):
@@ -199,14 +230,10 @@ class HRITFileHandler(BaseFileHandler):
                                        the_type.itemsize)
                     char = list(the_type.fields.values())[0][0].char
                     new_type = np.dtype(char + str(field_length))
-                    current_hdr = np.fromfile(fp,
-                                              dtype=new_type,
-                                              count=1)[0]
+                    current_hdr = _read_array(fp, new_type, 1)[0]
                     self.mda[text_headers[the_type]] = current_hdr
                 else:
-                    current_hdr = np.fromfile(fp,
-                                              dtype=the_type,
-                                              count=1)[0]
+                    current_hdr = _read_array(fp, the_type, 1)[0]
                     self.mda.update(
                         dict(zip(current_hdr.dtype.names, current_hdr)))
 
@@ -221,6 +248,12 @@ class HRITFileHandler(BaseFileHandler):
                                              'SSP_longitude': 0.0}
         self.mda['orbital_parameters'] = {}
 
+    def _open(self):
+        """Open the file, or the decompressed buffer for compressed files."""
+        if self._buffer is not None:
+            return BytesIO(self._buffer)
+        return open(self.filename)
+
     def get_shape(self, dsid, ds_info):
         """Get shape."""
         return int(self.mda['number_of_lines']), int(self.mda['number_of_columns'])
@@ -321,10 +354,16 @@ class HRITFileHandler(BaseFileHandler):
         elif self.mda['number_of_bits_per_pixel'] in [8, 10]:
             dtype = np.uint8
         shape = (shape, )
-        data = np.memmap(self.filename, mode='r',
-                         offset=self.mda['total_header_length'],
-                         dtype=dtype,
-                         shape=shape)
+        if self._buffer is not None:
+            data = np.frombuffer(self._buffer,
+                                 offset=self.mda['total_header_length'],
+                                 dtype=dtype,
+                                 count=shape[0])
+        else:
+            data = np.memmap(self.filename, mode='r',
+                             offset=self.mda['total_header_length'],
+                             dtype=dtype,
+                             shape=shape)
         data = da.from_array(data, chunks=shape[0])
         if self.mda['number_of_bits_per_pixel'] == 10:
             data = dec10216(data)
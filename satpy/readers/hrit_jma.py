@@ -103,7 +103,7 @@ from satpy.readers.hrit_base import (HRITFileHandler, ancillary_text,
                                      annotation_header, base_hdr_map,
                                      image_data_function)
 from satpy.readers._geos_area import get_area_definition, get_area_extent
-from satpy.readers.utils import get_geostationary_mask
+from satpy.readers.utils import get_geostationary_mask, get_header_cache
 
 logger = logging.getLogger('hrit_jma')
 
@@ -186,6 +186,29 @@ def mjd2datetime64(mjd):
     return epoch + mjd_usec
 
 
+def _parse_calibration_table(image_data_function):
+    """Get the unit and the calibration table from the image data function header.
+
+    Returns:
+        The unit (`None` if not specified) and the table as an array of
+        (count, value) rows.
+
+    """
+    unit = None
+    table = []
+    for item in image_data_function.decode().split('\r')[1:]:
+        if item == '':
+            continue
+        key, value = item.split(':=')
+        if key.startswith('_UNIT'):
+            unit = value
+        elif key.startswith('_NAME'):
+            pass
+        elif key.isdigit():
+            table.append((int(key), float(value)))
+    return unit, np.array(table)
+
+
 class HRITJMAFileHandler(HRITFileHandler):
     """JMA HRIT format reader."""
 
@@ -201,23 +224,13 @@ class HRITJMAFileHandler(HRITFileHandler):
         self.mda['planned_end_segment_number'] = self.mda['total_no_image_segm']
         self.mda['planned_start_segment_number'] = 1
 
-        items = self.mda['image_data_function'].decode().split('\r')
-        if items[0].startswith('$HALFTONE'):
-            self.calibration_table = []
-            for item in items[1:]:
-                if item == '':
-                    continue
-                key, value = item.split(':=')
-                if key.startswith('_UNIT'):
-                    self.mda['unit'] = item.split(':=')[1]
-                elif key.startswith('_NAME'):
-                    pass
-                elif key.isdigit():
-                    key = int(key)
-                    value = float(value)
-                    self.calibration_table.append((key, value))
-
-            self.calibration_table = np.array(self.calibration_table)
+        if self.mda['image_data_function'].decode().startswith('$HALFTONE'):
+            # the table is the same from one time slot to the next
+            unit, self.calibration_table = get_header_cache().get_or_create(
+                ('jma_calibration_table', self.mda['image_data_function']),
+                _parse_calibration_table, self.mda['image_data_function'])
+            if unit is not None:
+                self.mda['unit'] = unit
 
         self.projection_name = self.mda['projection_name'].decode().strip()
         sublon = float(self.projection_name.split('(')[1][:-1])
@@ -22,10 +22,11 @@ import logging
 import numpy as np
 import xarray as xr
 import dask.array as da
+from dask.base import tokenize
 
 from satpy import CHUNK_SIZE
 from satpy.readers.file_handlers import BaseFileHandler
-from satpy.readers.utils import np2str
+from satpy.readers.utils import np2str, file_handle_pool, PooledVariable
 
 LOG = logging.getLogger(__name__)
 
@@ -51,9 +52,12 @@ class NetCDF4FileHandler(BaseFileHandler):
 
         wrapper["/attr/platform_short_name"]
 
-    Note that loading datasets requires reopening the original file
-    (unless those datasets are cached, see below), but to get just the
-    shape of the dataset append "/shape" to the item string:
+    Note that loading datasets requires reopening the original file with
+    `xarray.open_dataset` (unless those datasets are cached, see below). The
+    opened xarray datasets are kept in the shared
+    :data:`satpy.readers.utils.file_handle_pool`, so the file is only opened
+    again once the pool has closed it. To get just the shape of the dataset
+    append "/shape" to the item string:
 
         wrapper["group/subgroup/var_name/shape"]
 
@@ -63,12 +67,15 @@ class NetCDF4FileHandler(BaseFileHandler):
     Warning, this part of the API is provisional and subject to change.
 
     You may get an additional speedup by passing ``cache_handle=True``.  This
-    will keep the netCDF4 dataset handles open throughout the lifetime of the
-    object, and instead of using `xarray.open_dataset` to open every data
-    variable, a dask array will be created "manually".  This may be useful if
-    you have a dataset distributed over many files, such as for FCI.  Note
-    that the coordinates will be missing in this case.  If you use this option,
-    ``xarray_kwargs`` will have no effect.
+    will keep the netCDF4 dataset handles open in the shared
+    :data:`satpy.readers.utils.file_handle_pool`, and instead of using
+    `xarray.open_dataset` to open every data variable, a dask array will be
+    created "manually".  This may be useful if you have a dataset distributed
+    over many files, such as for FCI.  The number of files kept open at the
+    same time is bounded by the pool (see the ``SATPY_MAX_OPEN_FILES``
+    environment variable), the least recently used files are closed and
+    reopened when needed.  Note that the coordinates will be missing in this
+    case.  If you use this option, ``xarray_kwargs`` will have no effect.
 
     Args:
         filename (str): File to read
@@ -77,12 +84,10 @@ class NetCDF4FileHandler(BaseFileHandler):
         auto_maskandscale (bool): Apply mask and scale factors
         xarray_kwargs (dict): Addition arguments to `xarray.open_dataset`
         cache_var_size (int): Cache variables smaller than this size.
-        cache_handle (bool): Keep files open for lifetime of filehandler.
+        cache_handle (bool): Keep files open in the shared file handle pool.
 
     """
 
-    file_handle = None
-
     def __init__(self, filename, filename_info, filetype_info,
                  auto_maskandscale=False, xarray_kwargs=None,
                  cache_var_size=0, cache_handle=False):
@@ -91,17 +96,50 @@ class NetCDF4FileHandler(BaseFileHandler):
             filename, filename_info, filetype_info)
         self.file_content = {}
         self.cached_file_content = {}
+        self.auto_maskandscale = auto_maskandscale
+        self._cache_handle = cache_handle
         try:
-            file_handle = netCDF4.Dataset(self.filename, 'r')
+            if cache_handle:
+                with self._acquire() as file_handle:
+                    self._collect_file_content(file_handle, cache_var_size)
+            else:
+                file_handle = _open_netcdf4(self.filename, auto_maskandscale)
+                try:
+                    self._collect_file_content(file_handle, cache_var_size)
+                finally:
+                    file_handle.close()
         except IOError:
             LOG.exception(
                 'Failed reading file %s. Possibly corrupted file', self.filename)
             raise
 
-        self.auto_maskandscale = auto_maskandscale
-        if hasattr(file_handle, "set_auto_maskandscale"):
-            file_handle.set_auto_maskandscale(auto_maskandscale)
+        self._xarray_kwargs = xarray_kwargs or {}
+        self._xarray_kwargs.setdefault('chunks', CHUNK_SIZE)
+        self._xarray_kwargs.setdefault('mask_and_scale', self.auto_maskandscale)
+        self._xarray_opener = _XarrayOpener(**self._xarray_kwargs)
+
+    def _acquire(self):
+        """Get the pooled handle of the file."""
+        return file_handle_pool.acquire(self.filename, _open_netcdf4, self.auto_maskandscale)
 
+    def _acquire_xr(self, group):
+        """Get the pooled xarray dataset of *group* in the file."""
+        return file_handle_pool.acquire(self.filename, self._xarray_opener, group)
+
+    @property
+    def file_handle(self):
+        """Get the netCDF4 dataset handle if handles are cached, None otherwise.
+
+        The handle is taken from the shared file handle pool and may be closed
+        by it at any later time, so it should not be stored.
+
+        """
+        if not self._cache_handle:
+            return None
+        with self._acquire() as file_handle:
+            return file_handle
+
+    def _collect_file_content(self, file_handle, cache_var_size):
         self.collect_metadata("", file_handle)
         self.collect_dimensions("", file_handle)
         if cache_var_size > 0:
@@ -112,21 +150,11 @@ class NetCDF4FileHandler(BaseFileHandler):
                         and isinstance(var.dtype, np.dtype)  # vlen may be str
                         and var.size * var.dtype.itemsize < cache_var_size],
                     file_handle)
-        if cache_handle:
-            self.file_handle = file_handle
-        else:
-            file_handle.close()
-        self._xarray_kwargs = xarray_kwargs or {}
-        self._xarray_kwargs.setdefault('chunks', CHUNK_SIZE)
-        self._xarray_kwargs.setdefault('mask_and_scale', self.auto_maskandscale)
 
     def __del__(self):
         """Delete object."""
-        if self.file_handle is not None:
-            try:
-                self.file_handle.close()
-            except RuntimeError:  # presumably closed already
-                pass
+        if hasattr(self, 'filename'):
+            file_handle_pool.close(self.filename)
 
     def _collect_attrs(self, name, obj):
         """Collect all the attributes for the provided file object."""
@@ -205,14 +233,12 @@ class NetCDF4FileHandler(BaseFileHandler):
                 val = self._get_var_from_xr(group, key)
         elif isinstance(val, netCDF4.Group):
             # Full groups are conveniently read with xr even if file_handle is available
-            with xr.open_dataset(self.filename, group=key,
-                                 **self._xarray_kwargs) as nc:
+            with self._acquire_xr(key) as nc:
                 val = nc
         return val
 
     def _get_var_from_xr(self, group, key):
-        with xr.open_dataset(self.filename, group=group,
-                             **self._xarray_kwargs) as nc:
+        with self._acquire_xr(group) as nc:
             val = nc[key]
             # Even though `chunks` is specified in the kwargs, xarray
             # uses dask.arrays only for data variables that have at least
@@ -229,14 +255,14 @@ class NetCDF4FileHandler(BaseFileHandler):
     def _get_var_from_filehandle(self, group, key):
         # Not getting coordinates as this is more work, therefore more
         # overhead, and those are not used downstream.
-        if group is None:
-            g = self.file_handle
-        else:
-            g = self.file_handle[group]
-        v = g[key]
+        path = key if group is None else group + '/' + key
+        with self._acquire() as file_handle:
+            v = file_handle[path]
+            dims, attrs, name = v.dimensions, v.__dict__, v.name
+            var = PooledVariable(self.filename, path, v.shape, v.dtype,
+                                 _open_netcdf4, self.auto_maskandscale)
         x = xr.DataArray(
-                da.from_array(v), dims=v.dimensions, attrs=v.__dict__,
-                name=v.name)
+                da.from_array(var), dims=dims, attrs=attrs, name=name)
         return x
 
     def __contains__(self, item):
@@ -249,3 +275,37 @@ class NetCDF4FileHandler(BaseFileHandler):
             return self[item]
         else:
             return default
+
+
+class _XarrayOpener(object):
+    """Open files with `xarray.open_dataset` and the given keyword arguments.
+
+    The openers with the same arguments compare equal, so the datasets they
+    open are shared in the file handle pool.
+
+    """
+
+    def __init__(self, **kwargs):
+        """Store the keyword arguments for `xarray.open_dataset`."""
+        self.kwargs = kwargs
+        self._token = tokenize(kwargs)
+
+    def __call__(self, filename, group):
+        """Open *group* in *filename*."""
+        return xr.open_dataset(filename, group=group, **self.kwargs)
+
+    def __eq__(self, other):
+        """Compare the arguments of the openers."""
+        return isinstance(other, _XarrayOpener) and self._token == other._token
+
+    def __hash__(self):
+        """Hash the arguments of the opener."""
+        return hash(self._token)
+
+
+def _open_netcdf4(filename, auto_maskandscale):
+    """Open *filename* with netCDF4."""
+    file_handle = netCDF4.Dataset(filename, 'r')
+    if hasattr(file_handle, "set_auto_maskandscale"):
+        file_handle.set_auto_maskandscale(auto_maskandscale)
+    return file_handle
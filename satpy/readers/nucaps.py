@@ -329,7 +329,9 @@ class NUCAPSReader(FileYAMLReader):
             elif len(pressure_levels) == 2:
                 cond = (plevels_ds >= pressure_levels[0]) & (plevels_ds <= pressure_levels[1])
             else:
-                cond = plevels_ds == pressure_levels
+                # the levels may have been loaded with a lower precision
+                levels = np.asarray(plevels_ds)
+                cond = plevels_ds.copy(data=np.isclose(levels[:, np.newaxis], pressure_levels).any(axis=1))
             if cond is not None:
                 new_plevels = plevels_ds.where(cond, drop=True)
             else:
@@ -25,10 +25,11 @@ References:
 
 import numpy as np
 from numpy.polynomial.chebyshev import Chebyshev
-import dask.array as da
 
+from satpy.readers._unpack import unpack_bits
 from satpy.readers.eum_base import (time_cds_short,
                                     issue_revision)
+from satpy.readers.utils import get_calibration_lut, get_header_cache
 
 PLATFORM_DICT = {
     'MET08': 'Meteosat-8',
@@ -252,27 +253,11 @@ def dec10216(inbuf):
         op[2] = (ip[2] & 0x0F)*64 + ip[3]/4;
         op[3] = (ip[3] & 0x03)*256 +ip[4];
 
-    """
-    arr10 = inbuf.astype(np.uint16)
-    arr16_len = int(len(arr10) * 4 / 5)
-    arr10_len = int((arr16_len * 5) / 4)
-    arr10 = arr10[:arr10_len]  # adjust size
-
-    # dask is slow with indexing
-    arr10_0 = arr10[::5]
-    arr10_1 = arr10[1::5]
-    arr10_2 = arr10[2::5]
-    arr10_3 = arr10[3::5]
-    arr10_4 = arr10[4::5]
-
-    arr16_0 = (arr10_0 << 2) + (arr10_1 >> 6)
-    arr16_1 = ((arr10_1 & 63) << 4) + (arr10_2 >> 4)
-    arr16_2 = ((arr10_2 & 15) << 6) + (arr10_3 >> 2)
-    arr16_3 = ((arr10_3 & 3) << 8) + arr10_4
-    arr16 = da.stack([arr16_0, arr16_1, arr16_2, arr16_3], axis=-1).ravel()
-    arr16 = da.rechunk(arr16, arr16.shape[0])
+    The unpacking is done by :func:`satpy.readers._unpack.unpack_bits`, block
+    by block for dask arrays.
 
-    return arr16
+    """
+    return unpack_bits(inbuf, 10)
 
 
 class MpefProductHeader(object):
@@ -375,6 +360,28 @@ class SEVIRICalibrationHandler(object):
         """Calibrate to reflectance."""
         return data * 100.0 / solar_irradiance
 
+    def _get_calibration_lut(self, calibration, channel_name, gain, offset, cal_type=None,
+                             nbits=10, mask_zero=False):
+        """Get the lookup table calibrating the *nbits*-bit counts of *channel_name*.
+
+        The tables are kept in the header cache, so they are computed once for
+        the coefficients of a channel. Zero counts are masked if *mask_zero*.
+
+        """
+        def calibrate_counts(counts):
+            if mask_zero:
+                counts = np.where(counts > 0, counts, np.nan)
+            res = self._convert_to_radiance(counts, gain, offset)
+            if calibration == 'reflectance':
+                res = self._vis_calibrate(res, CALIB[self.platform_id][channel_name]["F"])
+            elif calibration == 'brightness_temperature':
+                res = self._ir_calibrate(res, channel_name, cal_type)
+            return res
+
+        key = ('seviri_calibration_lut', self.platform_id, channel_name, calibration,
+               float(gain), float(offset), cal_type, nbits, mask_zero)
+        return get_header_cache().get_or_create(key, get_calibration_lut, calibrate_counts, 2 ** nbits - 1)
+
 
 def chebyshev(coefs, time, domain):
     """Evaluate a Chebyshev Polynomial.
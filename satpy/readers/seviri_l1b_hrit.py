@@ -157,6 +157,7 @@ from satpy.readers.seviri_base import (CALIB, CHANNEL_NAMES, SATNUM,
 from satpy.readers.seviri_l1b_native_hdr import (hrit_epilogue, hrit_prologue,
                                                  impf_configuration)
 from satpy.readers._geos_area import get_area_extent, get_area_definition
+from satpy.readers.utils import apply_lut
 
 
 logger = logging.getLogger('hrit_msg')
@@ -242,7 +243,7 @@ class HRITMSGPrologueFileHandler(HRITMSGPrologueEpilogueBase):
     """SEVIRI HRIT prologue reader."""
 
     def __init__(self, filename, filename_info, filetype_info, calib_mode='nominal',
-                 ext_calib_coefs=None, mda_max_array_size=None, fill_hrv=None):
+                 ext_calib_coefs=None, mda_max_array_size=None, fill_hrv=None, calib_lut=None):
         """Initialize the reader."""
         super(HRITMSGPrologueFileHandler, self).__init__(filename, filename_info,
                                                          filetype_info,
@@ -389,7 +390,7 @@ class HRITMSGEpilogueFileHandler(HRITMSGPrologueEpilogueBase):
     """SEVIRI HRIT epilogue reader."""
 
     def __init__(self, filename, filename_info, filetype_info, calib_mode='nominal',
-                 ext_calib_coefs=None, mda_max_array_size=None, fill_hrv=None):
+                 ext_calib_coefs=None, mda_max_array_size=None, fill_hrv=None, calib_lut=None):
         """Initialize the reader."""
         super(HRITMSGEpilogueFileHandler, self).__init__(filename, filename_info,
                                                          filetype_info,
@@ -487,11 +488,21 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
                             reader='seviri_l1b_hrit',
                             reader_kwargs={'fill_hrv': False})
 
+    **Calibration with lookup tables**
+
+    With `calib_lut` set to True, the calibration function of each channel
+    is computed once for all the 10-bit counts, and the data is calibrated
+    by looking up the values of its counts in that table (in 32-bit floats)::
+
+        scene = satpy.Scene(filenames,
+                            reader='seviri_l1b_hrit',
+                            reader_kwargs={'calib_lut': True})
+
     """
 
     def __init__(self, filename, filename_info, filetype_info,
                  prologue, epilogue, calib_mode='nominal',
-                 ext_calib_coefs=None, mda_max_array_size=100, fill_hrv=True):
+                 ext_calib_coefs=None, mda_max_array_size=100, fill_hrv=True, calib_lut=False):
         """Initialize the reader."""
         super(HRITMSGFileHandler, self).__init__(filename, filename_info,
                                                  filetype_info,
@@ -507,6 +518,7 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
         self.ext_calib_coefs = ext_calib_coefs if ext_calib_coefs is not None else {}
         self.mda_max_array_size = mda_max_array_size
         self.fill_hrv = fill_hrv
+        self.calib_lut = calib_lut
         calib_mode_choices = ('NOMINAL', 'GSICS')
         if calib_mode.upper() not in calib_mode_choices:
             raise ValueError('Invalid calibration mode: {}. Choose one of {}'.format(
@@ -758,16 +770,28 @@ class HRITMSGFileHandler(HRITFileHandler, SEVIRICalibrationHandler):
             gain = self.ext_calib_coefs.get(self.channel_name, {}).get('gain', int_gain)
             offset = self.ext_calib_coefs.get(self.channel_name, {}).get('offset', int_offset)
 
-            # Convert to radiance
-            data = data.where(data > 0)
-            res = self._convert_to_radiance(data.astype(np.float32), gain, offset)
+            if self.calib_lut:
+                cal_type = None
+                if calibration == 'brightness_temperature':
+                    cal_type = self.prologue['ImageDescription'][
+                        'Level15ImageProduction']['PlannedChanProcessing'][self.mda['spectral_channel_id']]
+                lut = self._get_calibration_lut(calibration, channel_name, gain, offset, cal_type,
+                                                nbits=self.mda['number_of_bits_per_pixel'], mask_zero=True)
+                res = apply_lut(data, lut)
+            else:
+                # Convert to radiance
+                data = data.where(data > 0)
+                res = self._convert_to_radiance(data.astype(np.float32), gain, offset)
             line_mask = self.mda['image_segment_line_quality']['line_validity'] >= 2
             line_mask &= self.mda['image_segment_line_quality']['line_validity'] <= 3
             line_mask &= self.mda['image_segment_line_quality']['line_radiometric_quality'] == 4
             line_mask &= self.mda['image_segment_line_quality']['line_geometric_quality'] == 4
             res *= np.choose(line_mask, [1, np.nan])[:, np.newaxis].astype(np.float32)
 
-        if calibration == 'reflectance':
+        if self.calib_lut:
+            # the lookup table gives the final values
+            pass
+        elif calibration == 'reflectance':
             solar_irradiance = CALIB[self.platform_id][channel_name]["F"]
             res = self._vis_calibrate(res, solar_irradiance)
 
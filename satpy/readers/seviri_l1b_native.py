@@ -46,6 +46,7 @@ from satpy.readers.seviri_base import (SEVIRICalibrationHandler,
 from satpy.readers.seviri_l1b_native_hdr import (GSDTRecords, native_header,
                                                  native_trailer)
 from satpy.readers._geos_area import get_area_definition
+from satpy.readers.utils import apply_lut
 
 
 logger = logging.getLogger('native_msg')
@@ -57,15 +58,21 @@ class NativeMSGFileHandler(BaseFileHandler, SEVIRICalibrationHandler):
     The Level1.5 Image data calibration method can be changed by adding the
     required mode to the Scene object instantiation  kwargs eg
     kwargs = {"calib_mode": "gsics",}
+
+    With ``kwargs = {"calib_lut": True}``, the calibration function of each
+    channel is computed once for all the 10-bit counts, and the data is
+    calibrated by looking up the values of its counts in that table (in 32-bit
+    floats).
     """
 
-    def __init__(self, filename, filename_info, filetype_info,  calib_mode='nominal'):
+    def __init__(self, filename, filename_info, filetype_info,  calib_mode='nominal', calib_lut=False):
         """Initialize the reader."""
         super(NativeMSGFileHandler, self).__init__(filename,
                                                    filename_info,
                                                    filetype_info)
         self.platform_name = None
         self.calib_mode = calib_mode
+        self.calib_lut = calib_lut
 
         # Declare required variables.
         # Assume a full disk file, reset in _read_header if otherwise.
@@ -501,6 +508,14 @@ class NativeMSGFileHandler(BaseFileHandler, SEVIRICalibrationHandler):
                 gain = coeffs['GSICSCalCoeff'][i]
                 offset = coeffs['GSICSOffsetCount'][i]
                 offset = offset * gain
+            if self.calib_lut:
+                cal_type = None
+                if calibration == 'brightness_temperature':
+                    cal_type = data15hdr['ImageDescription'][
+                        'Level15ImageProduction']['PlannedChanProcessing'][i]
+                res = apply_lut(data, self._get_calibration_lut(calibration, channel, gain, offset, cal_type))
+                logger.debug("Calibration time " + str(datetime.now() - tic))
+                return res
             res = self._convert_to_radiance(data, gain, offset)
 
         if calibration == 'reflectance':
@@ -19,13 +19,19 @@
 
 import logging
 
-from contextlib import closing
+from collections import OrderedDict
+from contextlib import closing, contextmanager
 import tempfile
 import bz2
 import os
+import pickle
 import shutil
+import threading
+import time
+import dask.array as da
 import numpy as np
 import pyproj
+import xarray as xr
 from io import BytesIO
 from subprocess import Popen, PIPE
 from pyresample.geometry import AreaDefinition
@@ -285,3 +291,299 @@ def reduce_mda(mda, max_size=100):
         elif not (isinstance(val, np.ndarray) and val.size > max_size):
             reduced[key] = val
     return reduced
+
+
+def get_calibration_lut(calibrate, max_count, dtype=np.float32):
+    """Get the lookup table of the calibration function *calibrate* for the counts up to *max_count*.
+
+    *calibrate* is called once with all the counts from 0 to *max_count* as a
+    float64 array, the table has the type *dtype*.
+
+    """
+    counts = np.arange(max_count + 1, dtype=np.float64)
+    return np.asarray(calibrate(counts), dtype=dtype)
+
+
+def _take_lut(counts, lut):
+    """Get the values of *lut* for the *counts* of a numpy array."""
+    if np.issubdtype(counts.dtype, np.integer):
+        return lut.take(counts, mode='clip')
+    valid = np.isfinite(counts)
+    res = lut.take(np.where(valid, counts, 0).astype(np.intp), mode='clip')
+    res[~valid] = np.nan
+    return res
+
+
+def apply_lut(data, lut):
+    """Calibrate the counts of *data* with the lookup table *lut* of the calibrated value of every count.
+
+    This is one gather per chunk instead of evaluating the calibration
+    functions for every pixel. Masked (NaN) counts stay masked and the counts
+    beyond the table get its last value.
+
+    Args:
+        data (xarray.DataArray, dask.array.Array or numpy.ndarray): Counts.
+        lut (numpy.ndarray): Table from :func:`get_calibration_lut`.
+
+    """
+    if isinstance(data, xr.DataArray):
+        return data.copy(data=apply_lut(data.data, lut))
+    if isinstance(data, da.Array):
+        return data.map_blocks(_take_lut, lut, dtype=lut.dtype)
+    return _take_lut(np.asarray(data), lut)
+
+
+class FileHandlePool(object):
+    """Thread-safe pool of open file handles, bounded by the number of handles.
+
+    Handles are opened on demand by :meth:`acquire` and kept open for later
+    use. When more than `max_handles` handles are open, the least recently
+    used ones are closed. A closed handle is transparently reopened the next
+    time it is acquired, so the objects using the pool must not hold on to
+    the handles (or to variables or datasets read from them) between accesses.
+
+    The pool lock is held while a handle is in use. This serializes the
+    accesses to the files, which the underlying HDF5 and NetCDF libraries
+    require anyway as they are generally not thread-safe.
+
+    Handles inherited from a parent process through a fork are never used nor
+    closed by the child process: the pool is silently emptied instead and the
+    files are reopened.
+
+    """
+
+    def __init__(self, max_handles):
+        """Initialize the pool with a maximum of `max_handles` open handles."""
+        self.max_handles = max_handles
+        self._handles = OrderedDict()
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def _check_pid(self):
+        if os.getpid() != self._pid:
+            # forked: the handles belong to the parent process
+            self._lock = threading.RLock()
+            self._handles = OrderedDict()
+            self._pid = os.getpid()
+
+    def __len__(self):
+        """Get the number of open handles."""
+        self._check_pid()
+        return len(self._handles)
+
+    def __contains__(self, filename):
+        """Check if a handle to *filename* is open."""
+        self._check_pid()
+        return any(key[0] == filename for key in self._handles)
+
+    @contextmanager
+    def acquire(self, filename, opener, *args):
+        """Get an open handle to *filename*, opening it with `opener(filename, *args)` if needed.
+
+        The handle is only valid inside the ``with`` block.
+
+        """
+        self._check_pid()
+        key = (filename, opener, args)
+        with self._lock:
+            try:
+                handle = self._handles[key]
+                self._handles.move_to_end(key)
+            except KeyError:
+                handle = opener(filename, *args)
+                self._handles[key] = handle
+                while len(self._handles) > max(self.max_handles, 1):
+                    self._close(next(iter(self._handles)))
+            yield handle
+
+    def _close(self, key):
+        handle = self._handles.pop(key)
+        try:
+            handle.close()
+        except (IOError, RuntimeError, ValueError):  # presumably closed already
+            pass
+
+    def close(self, filename):
+        """Close all handles to *filename*."""
+        self._check_pid()
+        with self._lock:
+            for key in [key for key in self._handles if key[0] == filename]:
+                self._close(key)
+
+    def clear(self):
+        """Close all handles."""
+        self._check_pid()
+        with self._lock:
+            for key in list(self._handles):
+                self._close(key)
+
+
+file_handle_pool = FileHandlePool(int(os.getenv('SATPY_MAX_OPEN_FILES', 128)))
+
+
+class PooledVariable(object):
+    """Array-like access to a variable of a file opened through :data:`file_handle_pool`.
+
+    The file is only opened (or taken from the pool) when data is read, so
+    this can be wrapped in a dask array without keeping the file open.
+
+    """
+
+    def __init__(self, filename, path, shape, dtype, opener, *args):
+        """Initialize the variable found at *path* in *filename*."""
+        self.filename = filename
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = dtype
+        self.opener = opener
+        self.args = args
+
+    @property
+    def ndim(self):
+        """Get the number of dimensions."""
+        return len(self.shape)
+
+    def __getitem__(self, key):
+        """Read the data for *key* from the file."""
+        with file_handle_pool.acquire(self.filename, self.opener, *self.args) as handle:
+            return handle[self.path][key]
+
+    def __dask_tokenize__(self):
+        """Get a deterministic token for dask."""
+        return (self.filename, self.path, self.opener, self.args)
+
+
+class HeaderCache(object):
+    """Cache of the items derived from file headers, e.g. area definitions and calibration tables.
+
+    Geostationary satellites have the same projection, geometry and
+    calibration tables from one time slot to the next, so the file handlers
+    can reuse the items derived from the headers of the previous slots instead
+    of computing them again. The items are stored by a key made of the header
+    values they are derived from (the invariants), prefixed with the kind of
+    item, so that an item is only reused when these values match.
+
+    The items are kept in memory for `ttl` seconds, with a maximum of
+    `max_items` items. If `cache_dir` is set, they are also pickled to that
+    directory so that they can be shared between processes.
+
+    """
+
+    def __init__(self, ttl=3600, max_items=256, cache_dir=None):
+        """Initialize the empty cache."""
+        self.ttl = ttl
+        self.max_items = max_items
+        self.cache_dir = cache_dir
+        self._items = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        """Get the number of items kept in memory."""
+        return len(self._items)
+
+    def _get_cache_filename(self, key):
+        from dask.base import tokenize
+        return os.path.join(self.cache_dir, "satpy_header-{}.pickle".format(tokenize(key)))
+
+    def _load(self, key):
+        """Load the item for *key* from `cache_dir`, raise KeyError if it isn't there or is expired."""
+        filename = self._get_cache_filename(key)
+        try:
+            if time.time() - os.path.getmtime(filename) > self.ttl:
+                raise KeyError(key)
+            with open(filename, 'rb') as fd:
+                return pickle.load(fd)
+        except (IOError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            raise KeyError(key)
+
+    def _save(self, key, val):
+        """Pickle the item for *key* to `cache_dir`."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_filename = tempfile.mkstemp(dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'wb') as fd:
+                    pickle.dump(val, fd, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_filename, self._get_cache_filename(key))
+            except BaseException:
+                # don't leave partially written files behind
+                os.remove(tmp_filename)
+                raise
+        except (IOError, pickle.PicklingError, AttributeError, TypeError):
+            LOGGER.debug("Could not save the cached header item to %s", self.cache_dir, exc_info=True)
+
+    def __getitem__(self, key):
+        """Get the item for *key*, raise KeyError if it isn't cached or is expired."""
+        with self._lock:
+            try:
+                stored, val = self._items[key]
+                if time.time() - stored > self.ttl:
+                    del self._items[key]
+                    raise KeyError(key)
+                self._items.move_to_end(key)
+                return val
+            except KeyError:
+                if not self.cache_dir:
+                    raise
+            val = self._load(key)
+            self._store(key, val)
+            return val
+
+    def _store(self, key, val):
+        self._items[key] = (time.time(), val)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def __setitem__(self, key, val):
+        """Cache *val* for *key*."""
+        if self.ttl <= 0 or self.max_items <= 0:
+            return
+        with self._lock:
+            self._store(key, val)
+            if self.cache_dir:
+                self._save(key, val)
+
+    def get(self, key, default=None):
+        """Get the item for *key* or *default* if it isn't cached."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def get_or_create(self, key, func, *args, **kwargs):
+        """Get the item for *key*, creating it with ``func(*args, **kwargs)`` if it isn't cached."""
+        try:
+            return self[key]
+        except KeyError:
+            pass
+        val = func(*args, **kwargs)
+        self[key] = val
+        return val
+
+    def clear(self):
+        """Empty the in-memory cache."""
+        with self._lock:
+            self._items.clear()
+
+
+header_cache = HeaderCache(ttl=float(os.getenv('SATPY_HEADER_CACHE_TTL', 3600)),
+                           max_items=int(os.getenv('SATPY_HEADER_CACHE_SIZE', 256)),
+                           cache_dir=os.getenv('SATPY_HEADER_CACHE_DIR'))
+
+
+def get_header_cache():
+    """Get the cache used by the file handlers for the items derived from file headers."""
+    return header_cache
+
+
+def set_header_cache(cache):
+    """Replace the cache used by the file handlers for the items derived from file headers.
+
+    *cache* can be a :class:`HeaderCache` with other settings or any object
+    with the same ``get_or_create`` method, e.g. one backed by a shared
+    key-value store.
+
+    """
+    global header_cache
+    header_cache = cache
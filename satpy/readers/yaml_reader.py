@@ -20,34 +20,38 @@ import glob
 import itertools
 import logging
 import os
+import time
 import warnings
 from abc import ABCMeta, abstractmethod
 from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from fnmatch import fnmatch
 from weakref import WeakValueDictionary
 
 import xarray as xr
-import yaml
 import numpy as np
 
-try:
-    from yaml import UnsafeLoader
-except ImportError:
-    from yaml import Loader as UnsafeLoader
-
 from pyresample.geometry import StackedAreaDefinition, SwathDefinition
 from pyresample.boundary import AreaDefBoundary, Boundary
 from satpy.resample import get_area_def
-from satpy.config import recursive_dict_update
+from satpy.config import read_yaml_file, recursive_dict_update
 from satpy.dataset import DATASET_KEYS, DatasetID
-from satpy.readers import DatasetDict, get_key
-from satpy.resample import add_crs_xy_coords
+from satpy.readers import DatasetDict, DatasetIDIndex, get_key
+from satpy.resample import add_crs_xy_coords, get_crop_slices
+from satpy.utils import SizedLRUCache, apply_precision
 from trollsift.parser import globify, parse
 from pyresample.geometry import AreaDefinition
 
 
 logger = logging.getLogger(__name__)
 
+# keyword arguments of `FileYAMLReader.load` to load only a part of the datasets
+CROP_KEYWORDS = ('area', 'll_bbox', 'xy_bbox')
+
+# area definitions of the segments not opened yet, see `LazyFileHandler`
+SEGMENT_AREA_CACHE_SIZE = int(os.getenv('SATPY_SEGMENT_AREA_CACHE_SIZE', 1024))
+segment_area_cache = SizedLRUCache(SEGMENT_AREA_CACHE_SIZE, sizeof=lambda val: 1)
+
 
 def listify_string(something):
     """Take *something* and make it a list.
@@ -97,8 +101,7 @@ class AbstractYAMLReader(metaclass=ABCMeta):
         self.config = {}
         self.config_files = config_files
         for config_file in config_files:
-            with open(config_file) as fd:
-                self.config = recursive_dict_update(self.config, yaml.load(fd, Loader=UnsafeLoader))
+            self.config = recursive_dict_update(self.config, read_yaml_file(config_file))
 
         self.info = self.config['reader']
         self.name = self.info['name']
@@ -235,7 +238,26 @@ class AbstractYAMLReader(metaclass=ABCMeta):
         See `satpy.readers.get_key` for more information about kwargs.
 
         """
-        return get_key(key, self.all_ids.keys(), **kwargs)
+        return get_key(key, self._get_ids_index('all_ids'), **kwargs)
+
+    def _get_ids_index(self, attr):
+        """Get a `DatasetIDIndex` of the keys of the *attr* dictionary.
+
+        The index is rebuilt when the dictionary is replaced or its size
+        changes.
+
+        """
+        ids = getattr(self, attr)
+        indexes = self.__dict__.setdefault('_ids_indexes', {})
+        try:
+            cached_ids, size, index = indexes[attr]
+            if cached_ids is ids and size == len(ids):
+                return index
+        except KeyError:
+            pass
+        index = DatasetIDIndex(ids.keys())
+        indexes[attr] = (ids, len(ids), index)
+        return index
 
     def load_ds_ids_from_config(self):
         """Get the dataset ids from the config."""
@@ -287,6 +309,13 @@ class AbstractYAMLReader(metaclass=ABCMeta):
         return ids
 
 
+def _create_filehandler(filetype_cls, filename, filename_info, filetype_info, req_fh, fh_kwargs):
+    """Create a file handler and measure how long it took."""
+    start = time.perf_counter()
+    file_handler = filetype_cls(filename, filename_info, filetype_info, *req_fh, **fh_kwargs)
+    return file_handler, time.perf_counter() - start
+
+
 class FileYAMLReader(AbstractYAMLReader):
     """Primary reader base class that is configured by a YAML file.
 
@@ -297,12 +326,27 @@ class FileYAMLReader(AbstractYAMLReader):
     its base class and can be used as a reader by itself and requires no
     subclassing.
 
+    File handlers are created one after the other by default. For readers
+    with many files (HRIT segments, SDR granules, ...) the ``filehandler_workers``
+    reader keyword argument can be used to create them in a pool of
+    ``filehandler_workers`` workers. The pool is a thread pool by default,
+    pass ``filehandler_pool='process'`` to use a process pool instead (this
+    requires that the file handlers can be pickled). The file handlers are
+    returned in the same order as with serial creation. The time it took to
+    create each file handler is stored in the ``filehandler_timings``
+    dictionary (filename to seconds)::
+
+        scn = Scene(filenames, reader='seviri_l1b_hrit',
+                    reader_kwargs={'filehandler_workers': 8})
+
     """
 
     def __init__(self,
                  config_files,
                  filter_parameters=None,
                  filter_filenames=True,
+                 filehandler_workers=None,
+                 filehandler_pool='thread',
                  **kwargs):
         """Set up initial internal storage for loading file data."""
         super(FileYAMLReader, self).__init__(config_files)
@@ -312,6 +356,11 @@ class FileYAMLReader(AbstractYAMLReader):
         self.filter_filenames = self.info.get('filter_filenames', filter_filenames)
         self.filter_parameters = filter_parameters or {}
         self.coords_cache = WeakValueDictionary()
+        if filehandler_pool not in ('thread', 'process'):
+            raise ValueError("Unknown file handler pool type: {}".format(filehandler_pool))
+        self.filehandler_workers = filehandler_workers
+        self.filehandler_pool = filehandler_pool
+        self.filehandler_timings = {}
 
     @property
     def sensor_names(self):
@@ -437,12 +486,25 @@ class FileYAMLReader(AbstractYAMLReader):
 
     def _new_filehandler_instances(self, filetype_info, filename_items, fh_kwargs=None):
         """Generate new filehandler instances."""
+        fh_args = self._filehandler_args(filetype_info, filename_items, fh_kwargs=fh_kwargs)
+        for file_handler, duration in self._create_filehandlers_from_args(fh_args):
+            logger.debug("Created file handler for %s in %.3f s", file_handler.filename, duration)
+            self.filehandler_timings[file_handler.filename] = duration
+            yield file_handler
+
+    def _filehandler_args(self, filetype_info, filename_items, fh_kwargs=None):
+        """Get the arguments to create the file handlers of *filename_items* with.
+
+        Files whose requirements aren't available are skipped with a warning.
+
+        """
         requirements = filetype_info.get('requires')
         filetype_cls = filetype_info['file_reader']
 
         if fh_kwargs is None:
             fh_kwargs = {}
 
+        fh_args = []
         for filename, filename_info in filename_items:
             try:
                 req_fh = self.find_required_filehandlers(requirements,
@@ -455,8 +517,23 @@ class FileYAMLReader(AbstractYAMLReader):
             except RuntimeError as err:
                 warnings.warn(str(err) + ' for {}'.format(filename))
                 continue
+            fh_args.append((filetype_cls, filename, filename_info, filetype_info, req_fh, fh_kwargs))
+        return fh_args
+
+    def _create_filehandlers_from_args(self, fh_args):
+        """Create the file handlers, in a pool of workers if requested.
+
+        The file handlers are generated in the order of *fh_args*.
 
-            yield filetype_cls(filename, filename_info, filetype_info, *req_fh, **fh_kwargs)
+        """
+        if not self.filehandler_workers or self.filehandler_workers < 2 or len(fh_args) < 2:
+            for args in fh_args:
+                yield _create_filehandler(*args)
+            return
+
+        executor_cls = ProcessPoolExecutor if self.filehandler_pool == 'process' else ThreadPoolExecutor
+        with executor_cls(max_workers=self.filehandler_workers) as executor:
+            yield from executor.map(_create_filehandler, *zip(*fh_args))
 
     def time_matches(self, fstart, fend):
         """Check that a file's start and end time mtach filter_parameters of this reader."""
@@ -770,13 +847,26 @@ class FileYAMLReader(AbstractYAMLReader):
                 logger.debug("No coordinates found for %s", str(dsid))
             return area
 
-    def _load_dataset_with_area(self, dsid, coords, **kwargs):
-        """Load *dsid* and its area if available."""
+    def _load_dataset_with_area(self, dsid, coords, crop_windows=None, **kwargs):
+        """Load *dsid* and its area if available.
+
+        If *crop_windows* is provided, only the rows and columns of the
+        dataset in the window of its area are loaded.
+
+        """
         file_handlers = self._get_file_handlers(dsid)
         if not file_handlers:
             return
 
         area = self._load_dataset_area(dsid, file_handlers, coords, **kwargs)
+        window = None
+        if crop_windows is not None:
+            if isinstance(area, AreaDefinition):
+                window = crop_windows.get(area)
+            else:
+                logger.debug("Can't crop %s while loading it, its area isn't an AreaDefinition", dsid)
+        if window is not None:
+            kwargs['window'] = window
 
         try:
             ds = self._load_dataset_data(file_handlers, dsid, **kwargs)
@@ -784,12 +874,34 @@ class FileYAMLReader(AbstractYAMLReader):
             logger.exception("Could not load dataset '%s': %s", dsid, str(err))
             return None
 
+        if window is not None:
+            if ds.dims[-2:] == ('y', 'x') and ds.shape[-2:] == area.shape:
+                ds = ds.isel(y=window[0], x=window[1])
+                area = area[window]
+            else:
+                logger.debug("Can't crop %s while loading it", dsid)
+
         if area is not None:
             ds.attrs['area'] = area
             ds = add_crs_xy_coords(ds, area)
         return ds
 
-    def _load_ancillary_variables(self, datasets):
+    def _get_crop_windows(self, dsids, crop, **kwargs):
+        """Get the windows of the area definitions of *dsids* covering the *crop* area or bounding box."""
+        areas = set()
+        for dsid in dsids:
+            file_handlers = self._get_file_handlers(dsid)
+            if not file_handlers:
+                continue
+            try:
+                area = self._load_area_def(dsid, file_handlers, **kwargs)
+            except NotImplementedError:
+                continue
+            if isinstance(area, AreaDefinition):
+                areas.add(area)
+        return _get_crop_windows(areas, crop)
+
+    def _load_ancillary_variables(self, datasets, **kwargs):
         """Load the ancillary variables of `datasets`."""
         all_av_ids = set()
         for dataset in datasets.values():
@@ -809,7 +921,7 @@ class FileYAMLReader(AbstractYAMLReader):
         if not all_av_ids:
             return
         if loadable_av_ids:
-            self.load(loadable_av_ids, previous_datasets=datasets)
+            self.load(loadable_av_ids, previous_datasets=datasets, **kwargs)
 
         for dataset in datasets.values():
             new_vars = []
@@ -846,17 +958,29 @@ class FileYAMLReader(AbstractYAMLReader):
 
         """
         try:
-            return get_key(key, self.available_ids.keys(), **kwargs)
+            return get_key(key, self._get_ids_index('available_ids'), **kwargs)
         except KeyError:
             if available_only:
                 raise
-            return get_key(key, self.all_ids.keys(), **kwargs)
+            return get_key(key, self._get_ids_index('all_ids'), **kwargs)
 
     def load(self, dataset_keys, previous_datasets=None, **kwargs):
         """Load `dataset_keys`.
 
         If `previous_datasets` is provided, do not reload those.
+
+        One of the ``area`` (:class:`~pyresample.geometry.AreaDefinition` or
+        area name), ``ll_bbox`` or ``xy_bbox`` keyword arguments, as used by
+        :meth:`satpy.scene.Scene.crop`, can be provided to load only the part
+        of the datasets covering it. Datasets whose area isn't an
+        `AreaDefinition` are loaded entirely.
+
         """
+        crop = {key: kwargs.pop(key) for key in CROP_KEYWORDS if kwargs.get(key) is not None}
+        for key in CROP_KEYWORDS:
+            kwargs.pop(key, None)
+        if len(crop) > 1:
+            raise ValueError("Only one of 'area', 'll_bbox' or 'xy_bbox' can be specified.")
         all_datasets = previous_datasets or DatasetDict()
         datasets = DatasetDict()
 
@@ -864,21 +988,75 @@ class FileYAMLReader(AbstractYAMLReader):
         dsids = [self.get_dataset_key(ds_key) for ds_key in dataset_keys]
         coordinates = self._get_coordinates_for_dataset_keys(dsids)
         all_dsids = list(set().union(*coordinates.values())) + dsids
+        crop_windows = None
+        if crop:
+            crop_windows = self._get_crop_windows(
+                [dsid for dsid in all_dsids if dsid not in all_datasets], crop, **kwargs)
         for dsid in all_dsids:
             if dsid in all_datasets:
                 continue
             coords = [all_datasets.get(cid, None)
                       for cid in coordinates.get(dsid, [])]
-            ds = self._load_dataset_with_area(dsid, coords, **kwargs)
+            ds = self._load_dataset_with_area(dsid, coords, crop_windows=crop_windows, **kwargs)
             if ds is not None:
+                # the coordinates keep their precision for the geolocation
+                if dsid in dsids and ds.attrs.get('standard_name') not in ('latitude', 'longitude'):
+                    ds = apply_precision(ds)
                 all_datasets[dsid] = ds
                 if dsid in dsids:
                     datasets[dsid] = ds
-        self._load_ancillary_variables(all_datasets)
+        self._load_ancillary_variables(all_datasets, **crop)
 
         return datasets
 
 
+def _get_crop_window(area, crop):
+    """Get the rows and columns of *area* covering the *crop* area or bounding box.
+
+    Returns `None` if the window can't be determined.
+
+    """
+    try:
+        y_slice, x_slice = get_crop_slices(area, **crop)
+    except (NotImplementedError, ValueError, AttributeError) as err:
+        logger.debug("Can't crop %s while loading it: %s", area.area_id, str(err))
+        return None
+    return slice(*y_slice.indices(area.shape[0])[:2]), slice(*x_slice.indices(area.shape[1])[:2])
+
+
+def _get_crop_windows(areas, crop):
+    """Get the windows of *areas* covering the *crop* area or bounding box.
+
+    As in :meth:`satpy.scene.Scene.crop`, the window is computed on the
+    coarsest area and scaled to the areas with the same extent and an integer
+    multiple of its resolution, so the datasets of different resolutions are
+    cropped to the same extent. Windows that are empty or cover all their
+    area are `None`.
+
+    """
+    windows = {}
+    if not areas:
+        return windows
+    min_area = min(areas, key=lambda area: area.shape[0] * area.shape[1])
+    min_window = _get_crop_window(min_area, crop)
+    for area in areas:
+        y_factor, y_remainder = divmod(area.shape[0], min_area.shape[0])
+        x_factor, x_remainder = divmod(area.shape[1], min_area.shape[1])
+        if (min_window is not None and y_remainder == 0 and x_remainder == 0 and
+                area.proj_str == min_area.proj_str and np.allclose(area.area_extent, min_area.area_extent)):
+            y_slice, x_slice = min_window
+            window = (slice(y_slice.start * y_factor, y_slice.stop * y_factor),
+                      slice(x_slice.start * x_factor, x_slice.stop * x_factor))
+        else:
+            window = _get_crop_window(area, crop)
+        if window is None or window[0].stop <= window[0].start or window[1].stop <= window[1].start:
+            window = None
+        elif window == (slice(0, area.shape[0]), slice(0, area.shape[1])):
+            window = None
+        windows[area] = window
+    return windows
+
+
 def _load_area_def(dsid, file_handlers):
     """Load the area definition of *dsid*."""
     area_defs = [fh.get_area_def(dsid) for fh in file_handlers]
@@ -889,6 +1067,104 @@ def _load_area_def(dsid, file_handlers):
     return final_area.squeeze()
 
 
+class LazyFileHandler(object):
+    """File handler of a segment, created only when it is needed.
+
+    The file metadata known from the filename (``filename_info``,
+    ``filetype_info``, start and end times) is available without opening the
+    file. The sensor names and the available datasets are those of
+    *reference*, an opened file handler of another segment of the same file
+    type.
+
+    The area definition of the segment is taken from `segment_area_cache`
+    when the segment had the same area as the opened *reference* segment in
+    a previous scene, e.g. the previous time slot. Any other attribute
+    creates the actual file handler first.
+
+    """
+
+    def __init__(self, reference, filetype_cls, filename, filename_info, filetype_info, req_fh, fh_kwargs):
+        """Store what's needed to create the file handler later on."""
+        self.reference = reference
+        self.filename = filename
+        self.filename_info = filename_info
+        self.filetype_info = filetype_info
+        self.metadata = filename_info.copy()
+        self._fh_args = (filetype_cls, filename, filename_info, filetype_info, req_fh, fh_kwargs)
+        self._file_handler = None
+
+    def __str__(self):
+        """Customize __str__."""
+        return "<{}: '{}'>".format(self.__class__.__name__, self.filename)
+
+    def __repr__(self):
+        """Customize __repr__."""
+        return str(self)
+
+    @property
+    def is_open(self):
+        """Check if the file handler has been created."""
+        return self._file_handler is not None
+
+    @property
+    def file_handler(self):
+        """Get the actual file handler, creating it if needed."""
+        if self._file_handler is None:
+            self._file_handler, duration = _create_filehandler(*self._fh_args)
+            logger.debug("Opened segment %s in %.3f s", self.filename, duration)
+        return self._file_handler
+
+    def __getattr__(self, name):
+        """Get the attributes of the actual file handler."""
+        if name.startswith('__') or name in ('_file_handler', '_fh_args', 'reference'):
+            raise AttributeError(name)
+        return getattr(self.file_handler, name)
+
+    @property
+    def start_time(self):
+        """Get start time."""
+        if self.is_open:
+            return self._file_handler.start_time
+        return self.filename_info['start_time']
+
+    @property
+    def end_time(self):
+        """Get end time."""
+        if self.is_open:
+            return self._file_handler.end_time
+        return self.filename_info.get('end_time', self.start_time)
+
+    @property
+    def sensor_names(self):
+        """List of sensors represented in this file."""
+        if self.is_open:
+            return self._file_handler.sensor_names
+        return self.reference.sensor_names
+
+    def available_datasets(self, configured_datasets=None):
+        """Get information of available datasets in this file."""
+        if self.is_open:
+            return self._file_handler.available_datasets(configured_datasets=configured_datasets)
+        return self.reference.available_datasets(configured_datasets=configured_datasets)
+
+    def _area_cache_key(self, dsid):
+        try:
+            reference_area = self.reference.get_area_def(dsid)
+        except NotImplementedError:
+            return None
+        return (self.filetype_info['file_type'], int(self.filename_info.get('segment', 1)), dsid, reference_area)
+
+    def get_area_def(self, dsid):
+        """Get the area definition of the segment, from the cache if possible."""
+        key = self._area_cache_key(dsid)
+        area = segment_area_cache.get(key) if key is not None else None
+        if area is None:
+            area = self.file_handler.get_area_def(dsid)
+            if key is not None:
+                segment_area_cache[key] = area
+        return area
+
+
 class GEOSegmentYAMLReader(FileYAMLReader):
     """Reader for segmented geostationary data.
 
@@ -906,13 +1182,57 @@ class GEOSegmentYAMLReader(FileYAMLReader):
     field which will be used if ``expected_segments`` is not defined. This
     will default to 1 segment.
 
+    With the ``lazy_segments=True`` reader keyword argument, only the first
+    and last segments of each file type are opened when the scene is
+    created, the other segments are opened when their data is loaded (see
+    :class:`LazyFileHandler`). Together with loading only a part of the
+    data, e.g. ``scn.load(['IR_108'], ll_bbox=(5, 45, 11, 48))``, only the
+    segments covering the region are opened. The area definitions of the
+    segments are cached so that they don't need to be opened for it in the
+    following time slots::
+
+        scn = Scene(filenames, reader='seviri_l1b_hrit',
+                    reader_kwargs={'lazy_segments': True})
+
     """
 
+    def __init__(self, *args, lazy_segments=False, **kwargs):
+        """Set up the reader, with segments opened lazily if *lazy_segments*."""
+        super(GEOSegmentYAMLReader, self).__init__(*args, **kwargs)
+        self.lazy_segments = lazy_segments
+
+    def _new_filehandler_instances(self, filetype_info, filename_items, fh_kwargs=None):
+        """Generate new filehandler instances, the middle segments lazily if requested."""
+        parent = super(GEOSegmentYAMLReader, self)
+        filename_items = list(filename_items)
+        if (not self.lazy_segments or len(filename_items) < 3 or
+                not all('segment' in filename_info for _, filename_info in filename_items)):
+            yield from parent._new_filehandler_instances(filetype_info, filename_items, fh_kwargs=fh_kwargs)
+            return
+
+        filename_items.sort(key=lambda item: int(item[1]['segment']))
+        ends = list(parent._new_filehandler_instances(
+            filetype_info, [filename_items[0], filename_items[-1]], fh_kwargs=fh_kwargs))
+        if len(ends) < 2:
+            yield from ends
+            yield from parent._new_filehandler_instances(filetype_info, filename_items[1:-1], fh_kwargs=fh_kwargs)
+            return
+        yield ends[0]
+        for fh_args in self._filehandler_args(filetype_info, filename_items[1:-1], fh_kwargs=fh_kwargs):
+            yield LazyFileHandler(ends[0], *fh_args)
+        yield ends[1]
+
     def create_filehandlers(self, filenames, fh_kwargs=None):
         """Create file handler objects and determine expected segments for each."""
         created_fhs = super(GEOSegmentYAMLReader, self).create_filehandlers(
             filenames, fh_kwargs=fh_kwargs)
 
+        for filetype, fhs in created_fhs.items():
+            if any(isinstance(fh, LazyFileHandler) for fh in fhs):
+                # the times of the unopened segments come from the filenames
+                self.file_handlers[filetype].sort(
+                    key=lambda fh: (int(fh.filename_info.get('segment', 1)), fh.filename))
+
         # add "expected_segments" information
         for fhs in created_fhs.values():
             for fh in fhs:
@@ -923,14 +1243,20 @@ class GEOSegmentYAMLReader(FileYAMLReader):
         return created_fhs
 
     @staticmethod
-    def _load_dataset(dsid, ds_info, file_handlers, dim='y', pad_data=True):
-        """Load only a piece of the dataset."""
+    def _load_dataset(dsid, ds_info, file_handlers, dim='y', pad_data=True, window=None):
+        """Load only a piece of the dataset.
+
+        The segments outside the rows of *window* aren't read, they are
+        padded like missing segments.
+
+        """
         if not pad_data:
             return FileYAMLReader._load_dataset(dsid, ds_info,
                                                 file_handlers)
 
+        segments = _get_segments_in_window(file_handlers, dsid, window) if window is not None else None
         counter, expected_segments, slice_list, failure, projectable = \
-            _find_missing_segments(file_handlers, ds_info, dsid)
+            _find_missing_segments(file_handlers, ds_info, dsid, segments=segments)
 
         if projectable is None or failure:
             raise KeyError(
@@ -1042,8 +1368,42 @@ def _pad_earlier_segments_area(file_handlers, dsid, area_defs):
     return area_defs
 
 
-def _find_missing_segments(file_handlers, ds_info, dsid):
-    """Find missing segments."""
+def _get_segments_in_window(file_handlers, dsid, window):
+    """Get the numbers of the segments covering the rows of *window* in the padded data.
+
+    Returns `None` if all the segments should be loaded.
+
+    """
+    handlers = sorted(file_handlers, key=lambda x: int(x.filename_info.get('segment', 1)))
+    heights = {}
+    try:
+        for fh in handlers:
+            heights[int(fh.filename_info.get('segment', 1))] = fh.get_area_def(dsid).shape[0]
+    except (NotImplementedError, AttributeError):
+        return None
+    expected_segments = max(handlers[0].filetype_info.get('expected_segments', 1), max(heights))
+    y_slice = window[0]
+    # missing segments are padded with the size of the previous available one
+    height = heights[min(heights)]
+    segments = set()
+    start = 0
+    for segment in range(1, expected_segments + 1):
+        height = heights.get(segment, height)
+        if start < y_slice.stop and start + height > y_slice.start:
+            segments.add(segment)
+        start += height
+    if not segments & set(heights):
+        return None
+    logger.debug("Loading segments %s of %s", sorted(segments & set(heights)), str(dsid))
+    return segments
+
+
+def _find_missing_segments(file_handlers, ds_info, dsid, segments=None):
+    """Find missing segments.
+
+    Segments not in *segments*, if provided, are considered missing.
+
+    """
     slice_list = []
     failure = True
     counter = 1
@@ -1059,6 +1419,10 @@ def _find_missing_segments(file_handlers, ds_info, dsid):
         while int(fh.filename_info.get('segment', 1)) > counter:
             slice_list.append(None)
             counter += 1
+        if segments is not None and int(fh.filename_info.get('segment', 1)) not in segments:
+            slice_list.append(None)
+            counter += 1
+            continue
         try:
             projectable = fh.get_dataset(dsid, ds_info)
             if projectable is not None:
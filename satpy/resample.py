@@ -58,6 +58,12 @@ argument and defaults to ``nearest``:
     can be broken in to "scan lines". See the API documentation for a specific
     algorithm for more information.
 
+When a :class:`~satpy.scene.Scene` is resampled, all datasets sharing a
+source area are passed to the resampler together (see
+:func:`resample_datasets`). The ``nearest`` resampler uses this to gather all
+datasets with the same shape, fill value and invalid pixel mask in a single
+pass over the neighbour index arrays instead of one pass per dataset.
+
 Resampling for comparison and composites
 ----------------------------------------
 
@@ -98,6 +104,27 @@ target pixels don't change over time.
 See the documentation for specific algorithms to see availability and
 limitations of caching for that algorithm.
 
+The ``nearest`` resampler additionally keeps its neighbour information in a
+process-wide in-memory cache that is shared between all resampler instances
+(and therefore all ``Scene.resample`` calls). Entries are identified by a
+fingerprint of the source and target geometries, the resampling parameters
+and the data mask (its dask token, or its contents when `cache_dir` is
+provided), and the least recently used entries are dropped when the cache
+grows larger than ``SATPY_NN_CACHE_BYTES`` bytes (default 1 GiB, set it to 0
+to disable the in-memory cache). The ``ewa`` resampler keeps the ``ll2cr``
+results of every swath/grid pair in a similar cache of the same size, so that
+only ``fornav`` has to be run per dataset.
+
+By default the on-disk caches are stored as compressed zarr files which have
+to be decompressed into memory by every process using them. For large grids
+the ``cache_format='npy'`` keyword argument can be used to store the cache as
+uncompressed ``.npy`` files instead. These are memory mapped when they are
+loaded, so only the parts of the look-up tables that are actually used are
+read and the pages are shared between processes through the OS page cache.
+Existing caches in either format are found automatically.
+
+    >>> new_scn = scn.resample('euro4', cache_dir='/path/to/cache_dir', cache_format='npy')
+
 Create custom area definition
 -----------------------------
 
@@ -132,6 +159,7 @@ Examples coming soon...
 import hashlib
 import json
 import os
+from collections import OrderedDict
 from logging import getLogger
 from weakref import WeakValueDictionary
 import warnings
@@ -140,6 +168,7 @@ import xarray as xr
 import dask
 import dask.array as da
 import zarr
+from dask.base import tokenize
 
 from pyresample.ewa import fornav, ll2cr
 from pyresample.geometry import SwathDefinition
@@ -153,6 +182,7 @@ except ImportError:
 
 from satpy import CHUNK_SIZE
 from satpy.config import config_search_paths, get_config_path
+from satpy.utils import SizedLRUCache, save_npy_cache, load_npy_cache, apply_precision
 
 
 LOG = getLogger(__name__)
@@ -169,7 +199,12 @@ BIL_COORDINATES = {'bilinear_s': ('x1', ),
                    'out_coords_x': ('x2', ),
                    'out_coords_y': ('y2', )}
 
+BATCH_DIM = 'resample_batch'
+
 resamplers_cache = WeakValueDictionary()
+NN_CACHE_BYTES = int(os.getenv('SATPY_NN_CACHE_BYTES', 1024 ** 3))
+nn_cache = SizedLRUCache(NN_CACHE_BYTES)
+ll2cr_cache = SizedLRUCache(NN_CACHE_BYTES)
 
 
 def hash_dict(the_dict, the_hash=None):
@@ -180,6 +215,55 @@ def hash_dict(the_dict, the_hash=None):
     return the_hash
 
 
+COMPUTED_MASK_PREFIX = 'computed-mask-'
+
+
+def get_mask_fingerprint(mask, compute=True):
+    """Get a hash of the contents of a boolean *mask*.
+
+    Returns None if no mask is provided. Dask-based masks are computed by
+    this function, unless *compute* is False: they are then identified by
+    their dask token instead of their contents, except for the masks already
+    computed by :func:`compute_mask`, which carry their fingerprint.
+
+    """
+    if mask is None:
+        return None
+    dask_mask = getattr(mask, 'data', mask)
+    if isinstance(dask_mask, da.Array) and dask_mask.name.startswith(COMPUTED_MASK_PREFIX):
+        return dask_mask.name[len(COMPUTED_MASK_PREFIX):].split('-')[0]
+    if not compute and isinstance(dask_mask, da.Array):
+        return 'dask-' + tokenize(dask_mask)
+    mask = np.asarray(mask).astype(bool)
+    the_hash = hashlib.sha1(np.packbits(mask).tobytes())
+    the_hash.update(str(mask.shape).encode('utf-8'))
+    return the_hash.hexdigest()
+
+
+def compute_mask(mask):
+    """Compute the dask *mask* once so it can be fingerprinted, saved and reused.
+
+    The computed mask is still a dask array, named after the fingerprint of
+    its contents.
+
+    """
+    dask_mask = getattr(mask, 'data', mask)
+    if not isinstance(dask_mask, da.Array) or dask_mask.name.startswith(COMPUTED_MASK_PREFIX):
+        return mask
+    values = dask_mask.compute()
+    name = '{}{}-{}'.format(COMPUTED_MASK_PREFIX, get_mask_fingerprint(values), tokenize(dask_mask.chunks))
+    computed = da.from_array(values, chunks=dask_mask.chunks, name=name)
+    if isinstance(mask, xr.DataArray):
+        return mask.copy(data=computed)
+    return computed
+
+
+def is_lazy_mask(mask):
+    """Check if *mask* is a dask array which hasn't been computed by :func:`compute_mask`."""
+    dask_mask = getattr(mask, 'data', mask)
+    return isinstance(dask_mask, da.Array) and not dask_mask.name.startswith(COMPUTED_MASK_PREFIX)
+
+
 def get_area_file():
     """Find area file(s) to use.
 
@@ -205,6 +289,38 @@ def get_area_def(area_name):
     return parse_area_file(get_area_file(), area_name)[0]
 
 
+def get_crop_slices(src_area, area=None, ll_bbox=None, xy_bbox=None):
+    """Get the slices of *src_area* covering an area or a bounding box.
+
+    Args:
+        src_area (AreaDefinition): Area to slice.
+        area (AreaDefinition or str): Area to cover, or its name.
+        ll_bbox (tuple, list): ``(xmin, ymin, xmax, ymax)`` bounding box to
+                               cover, in lon/lat degrees.
+        xy_bbox (tuple, list): Same as `ll_bbox` but in the projection units
+                               of `src_area`.
+
+    Returns:
+        The row and column slices.
+
+    """
+    from pyresample.geometry import AreaDefinition
+    if ll_bbox is not None:
+        area = AreaDefinition(
+            'crop_area', 'crop_area', 'crop_latlong',
+            {'proj': 'latlong'}, 100, 100, ll_bbox)
+    elif xy_bbox is not None:
+        crs = src_area.crs if hasattr(src_area, 'crs') else src_area.proj_dict
+        area = AreaDefinition(
+            'crop_area', 'crop_area', 'crop_xy',
+            crs, src_area.x_size, src_area.y_size,
+            xy_bbox)
+    elif isinstance(area, str):
+        area = get_area_def(area)
+    x_slice, y_slice = src_area.get_area_slices(area)
+    return y_slice, x_slice
+
+
 def add_xy_coords(data_arr, area, crs=None):
     """Assign x/y coordinates to DataArray from provided area.
 
@@ -402,26 +518,49 @@ class BaseResampler(object):
         Returns (xarray.DataArray): Data resampled to the target area
 
         """
-        # default is to mask areas for SwathDefinitions
-        if mask_area is None and isinstance(
-                self.source_geo_def, SwathDefinition):
-            mask_area = True
-
-        if mask_area:
-            if isinstance(self.source_geo_def, SwathDefinition):
-                geo_dims = self.source_geo_def.lons.dims
-            else:
-                geo_dims = ('y', 'x')
-            flat_dims = [dim for dim in data.dims if dim not in geo_dims]
-            if np.issubdtype(data.dtype, np.integer):
-                kwargs['mask'] = data == data.attrs.get('_FillValue', np.iinfo(data.dtype.type).max)
-            else:
-                kwargs['mask'] = data.isnull()
-            kwargs['mask'] = kwargs['mask'].all(dim=flat_dims)
+        if self._use_mask(mask_area):
+            kwargs['mask'] = self._get_invalid_mask(data)
 
         cache_id = self.precompute(cache_dir=cache_dir, **kwargs)
         return self.compute(data, cache_id=cache_id, **kwargs)
 
+    def resample_batch(self, data_arrs, fill_values, **kwargs):
+        """Resample several DataArrays defined on the source area.
+
+        The default implementation resamples the arrays one at a time.
+        Resamplers that can process several arrays in one pass override this
+        method.
+
+        Args:
+            data_arrs (list): DataArrays to be resampled
+            fill_values (list): Fill value to use for every DataArray
+            kwargs: Passed to :meth:`resample`
+
+        Returns (list): DataArrays resampled to the target area
+
+        """
+        return [self.resample(data, fill_value=fill_value, **kwargs)
+                for data, fill_value in zip(data_arrs, fill_values)]
+
+    def _use_mask(self, mask_area):
+        """Check if invalid pixels should be masked, by default for SwathDefinitions."""
+        if mask_area is None:
+            return isinstance(self.source_geo_def, SwathDefinition)
+        return mask_area
+
+    def _get_invalid_mask(self, data):
+        """Get the mask of the geolocation pixels where all of `data` is invalid."""
+        if isinstance(self.source_geo_def, SwathDefinition):
+            geo_dims = self.source_geo_def.lons.dims
+        else:
+            geo_dims = ('y', 'x')
+        flat_dims = [dim for dim in data.dims if dim not in geo_dims]
+        if np.issubdtype(data.dtype, np.integer):
+            mask = data == data.attrs.get('_FillValue', np.iinfo(data.dtype.type).max)
+        else:
+            mask = data.isnull()
+        return mask.all(dim=flat_dims)
+
     def _create_cache_filename(self, cache_dir=None, prefix='',
                                fmt='.zarr', **kwargs):
         """Create filename for the cached resampling parameters."""
@@ -437,9 +576,19 @@ class KDTreeResampler(BaseResampler):
     This resampler implements on-disk caching when the `cache_dir` argument
     is provided to the `resample` method. This should provide significant
     performance improvements on consecutive resampling of geostationary data.
-    It is not recommended to provide `cache_dir` when the `mask` keyword
-    argument is provided to `precompute` which occurs by default for
-    `SwathDefinition` source areas.
+    Independently of `cache_dir`, the neighbour information is kept in the
+    process-wide in-memory cache ``satpy.resample.nn_cache`` so that other
+    resampler instances with the same geometries can reuse it.
+
+    The cache entries are identified by the geometries, the resampling
+    parameters and the contents of the `mask`. Lazy dask masks aren't
+    computed without `cache_dir`: the neighbour information then stays lazy
+    too, and is only kept by the resampler instance, identified by the dask
+    token of the mask, so the source data isn't computed before the
+    resampled data is. With `cache_dir`, the mask is computed before the
+    neighbour search to identify the cache by its contents, and it is stored
+    with the cached indices on disk and compared when loading them, so masked
+    resampling of `SwathDefinition` data can be cached too.
 
     Args:
         cache_dir (str): Long term storage directory for intermediate
@@ -448,6 +597,8 @@ class KDTreeResampler(BaseResampler):
                      when searching for nearest neighbor pixels. By
                      default this is True for SwathDefinition source
                      areas and False for all other area definition types.
+        cache_format (str): Format of the on-disk cache, either 'zarr'
+                            (default) or 'npy' for memory mappable files.
         radius_of_influence (float): Search radius cut off distance in meters
         epsilon (float): Allowed uncertainty in meters. Increasing uncertainty
                          reduces execution time.
@@ -461,7 +612,7 @@ class KDTreeResampler(BaseResampler):
         self._index_caches = {}
 
     def precompute(self, mask=None, radius_of_influence=None, epsilon=0,
-                   cache_dir=None, **kwargs):
+                   cache_dir=None, cache_format='zarr', **kwargs):
         """Create a KDTree structure and store it for later use.
 
         Note: The `mask` keyword should be provided if geolocation may be valid
@@ -470,11 +621,9 @@ class KDTreeResampler(BaseResampler):
         """
         from pyresample.kd_tree import XArrayResamplerNN
         del kwargs
-        if mask is not None and cache_dir is not None:
-            LOG.warning("Mask and cache_dir both provided to nearest "
-                        "resampler. Cached parameters are affected by "
-                        "masked pixels. Will not cache results.")
-            cache_dir = None
+        if cache_dir:
+            # the on-disk caches are identified by the contents of the mask
+            mask = compute_mask(mask)
 
         if radius_of_influence is None and not hasattr(self.source_geo_def, 'geocentric_resolution'):
             warnings.warn("Upgrade 'pyresample' for a more accurate default 'radius_of_influence'.")
@@ -506,7 +655,7 @@ class KDTreeResampler(BaseResampler):
         except IOError:
             LOG.debug("Computing kd-tree parameters")
             self.resampler.get_neighbour_info(mask=mask)
-            self.save_neighbour_info(cache_dir, mask=mask, **kwargs)
+            self.save_neighbour_info(cache_dir, mask=mask, cache_format=cache_format, **kwargs)
 
     def _apply_cached_index(self, val, idx_name, persist=False):
         """Reassign resampler index attributes."""
@@ -544,53 +693,119 @@ class KDTreeResampler(BaseResampler):
 
     def load_neighbour_info(self, cache_dir, mask=None, **kwargs):
         """Read index arrays from either the in-memory or disk cache."""
-        mask_name = getattr(mask, 'name', None)
-        cached = {}
-        self._check_numpy_cache(cache_dir, mask=mask_name, **kwargs)
+        mask_hash = get_mask_fingerprint(mask, compute=False)
+        key = self.get_hash(mask=mask_hash, **kwargs)
+        if key in self._index_caches:
+            cached = self._index_caches[key]
+        elif key in nn_cache and not is_lazy_mask(mask):
+            LOG.debug("Using neighbour info from the in-memory cache")
+            cached = nn_cache[key]
+        elif cache_dir:
+            self._check_numpy_cache(cache_dir, mask=mask_hash, **kwargs)
+            filename = self._create_cache_filename(cache_dir, prefix='nn_lut-',
+                                                   mask=mask_hash, fmt='.npy', **kwargs)
+            if os.path.isdir(filename):
+                cached = self._read_npy_cache(filename, mask)
+            else:
+                filename = self._create_cache_filename(cache_dir, prefix='nn_lut-',
+                                                       mask=mask_hash, **kwargs)
+                cached = self._read_zarr_cache(filename, mask)
+        else:
+            raise IOError
 
-        filename = self._create_cache_filename(cache_dir, prefix='nn_lut-',
-                                               mask=mask_name, **kwargs)
         for idx_name in NN_COORDINATES.keys():
-            if mask_name in self._index_caches:
-                cached[idx_name] = self._apply_cached_index(
-                    self._index_caches[mask_name][idx_name], idx_name)
-            elif cache_dir:
-                try:
-                    fid = zarr.open(filename, 'r')
-                    cache = np.array(fid[idx_name])
-                    if idx_name == 'valid_input_index':
-                        # valid input index array needs to be boolean
-                        cache = cache.astype(np.bool)
-                except ValueError:
-                    raise IOError
-                cache = self._apply_cached_index(cache, idx_name)
+            cached[idx_name] = self._apply_cached_index(cached[idx_name], idx_name)
+        self._index_caches[key] = cached
+        if not is_lazy_mask(mask):
+            nn_cache[key] = cached
+
+    @staticmethod
+    def _read_zarr_cache(filename, mask=None):
+        """Read the index arrays from a zarr cache file.
+
+        If the cache was written with a mask, it has to match *mask*.
+
+        """
+        cached = {}
+        try:
+            fid = zarr.open(filename, 'r')
+            for idx_name in NN_COORDINATES.keys():
+                cache = np.array(fid[idx_name])
+                if idx_name == 'valid_input_index':
+                    # valid input index array needs to be boolean
+                    cache = cache.astype(np.bool)
                 cached[idx_name] = cache
-            else:
-                raise IOError
-        self._index_caches[mask_name] = cached
+            cached_mask = fid['mask'] if mask is not None and 'mask' in fid else None
+        except ValueError:
+            raise IOError
+        if cached_mask is not None and not np.array_equal(np.array(cached_mask), np.asarray(mask)):
+            LOG.debug("Cached mask in %s does not match, ignoring cache", filename)
+            raise IOError
+        return cached
 
-    def save_neighbour_info(self, cache_dir, mask=None, **kwargs):
-        """Cache resampler's index arrays if there is a cache dir."""
-        if cache_dir:
-            mask_name = getattr(mask, 'name', None)
-            cache = self._read_resampler_attrs()
+    @staticmethod
+    def _read_npy_cache(filename, mask=None):
+        """Memory map the index arrays from a directory of ``.npy`` files.
+
+        If the cache was written with a mask, it has to match *mask*.
+
+        """
+        names = list(NN_COORDINATES.keys())
+        if mask is not None and os.path.exists(os.path.join(filename, 'mask.npy')):
+            names.append('mask')
+        cached = load_npy_cache(filename, names)
+        cached_mask = cached.pop('mask', None)
+        if cached_mask is not None and not np.array_equal(cached_mask, np.asarray(mask)):
+            LOG.debug("Cached mask in %s does not match, ignoring cache", filename)
+            raise IOError
+        return cached
+
+    def save_neighbour_info(self, cache_dir, mask=None, cache_format='zarr', **kwargs):
+        """Cache resampler's index arrays in memory and on disk if there is a cache dir.
+
+        The index arrays computed with a lazy mask stay lazy and are only kept
+        by this resampler, the others are computed and shared with the other
+        resamplers in ``nn_cache``.
+
+        """
+        mask_hash = get_mask_fingerprint(mask, compute=False)
+        key = self.get_hash(mask=mask_hash, **kwargs)
+        cache = self._read_resampler_attrs()
+        if is_lazy_mask(mask):
+            # persisting would compute the mask, and so the source data
+            self._index_caches[key] = cache
+            return
+        for idx_name in NN_COORDINATES.keys():
+            # update the cache in place with persisted dask arrays
+            cache[idx_name] = self._apply_cached_index(cache[idx_name],
+                                                       idx_name,
+                                                       persist=True)
+        if cache_dir and cache_format == 'npy':
+            filename = self._create_cache_filename(
+                cache_dir, prefix='nn_lut-', mask=mask_hash, fmt='.npy', **kwargs)
+            LOG.info('Saving kd_tree neighbour info to %s', filename)
+            arrays = cache.copy()
+            if mask is not None:
+                arrays['mask'] = np.asarray(mask).astype(bool)
+            save_npy_cache(filename, arrays)
+        elif cache_dir:
             filename = self._create_cache_filename(
-                cache_dir, prefix='nn_lut-', mask=mask_name, **kwargs)
+                cache_dir, prefix='nn_lut-', mask=mask_hash, **kwargs)
             LOG.info('Saving kd_tree neighbour info to %s', filename)
             zarr_out = xr.Dataset()
             for idx_name, coord in NN_COORDINATES.items():
-                # update the cache in place with persisted dask arrays
-                cache[idx_name] = self._apply_cached_index(cache[idx_name],
-                                                           idx_name,
-                                                           persist=True)
                 zarr_out[idx_name] = (coord, cache[idx_name])
+            if mask is not None:
+                zarr_out['mask'] = (NN_COORDINATES['valid_input_index'],
+                                    np.asarray(mask).astype(np.uint8))
 
             # Write indices to Zarr file
             zarr_out.to_zarr(filename)
 
-            self._index_caches[mask_name] = cache
-            # Delete the kdtree, it's not needed anymore
-            self.resampler.delayed_kdtree = None
+        self._index_caches[key] = cache
+        nn_cache[key] = cache
+        # Delete the kdtree, it's not needed anymore
+        self.resampler.delayed_kdtree = None
 
     def _read_resampler_attrs(self):
         """Read certain attributes from the resampler for caching."""
@@ -605,12 +820,66 @@ class KDTreeResampler(BaseResampler):
         res = self.resampler.get_sample_from_neighbour_info(data, fill_value)
         return update_resampled_coords(data, res, self.target_geo_def)
 
+    def resample_batch(self, data_arrs, fill_values, cache_dir=None, mask_area=None, **kwargs):
+        """Resample several DataArrays gathering them in one pass.
+
+        DataArrays with the same dimensions, shape, dtype, fill value and
+        invalid pixel mask (if masking is used) share the same neighbour
+        information. They are stacked along a new dimension so the neighbour
+        index arrays are only read once per output chunk for all of them.
+        The masks are compared by their dask token, so they are not computed.
+
+        .. note::
+
+            With the default masking of `SwathDefinition` data, the invalid
+            pixel mask of each band is derived from its own data and has its
+            own dask token, so bands of different files are not gathered even
+            if their invalid pixels are the same in the end. Use
+            ``mask_area=False`` to resample swath bands in one pass when their
+            invalid pixels don't need to be excluded from the neighbour
+            search.
+
+        """
+        use_mask = self._use_mask(mask_area)
+        kwargs.pop('fill_value', None)
+        groups = OrderedDict()
+        for idx, (data, fill_value) in enumerate(zip(data_arrs, fill_values)):
+            mask = self._get_invalid_mask(data) if use_mask else None
+            key = (data.dims, data.shape, data.dtype, str(fill_value), get_mask_fingerprint(mask, compute=False))
+            groups.setdefault(key, (mask, fill_value, []))[2].append(idx)
+
+        results = [None] * len(data_arrs)
+        for mask, fill_value, indices in groups.values():
+            self.precompute(mask=mask, cache_dir=cache_dir, **kwargs)
+            if len(indices) == 1:
+                data = data_arrs[indices[0]]
+                results[indices[0]] = self.compute(data, fill_value=fill_value, **kwargs)
+                continue
+            LOG.debug("Resampling %d datasets in one pass", len(indices))
+            first = data_arrs[indices[0]]
+            stacked = da.stack([da.asarray(data_arrs[idx].data) for idx in indices])
+            stacked = xr.DataArray(stacked.rechunk({0: -1}), dims=(BATCH_DIM,) + first.dims)
+            res = self.resampler.get_sample_from_neighbour_info(stacked, fill_value)
+            for pos, idx in enumerate(indices):
+                data = data_arrs[idx]
+                new_data = res.isel({BATCH_DIM: pos}).rename(data.name)
+                new_data.attrs = data.attrs.copy()
+                results[idx] = update_resampled_coords(data, new_data, self.target_geo_def)
+        return results
+
 
 class EWAResampler(BaseResampler):
     """Resample using an elliptical weighted averaging algorithm.
 
-    This algorithm does **not** use caching or any externally provided data
-    mask (unlike the 'nearest' resampler).
+    This algorithm does **not** use any externally provided data mask
+    (unlike the 'nearest' resampler). The lazy output of ``ll2cr`` is kept
+    per swath, target area and `swath_usage` in the process-wide in-memory
+    cache ``satpy.resample.ll2cr_cache``, so all the datasets with the same
+    geolocation share the same dask arrays, and ``ll2cr`` is computed once
+    for all of them when they are computed together. If `cache_dir` is
+    provided, it is computed and stored on disk as memory mappable ``.npy``
+    files named after the hash of the swath geolocation, the target area and
+    `swath_usage`, which are then used instead.
 
     This algorithm works under the assumption that the data is observed
     one scan line at a time. However, good results can still be achieved
@@ -701,11 +970,44 @@ class EWAResampler(BaseResampler):
                         "resampling")
 
         del kwargs
-        source_geo_def = self.source_geo_def
-        target_geo_def = self.target_geo_def
+        key = self.get_hash(swath_usage=swath_usage)
+        if key in ll2cr_cache:
+            LOG.debug("Using ll2cr results from the in-memory cache")
+            self.cache = ll2cr_cache[key]
+            return None
 
+        filename = None
         if cache_dir:
-            LOG.warning("'cache_dir' is not used by EWA resampling")
+            filename = self._create_cache_filename(cache_dir, prefix='ll2cr-', fmt='.npy',
+                                                   swath_usage=swath_usage)
+            try:
+                self.cache = self._read_ll2cr_cache(filename)
+                LOG.debug("Read pre-computed ll2cr results from %s", filename)
+            except IOError:
+                pass
+            else:
+                ll2cr_cache[key] = self.cache
+                return None
+
+        self.cache = self._compute_ll2cr(swath_usage)
+        if filename is not None:
+            LOG.info('Saving ll2cr results to %s', filename)
+            save_npy_cache(filename, self.cache)
+            # use the computed results instead of computing them again
+            self.cache = self._read_ll2cr_cache(filename)
+        ll2cr_cache[key] = self.cache
+        return None
+
+    @staticmethod
+    def _read_ll2cr_cache(filename):
+        """Memory map the ll2cr results saved in *filename*."""
+        return {name: da.from_array(arr, chunks=CHUNK_SIZE)
+                for name, arr in load_npy_cache(filename, ('rows', 'cols')).items()}
+
+    def _compute_ll2cr(self, swath_usage=0):
+        """Compute the column and row arrays for the source swath."""
+        source_geo_def = self.source_geo_def
+        target_geo_def = self.target_geo_def
 
         # Satpy/PyResample don't support dynamic grids out of the box yet
         lons, lats = source_geo_def.get_lonlats()
@@ -718,19 +1020,13 @@ class EWAResampler(BaseResampler):
         chunks = (2,) + lons.chunks
         res = da.map_blocks(self._call_ll2cr, lons, lats,
                             target_geo_def, swath_usage,
-                            dtype=lons.dtype, chunks=chunks, new_axis=[0])
-        cols = res[0]
-        rows = res[1]
-
-        # save the dask arrays in the class instance cache
-        # the on-disk cache will store the numpy arrays
-        self.cache = {
-            "rows": rows,
-            "cols": cols,
+                            dtype=lons.dtype, chunks=chunks, new_axis=[0],
+                            meta=np.array((), dtype=lons.dtype))
+        return {
+            "rows": res[1],
+            "cols": res[0],
         }
 
-        return None
-
     def _call_fornav(self, cols, rows, target_geo_def, data,
                      grid_coverage=0, **kwargs):
         """Wrap fornav() to run as a dask delayed."""
@@ -817,6 +1113,8 @@ class BilinearResampler(BaseResampler):
                          reduces execution time.
         reduce_data (bool): Reduce the input data to (roughly) match the
                             target area.
+        cache_format (str): Format of the on-disk cache, either 'zarr'
+                            (default) or 'npy' for memory mappable files.
 
     """
 
@@ -826,7 +1124,7 @@ class BilinearResampler(BaseResampler):
         self.resampler = None
 
     def precompute(self, mask=None, radius_of_influence=50000, epsilon=0,
-                   reduce_data=True, cache_dir=False, **kwargs):
+                   reduce_data=True, cache_dir=False, cache_format='zarr', **kwargs):
         """Create bilinear coefficients and store them for later use."""
         from pyresample.bilinear.xarr import XArrayResamplerBilinear
 
@@ -848,11 +1146,18 @@ class BilinearResampler(BaseResampler):
                 LOG.debug("Computing bilinear parameters")
                 self.resampler.get_bil_info()
                 LOG.debug("Saving bilinear parameters.")
-                self.save_bil_info(cache_dir, **kwargs)
+                self.save_bil_info(cache_dir, cache_format=cache_format, **kwargs)
 
     def load_bil_info(self, cache_dir, **kwargs):
         """Load bilinear resampling info from cache directory."""
         if cache_dir:
+            filename = self._create_cache_filename(cache_dir,
+                                                   prefix='bil_lut-',
+                                                   fmt='.npy', **kwargs)
+            if os.path.isdir(filename):
+                for val, cache in load_npy_cache(filename, BIL_COORDINATES.keys()).items():
+                    setattr(self.resampler, val, cache)
+                return
             filename = self._create_cache_filename(cache_dir,
                                                    prefix='bil_lut-',
                                                    **kwargs)
@@ -866,9 +1171,16 @@ class BilinearResampler(BaseResampler):
         else:
             raise IOError
 
-    def save_bil_info(self, cache_dir, **kwargs):
+    def save_bil_info(self, cache_dir, cache_format='zarr', **kwargs):
         """Save bilinear resampling info to cache directory."""
-        if cache_dir:
+        if cache_dir and cache_format == 'npy':
+            filename = self._create_cache_filename(cache_dir,
+                                                   prefix='bil_lut-',
+                                                   fmt='.npy', **kwargs)
+            LOG.info('Saving BIL neighbour info to %s', filename)
+            save_npy_cache(filename, {idx_name: getattr(self.resampler, idx_name)
+                                      for idx_name in BIL_COORDINATES.keys()})
+        elif cache_dir:
             filename = self._create_cache_filename(cache_dir,
                                                    prefix='bil_lut-',
                                                    **kwargs)
@@ -1291,6 +1603,16 @@ def get_fill_value(dataset):
     return np.nan
 
 
+def _update_resampled_attrs(dataset, new_data, destination_area):
+    """Copy the attributes of *dataset* to the resampled *new_data*."""
+    new_data = apply_precision(new_data)
+    new_attrs = new_data.attrs
+    new_data.attrs = dataset.attrs.copy()
+    new_data.attrs.update(new_attrs)
+    new_data.attrs.update(area=destination_area)
+    return new_data
+
+
 def resample_dataset(dataset, destination_area, **kwargs):
     """Resample *dataset* and return the resampled version.
 
@@ -1303,7 +1625,8 @@ def resample_dataset(dataset, destination_area, **kwargs):
 
     Returns:
         A resampled DataArray with updated ``.attrs["area"]`` field. The dtype
-        of the array is preserved.
+        of the array is preserved, except for the floating point arrays
+        cast down to the precision of :func:`satpy.utils.get_precision`.
 
     """
     # call the projection stuff here
@@ -1317,9 +1640,45 @@ def resample_dataset(dataset, destination_area, **kwargs):
 
     fill_value = kwargs.pop('fill_value', get_fill_value(dataset))
     new_data = resample(source_area, dataset, destination_area, fill_value=fill_value, **kwargs)
-    new_attrs = new_data.attrs
-    new_data.attrs = dataset.attrs.copy()
-    new_data.attrs.update(new_attrs)
-    new_data.attrs.update(area=destination_area)
+    return _update_resampled_attrs(dataset, new_data, destination_area)
 
-    return new_data
+
+def resample_datasets(datasets, destination_area, **kwargs):
+    """Resample several *datasets* sharing the same source area.
+
+    This works like :func:`resample_dataset`, but gives the resampler the
+    chance to process all the datasets together (see
+    :meth:`BaseResampler.resample_batch`). For example the ``nearest``
+    resampler gathers all datasets with the same shape and mask in a single
+    pass over the neighbour index arrays.
+
+    Args:
+        datasets (list): DataArrays to be resampled. They must all have the
+            same ``.attrs["area"]``.
+        destination_area: The destination onto which to project the data,
+          either a full blown area definition or a string corresponding to
+          the name of the area as defined in the area file.
+        **kwargs: The extra parameters to pass to the resampler objects.
+
+    Returns:
+        A list of resampled DataArrays in the same order as `datasets`.
+
+    """
+    if not datasets:
+        return []
+    source_area = datasets[0].attrs["area"]
+    if 'fill_value' in kwargs:
+        fill_values = [kwargs.pop('fill_value')] * len(datasets)
+    else:
+        fill_values = [get_fill_value(dataset) for dataset in datasets]
+
+    resampler = kwargs.pop('resampler', None)
+    if not isinstance(resampler, (BaseResampler, PRBaseResampler)):
+        _, resampler = prepare_resampler(source_area, destination_area, resampler)
+    if isinstance(resampler, BaseResampler):
+        new_datasets = resampler.resample_batch(datasets, fill_values, **kwargs)
+    else:
+        new_datasets = [resampler.resample(dataset, fill_value=fill_value, **kwargs)
+                        for dataset, fill_value in zip(datasets, fill_values)]
+    return [_update_resampled_attrs(dataset, new_data, destination_area)
+            for dataset, new_data in zip(datasets, new_datasets)]
@@ -25,9 +25,11 @@ from satpy.config import get_environ_config_dir
 from satpy.dataset import (DatasetID, MetadataObject, dataset_walker,
                            replace_anc, combine_metadata)
 from satpy.node import DependencyTree
+from satpy.plan import ExecutionPlan
 from satpy.readers import DatasetDict, load_readers
-from satpy.resample import (resample_dataset,
-                            prepare_resampler, get_area_def)
+from satpy.resample import (resample_datasets,
+                            prepare_resampler, get_area_def, get_crop_slices)
+from satpy.utils import apply_precision
 from satpy.writers import load_writer
 from pyresample.geometry import AreaDefinition, BaseDefinition, SwathDefinition
 
@@ -463,17 +465,7 @@ class Scene(MetadataObject):
     def _slice_area_from_bbox(self, src_area, dst_area, ll_bbox=None,
                               xy_bbox=None):
         """Slice the provided area using the bounds provided."""
-        if ll_bbox is not None:
-            dst_area = AreaDefinition(
-                'crop_area', 'crop_area', 'crop_latlong',
-                {'proj': 'latlong'}, 100, 100, ll_bbox)
-        elif xy_bbox is not None:
-            crs = src_area.crs if hasattr(src_area, 'crs') else src_area.proj_dict
-            dst_area = AreaDefinition(
-                'crop_area', 'crop_area', 'crop_xy',
-                crs, src_area.x_size, src_area.y_size,
-                xy_bbox)
-        x_slice, y_slice = src_area.get_area_slices(dst_area)
+        y_slice, x_slice = get_crop_slices(src_area, dst_area, ll_bbox=ll_bbox, xy_bbox=xy_bbox)
         return src_area[y_slice, x_slice], y_slice, x_slice
 
     def _slice_datasets(self, dataset_ids, slice_key, new_area, area_only=True):
@@ -833,9 +825,9 @@ class Scene(MetadataObject):
             return
 
         try:
-            composite = compositor(prereq_datasets,
-                                   optional_datasets=optional_datasets,
-                                   **self.attrs)
+            composite = apply_precision(compositor(prereq_datasets,
+                                                   optional_datasets=optional_datasets,
+                                                   **self.attrs))
 
             cid = DatasetID.from_dict(composite.attrs)
 
@@ -953,6 +945,12 @@ class Scene(MetadataObject):
             unload (bool): Unload datasets that were required to generate
                            the requested datasets (composite dependencies)
                            but are no longer needed.
+            kwargs: Passed to the readers. With most readers, one of
+                    ``area``, ``ll_bbox`` or ``xy_bbox`` (see :meth:`crop`)
+                    can be used to read only the part of the datasets
+                    covering it: the data outside is never read, and the
+                    files of segmented geostationary data outside of it
+                    are not loaded at all.
 
         """
         if isinstance(wishlist, str):
@@ -987,6 +985,28 @@ class Scene(MetadataObject):
         if unload:
             self.unload(keepables=keepables)
 
+    def plan(self, datasets=None):
+        """Get the execution plan of loaded datasets.
+
+        The plan merges the dask graphs of the datasets, reading included,
+        merges the tasks doing the same work in several of them, and
+        describes the dependency tree of the datasets with their estimated
+        size in memory. Printing the plan shows this description, computing
+        it computes all the datasets at once. See :mod:`satpy.plan`.
+
+        Args:
+            datasets (list): IDs of the datasets to compute. Defaults to the
+                             requested datasets that are loaded.
+
+        Returns:
+            :class:`~satpy.plan.ExecutionPlan` of the datasets.
+
+        """
+        if datasets is None:
+            datasets = [ds_id for ds_id in self.wishlist if ds_id in self.datasets]
+        return ExecutionPlan([self[ds_id] for ds_id in datasets],
+                             dep_tree=self.dep_tree, available=self.datasets)
+
     def _slice_data(self, source_area, slices, dataset):
         """Slice the data to reduce it."""
         slice_x, slice_y = slices
@@ -1018,23 +1038,15 @@ class Scene(MetadataObject):
 
         resamplers = {}
         reductions = {}
+        walked = []
+        queued = set()
+        to_resample = {}
         for dataset, parent_dataset in dataset_walker(datasets):
             ds_id = DatasetID.from_dict(dataset.attrs)
-            pres = None
-            if parent_dataset is not None:
-                pres = new_datasets[DatasetID.from_dict(parent_dataset.attrs)]
-            if ds_id in new_datasets:
-                replace_anc(new_datasets[ds_id], pres)
-                if ds_id in new_scn.datasets:
-                    new_scn.datasets[ds_id] = new_datasets[ds_id]
+            walked.append((ds_id, dataset, parent_dataset))
+            if dataset.attrs.get('area') is None or ds_id in queued:
                 continue
-            if dataset.attrs.get('area') is None:
-                if parent_dataset is None:
-                    new_scn.datasets[ds_id] = dataset
-                else:
-                    replace_anc(dataset, pres)
-                continue
-            LOG.debug("Resampling %s", ds_id)
+            queued.add(ds_id)
             source_area = dataset.attrs['area']
             try:
                 if reduce_data:
@@ -1064,9 +1076,34 @@ class Scene(MetadataObject):
                     source_area, destination_area, **resample_kwargs)
                 resamplers[source_area] = resampler
                 self.resamplers[key] = resampler
+            ids, dsets = to_resample.setdefault(source_area, ([], []))
+            ids.append(ds_id)
+            dsets.append(dataset)
+
+        # resample all the datasets sharing a source area together
+        resampled = {}
+        for source_area, (ids, dsets) in to_resample.items():
+            LOG.debug("Resampling %s", ", ".join(str(ds_id) for ds_id in ids))
             kwargs = resample_kwargs.copy()
             kwargs['resampler'] = resamplers[source_area]
-            res = resample_dataset(dataset, destination_area, **kwargs)
+            resampled.update(zip(ids, resample_datasets(dsets, destination_area, **kwargs)))
+
+        for ds_id, dataset, parent_dataset in walked:
+            pres = None
+            if parent_dataset is not None:
+                pres = new_datasets[DatasetID.from_dict(parent_dataset.attrs)]
+            if ds_id in new_datasets:
+                replace_anc(new_datasets[ds_id], pres)
+                if ds_id in new_scn.datasets:
+                    new_scn.datasets[ds_id] = new_datasets[ds_id]
+                continue
+            if dataset.attrs.get('area') is None:
+                if parent_dataset is None:
+                    new_scn.datasets[ds_id] = dataset
+                else:
+                    replace_anc(dataset, pres)
+                continue
+            res = resampled[ds_id]
             new_datasets[ds_id] = res
             if ds_id in new_scn.datasets:
                 new_scn.datasets[ds_id] = res
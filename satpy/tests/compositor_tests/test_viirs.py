@@ -320,6 +320,11 @@ class TestVIIRSComposites(unittest.TestCase):
                                             51.909142813383916, 58.8234273736508, 68.84706145641482, 69.91085190887961,
                                             71.10179768327806, 71.33161009169649])
 
+        # 32-bit reflectances aren't upcast by the 64-bit angles
+        res = ref_cor([c01.astype(np.float32)], [])
+        self.assertEqual(res.dtype, np.float32)
+        self.assertEqual(res.compute().dtype, np.float32)
+
     def test_reflectance_corrector_viirs(self):
         """Test ReflectanceCorrector modifier with VIIRS data."""
         import xarray as xr
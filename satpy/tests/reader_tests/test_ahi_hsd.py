@@ -220,6 +220,7 @@ class TestAHIHSDFileHandler(unittest.TestCase):
         bad_cali = [0.0, 0.0]
         fh = AHIHSDFileHandler()
         fh.calib_mode = 'NOMINAL'
+        fh.calib_lut = False
         fh.is_zipped = False
         fh._header = {
             'block5': {'band_number': [5],
@@ -261,6 +262,13 @@ class TestAHIHSDFileHandler(unittest.TestCase):
         refl = fh.calibrate(data=counts, calibration='reflectance')
         self.assertTrue(np.allclose(refl, refl_exp))
 
+        # Lookup tables
+        fh.calib_lut = True
+        bt = fh.calibrate(data=counts, calibration='brightness_temperature')
+        self.assertEqual(bt.dtype, np.float32)
+        np.testing.assert_allclose(bt, bt_exp, rtol=1e-6)
+        fh.calib_lut = False
+
         # Updated calibration
         # Standard operation
         fh.calib_mode = 'UPDATE'
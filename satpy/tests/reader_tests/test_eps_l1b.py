@@ -88,44 +88,60 @@ class TestEPSL1B(TestCase):
     def test_read_all(self):
         """Test initialization."""
         self.fh._read_all()
-        assert(self.fh.scanlines == 1080)
-        assert(self.fh.pixels == 2048)
+        assert self.fh.scanlines == 1080
+        assert self.fh.pixels == 2048
+
+    def test_read_records(self):
+        """Test indexing and reading the records."""
+        with open(self.filename, 'rb') as fdes:
+            buf = np.frombuffer(fdes.read(), dtype=np.uint8)
+        index = eps.index_records(buf)
+        # only the records described in the xml format are in the test file
+        assert [(key, count) for key, _, _, count in index] == \
+            [(('mphr', 0), 1), (('sphr', 0), 1), (('giadr', 1), 1), (('giadr', 2), 1), (('mdr', 2), 1080)]
+        assert index[-1][1] + index[-1][2] * index[-1][3] == buf.size
+
+        sections, _ = eps.read_records(self.filename)
+        assert eps.read_records(self.filename)[0] is sections
+        mdr = sections[('mdr', 2)]
+        assert mdr.shape == (1080,)
+        assert isinstance(sections[('mphr', 0)], np.memmap)
 
     def test_dataset(self):
         """Test getting a dataset."""
         did = DatasetID('1', calibration='reflectance')
         res = self.fh.get_dataset(did, {})
-        assert(isinstance(res, xr.DataArray))
-        assert(res.attrs['platform_name'] == 'Metop-C')
-        assert(res.attrs['sensor'] == 'avhrr-3')
-        assert(res.attrs['name'] == '1')
-        assert(res.attrs['calibration'] == 'reflectance')
+        assert isinstance(res, xr.DataArray)
+        assert res.attrs['platform_name'] == 'Metop-C'
+        assert res.attrs['sensor'] == 'avhrr-3'
+        assert res.attrs['name'] == '1'
+        assert res.attrs['calibration'] == 'reflectance'
 
         did = DatasetID('4', calibration='brightness_temperature')
         res = self.fh.get_dataset(did, {})
-        assert(isinstance(res, xr.DataArray))
-        assert(res.attrs['platform_name'] == 'Metop-C')
-        assert(res.attrs['sensor'] == 'avhrr-3')
-        assert(res.attrs['name'] == '4')
-        assert(res.attrs['calibration'] == 'brightness_temperature')
+        assert isinstance(res, xr.DataArray)
+        assert res.attrs['platform_name'] == 'Metop-C'
+        assert res.attrs['sensor'] == 'avhrr-3'
+        assert res.attrs['name'] == '4'
+        assert res.attrs['calibration'] == 'brightness_temperature'
 
     def test_navigation(self):
         """Test the navigation."""
         did = DatasetID('longitude')
         res = self.fh.get_dataset(did, {})
-        assert(isinstance(res, xr.DataArray))
-        assert(res.attrs['platform_name'] == 'Metop-C')
-        assert(res.attrs['sensor'] == 'avhrr-3')
-        assert(res.attrs['name'] == 'longitude')
+        assert isinstance(res, xr.DataArray)
+        assert res.attrs['platform_name'] == 'Metop-C'
+        assert res.attrs['sensor'] == 'avhrr-3'
+        assert res.attrs['name'] == 'longitude'
 
     def test_angles(self):
         """Test the navigation."""
         did = DatasetID('solar_zenith_angle')
         res = self.fh.get_dataset(did, {})
-        assert(isinstance(res, xr.DataArray))
-        assert(res.attrs['platform_name'] == 'Metop-C')
-        assert(res.attrs['sensor'] == 'avhrr-3')
-        assert(res.attrs['name'] == 'solar_zenith_angle')
+        assert isinstance(res, xr.DataArray)
+        assert res.attrs['platform_name'] == 'Metop-C'
+        assert res.attrs['sensor'] == 'avhrr-3'
+        assert res.attrs['name'] == 'solar_zenith_angle'
 
     @mock.patch('satpy.readers.eps_l1b.EPSAVHRRFile.__getitem__')
     @mock.patch('satpy.readers.eps_l1b.EPSAVHRRFile.__init__')
@@ -191,3 +191,4 @@ class TestGenericImage(unittest.TestCase):
         self.assertTrue(data.bands.size == 4)
         data = mask_image_data(data)
         self.assertTrue(data.bands.size == 3)
+        self.assertEqual(data.dtype, np.float32)
@@ -353,6 +353,40 @@ class GOESNCFileHandlerTest(unittest.TestCase):
                                           calibration=calib, channel=ch)
                     target_func.assert_called()
 
+    def test_calibrate_lut(self):
+        """Test that the lookup tables give the same values as the direct calibration"""
+        from satpy.readers.goes_imager_nc import GOESNCFileHandler
+
+        # All the 10-bit counts, stored as 16-bit integers
+        nrows = ncols = 32
+        counts = (32 * np.arange(nrows * ncols)).astype(np.int16).reshape((1, nrows, ncols))
+        lat = np.repeat(np.linspace(-80, 80, nrows), ncols).reshape(nrows, ncols)
+        dataset = xr.Dataset(
+            {'data': xr.DataArray(data=counts, dims=('time', 'yc', 'xc')),
+             'lon': xr.DataArray(data=np.zeros((nrows, ncols)), dims=('yc', 'xc')),
+             'lat': xr.DataArray(data=lat, dims=('yc', 'xc')),
+             'time': xr.DataArray(data=np.array([0], dtype='datetime64[ms]'),
+                                  dims=('time',)),
+             'bands': xr.DataArray(data=np.array([1]))},
+            attrs={'Satellite Sensor': 'G-15'})
+        # the lookup tables are computed with xarray, so only the file access is mocked
+        with mock.patch('satpy.readers.goes_imager_nc.xr.open_dataset', return_value=dataset):
+            direct = GOESNCFileHandler(filename='dummy', filename_info={}, filetype_info={})
+            lut = GOESNCFileHandler(filename='dummy', filename_info={}, filetype_info={}, calib_lut=True)
+
+        for ch in self.channels:
+            if lut._is_vis(ch):
+                calibs = ('radiance', 'reflectance')
+            else:
+                calibs = ('radiance', 'brightness_temperature')
+            for calib in calibs:
+                key = DatasetID(name=ch, calibration=calib)
+                expected = direct.get_dataset(key=key, info={})
+                res = lut.get_dataset(key=key, info={})
+                self.assertEqual(res.dtype, np.float32)
+                np.testing.assert_allclose(res, expected, rtol=1e-6,
+                                           err_msg='{} {}'.format(ch, calib))
+
     def test_get_sector(self):
         """Test sector identification"""
         from satpy.readers.goes_imager_nc import (FULL_DISC, NORTH_HEMIS_EAST,
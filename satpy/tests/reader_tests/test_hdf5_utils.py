@@ -136,3 +136,18 @@ class TestHDF5FileHandler(unittest.TestCase):
         self.assertFalse('fake_ds' in file_handler)
 
         self.assertIsInstance(file_handler['ds2_f/attr/test_ref'], np.ndarray)
+
+    def test_pooled_handle(self):
+        """Test that datasets are read even if the pool closed the file."""
+        from satpy.readers.hdf5_utils import HDF5FileHandler
+        from satpy.readers.utils import file_handle_pool
+        file_handler = HDF5FileHandler('test.h5', {}, {})
+        self.assertIn('test.h5', file_handle_pool)
+        ds1_i = file_handler['test_group/ds1_i']
+        self.assertEqual(ds1_i.attrs['test_attr_int'], 0)
+        file_handle_pool.close('test.h5')
+        self.assertNotIn('test.h5', file_handle_pool)
+        np.testing.assert_array_equal(ds1_i, np.arange(10 * 100).reshape((10, 100)))
+        self.assertIn('test.h5', file_handle_pool)
+        del file_handler
+        self.assertNotIn('test.h5', file_handle_pool)
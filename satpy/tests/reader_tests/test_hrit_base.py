@@ -25,7 +25,8 @@ from tempfile import gettempdir, NamedTemporaryFile
 
 import numpy as np
 
-from satpy.readers.hrit_base import HRITFileHandler, get_xritdecompress_cmd, get_xritdecompress_outfile, decompress
+from satpy.readers.hrit_base import (HRITFileHandler, get_xritdecompress_cmd, get_xritdecompress_outfile,
+                                     decompress, decompress_file)
 
 
 class TestHRITDecompress(unittest.TestCase):
@@ -77,6 +78,36 @@ class TestHRITDecompress(unittest.TestCase):
             os.environ.pop('XRIT_DECOMPRESS_PATH')
 
         self.assertEqual(res, os.path.join('.', 'bla.__'))
+        # the working directory of the process is not changed
+        self.assertEqual(popen.call_args[1]['cwd'], '.')
+
+    @mock.patch('satpy.readers.hrit_base.decompress')
+    def test_decompress_file_external(self, decompress):
+        """Test decompressing to memory with the external command."""
+        def _fake_decompress(infile, outdir):
+            outfile = os.path.join(outdir, 'bla.__')
+            with open(outfile, 'wb') as fd:
+                fd.write(b'decompressed')
+            return outfile
+        decompress.side_effect = _fake_decompress
+
+        with NamedTemporaryFile() as fd, \
+                mock.patch('satpy.readers.hrit_base.xRITDecompress', None):
+            res = decompress_file(fd.name)
+        self.assertEqual(res, b'decompressed')
+        # the temporary directory is removed
+        self.assertFalse(os.path.exists(decompress.call_args[0][1]))
+
+    def test_decompress_file_inprocess(self):
+        """Test decompressing in-process."""
+        with NamedTemporaryFile() as fd, \
+                mock.patch('satpy.readers.hrit_base.xRITDecompress') as xrit_cls:
+            fd.write(b'compressed')
+            fd.flush()
+            xrit_cls.return_value.data.return_value = b'decompressed'
+            res = decompress_file(fd.name)
+        xrit_cls.return_value.decompress.assert_called_once_with(b'compressed')
+        self.assertEqual(res, b'decompressed')
 
 
 class TestHRITFileHandler(unittest.TestCase):
@@ -158,3 +189,27 @@ class TestHRITFileHandler(unittest.TestCase):
                                                 dtype=np.uint8)
         res = self.reader.read_band('VIS006', None)
         self.assertEqual(res.compute().shape, (464, 3712))
+
+    @mock.patch('satpy.readers.hrit_base.np.memmap')
+    def test_read_band_from_buffer(self, memmap):
+        """Test reading a single band from a decompressed buffer."""
+        nbits = self.reader.mda['number_of_bits_per_pixel']
+        self.reader.mda['total_header_length'] = 16
+        data = np.random.randint(0, 256, size=int((464 * 3712 * nbits) / 8), dtype=np.uint8)
+        self.reader._buffer = b'\0' * 16 + data.tobytes()
+        res = self.reader.read_band('VIS006', None)
+        memmap.assert_not_called()
+        self.assertEqual(res.compute().shape, (464, 3712))
+
+    def test_header_from_buffer(self):
+        """Test reading the headers from a decompressed buffer."""
+        from satpy.readers.hrit_base import base_hdr_map, common_hdr, primary_header
+        hdr = np.zeros(1, dtype=common_hdr)
+        hdr['record_length'] = 16
+        primary = np.zeros(1, dtype=primary_header)
+        primary['total_header_length'] = 16
+        primary['data_field_length'] = 42
+        self.reader._buffer = hdr.tobytes() + primary.tobytes()
+        self.reader.mda = {}
+        self.reader._get_hd((base_hdr_map, {}, {}))
+        self.assertEqual(self.reader.mda['data_field_length'], 42)
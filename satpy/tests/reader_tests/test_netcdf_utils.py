@@ -109,6 +109,8 @@ class TestNetCDF4FileHandler(unittest.TestCase):
 
     def tearDown(self):
         """Remove the previously created test file."""
+        from satpy.readers.utils import file_handle_pool
+        file_handle_pool.close('test.nc')
         os.remove('test.nc')
 
     def test_all_basic(self):
@@ -165,8 +167,46 @@ class TestNetCDF4FileHandler(unittest.TestCase):
         np.testing.assert_array_equal(
                 h["ds2_f"],
                 np.arange(10. * 100).reshape((10, 100)))
+        file_handle = h.file_handle
         h.__del__()
-        self.assertFalse(h.file_handle.isopen())
+        self.assertFalse(file_handle.isopen())
+
+    def test_pooled_handle(self):
+        """Test that variables are read even if the pool closed the file."""
+        from satpy.readers.netcdf_utils import NetCDF4FileHandler
+        from satpy.readers.utils import file_handle_pool
+        h = NetCDF4FileHandler("test.nc", {}, {}, cache_handle=True)
+        self.assertIn("test.nc", file_handle_pool)
+        ds2_f = h["ds2_f"]
+        file_handle_pool.close("test.nc")
+        self.assertNotIn("test.nc", file_handle_pool)
+        np.testing.assert_array_equal(
+                ds2_f, np.arange(10. * 100).reshape((10, 100)))
+        self.assertIn("test.nc", file_handle_pool)
+        self.assertTrue(h.file_handle.isopen())
+        h.__del__()
+        self.assertNotIn("test.nc", file_handle_pool)
+
+    def test_pooled_xarray_dataset(self):
+        """Test that the xarray datasets are kept in the pool without cached handles."""
+        from unittest import mock
+        import xarray as xr
+        from satpy.readers.netcdf_utils import NetCDF4FileHandler
+        from satpy.readers.utils import file_handle_pool
+        h = NetCDF4FileHandler("test.nc", {}, {})
+        with mock.patch('satpy.readers.netcdf_utils.xr.open_dataset', wraps=xr.open_dataset) as open_dataset:
+            ds2_f = h["ds2_f"]
+            ds2_i = h["ds2_i"]
+            h["test_group/ds1_f"]
+            self.assertEqual(open_dataset.call_count, 2)
+            self.assertIn("test.nc", file_handle_pool)
+            file_handle_pool.close("test.nc")
+            np.testing.assert_array_equal(ds2_f, np.arange(10. * 100).reshape((10, 100)))
+            np.testing.assert_array_equal(ds2_i, np.arange(10 * 100).reshape((10, 100)))
+            h["ds2_f"]
+            self.assertEqual(open_dataset.call_count, 3)
+        h.__del__()
+        self.assertNotIn("test.nc", file_handle_pool)
 
     def test_filenotfound(self):
         """Test that error is raised when file not found."""
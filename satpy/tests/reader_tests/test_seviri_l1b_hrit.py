@@ -437,6 +437,48 @@ class TestHRITMSGFileHandler(unittest.TestCase):
         self.assertRaises(ValueError, HRITMSGFileHandler, filename=None, filename_info=None,
                           filetype_info=None, prologue=pro, epilogue=epi, calib_mode='invalid')
 
+    @mock.patch('satpy.readers.hrit_base.HRITFileHandler.__init__', return_value=None)
+    @mock.patch('satpy.readers.seviri_l1b_hrit.HRITMSGFileHandler._get_header', autospec=True)
+    def test_calibrate_lut(self, get_header, *mocks):
+        """Test that the lookup tables give the same values as the direct calibration."""
+        nlines = 4
+        counts = xr.DataArray(np.arange(nlines * 256, dtype=np.uint16).reshape((nlines, 256)))
+        gain = np.linspace(0.02, 0.2, 12)
+        pro = mock.MagicMock(prologue={
+            'RadiometricProcessing': {'Level15ImageCalibration': {'CalSlope': gain, 'CalOffset': -0.5 * gain}},
+            'ImageDescription': {'Level15ImageProduction': {'PlannedChanProcessing': np.full(13, 2)}}})
+        epi = mock.MagicMock(epilogue=None)
+        mda = {'number_of_bits_per_pixel': 10,
+               'image_segment_line_quality': {'line_validity': np.array([0, 0, 0, 3]),
+                                              'line_radiometric_quality': np.full(nlines, 4),
+                                              'line_geometric_quality': np.full(nlines, 4)}}
+
+        def get_header_patched(self):
+            self.mda = mda
+
+        get_header.side_effect = get_header_patched
+
+        direct = HRITMSGFileHandler(filename=None, filename_info=None, filetype_info=None,
+                                    prologue=pro, epilogue=epi)
+        lut = HRITMSGFileHandler(filename=None, filename_info=None, filetype_info=None,
+                                 prologue=pro, epilogue=epi, calib_lut=True)
+        for reader in (direct, lut):
+            reader.platform_id = 324
+        for ch_id, ch_name, calibration in ((1, 'VIS006', 'reflectance'),
+                                            (9, 'IR_108', 'brightness_temperature'),
+                                            (9, 'IR_108', 'radiance')):
+            for reader in (direct, lut):
+                reader.channel_name = ch_name
+                reader.mda['spectral_channel_id'] = ch_id
+            expected = direct.calibrate(data=counts, calibration=calibration)
+            res = lut.calibrate(data=counts, calibration=calibration)
+            self.assertEqual(res.dtype, np.float32)
+            # zero counts and the lines selected by the line quality are masked in both cases
+            np.testing.assert_array_equal(np.isnan(res), np.isnan(expected))
+            self.assertTrue(np.isnan(res[0, 0]))
+            self.assertTrue(np.isnan(res[-1]).all())
+            np.testing.assert_allclose(res, expected, rtol=1e-6)
+
     @mock.patch('satpy.readers.seviri_l1b_hrit.HRITMSGFileHandler._get_timestamps')
     @mock.patch('satpy.readers.seviri_l1b_hrit.HRITFileHandler.get_dataset')
     @mock.patch('satpy.readers.seviri_l1b_hrit.HRITMSGFileHandler.calibrate')
@@ -617,6 +617,32 @@ class TestNativeMSGCalibrationMode(unittest.TestCase):
         )
         assertNumpyArraysEqual(calculated, expected)
 
+    def test_calibration_lut(self):
+        """Test that the lookup tables give the same values as the direct calibration."""
+        # counts with positive radiances for all the coefficients of the header
+        counts = xr.DataArray(np.arange(52, 1024, dtype=np.uint16).reshape((4, 243)))
+        header = self.create_test_header(1, DatasetID(name='IR_108'), True)
+        header['15_DATA_HEADER']['ImageDescription']['Level15ImageProduction'] = {
+            'PlannedChanProcessing': [2] * 12}
+
+        with mock.patch('satpy.readers.seviri_l1b_native.np.fromfile') as fromfile:
+            fromfile.return_value = header
+            with mock.patch('satpy.readers.seviri_l1b_native.recarray2dict') as recarray2dict:
+                recarray2dict.side_effect = (lambda x: x)
+                with mock.patch('satpy.readers.seviri_l1b_native.NativeMSGFileHandler._get_memmap') as _get_memmap:
+                    _get_memmap.return_value = np.arange(3)
+                    with mock.patch('satpy.readers.seviri_l1b_native.NativeMSGFileHandler._read_trailer'):
+                        for cal_mode in ('nominal', 'gsics'):
+                            direct = NativeMSGFileHandler(None, {}, None, calib_mode=cal_mode)
+                            lut = NativeMSGFileHandler(None, {}, None, calib_mode=cal_mode, calib_lut=True)
+                            for dataset_id in (DatasetID(name='VIS006', calibration='reflectance'),
+                                               DatasetID(name='IR_108', calibration='brightness_temperature'),
+                                               DatasetID(name='WV_062', calibration='radiance')):
+                                expected = direct.calibrate(counts, dataset_id)
+                                res = lut.calibrate(counts, dataset_id)
+                                self.assertEqual(res.dtype, np.float32)
+                                np.testing.assert_allclose(res, expected, rtol=1e-6)
+
     def test_calibration_mode_dummy(self):
         """Test a dummy calibration mode."""
         # pass in a calibration mode that is not recognised by the reader
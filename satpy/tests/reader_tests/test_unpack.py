@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for the unpacking of n-bit words."""
+
+import unittest
+
+import dask.array as da
+import numpy as np
+
+from satpy.readers._unpack import unpack_bits
+
+
+def pack_bits(words, nbits, byteorder='big'):
+    """Pack *words* as *nbits*-bit words one bit after the other."""
+    bits = ''.join(format(int(word), '0{}b'.format(nbits)) for word in words)
+    if byteorder == 'big':
+        return np.array([int(bits[idx:idx + 8], 2) for idx in range(0, len(bits), 8)], dtype=np.uint8)
+    bits = ''.join(format(int(word), '0{}b'.format(nbits))[::-1] for word in words)
+    return np.array([int(bits[idx:idx + 8][::-1], 2) for idx in range(0, len(bits), 8)], dtype=np.uint8)
+
+
+class TestUnpackBits(unittest.TestCase):
+    """Test unpacking n-bit words."""
+
+    def test_unpack(self):
+        """Test unpacking numpy and dask arrays."""
+        rng = np.random.RandomState(0)
+        for nbits in (10, 11, 12, 14):
+            words = rng.randint(0, 2 ** nbits, 56).astype(np.uint16)
+            for byteorder in ('big', 'little'):
+                packed = pack_bits(words, nbits, byteorder)
+                res = unpack_bits(packed, nbits, byteorder)
+                self.assertEqual(res.dtype, np.uint16)
+                np.testing.assert_array_equal(res, words)
+                # chunks not made of whole groups of words
+                res = unpack_bits(da.from_array(packed, chunks=11), nbits, byteorder)
+                self.assertIsInstance(res, da.Array)
+                np.testing.assert_array_equal(res.compute(), words)
+
+    def test_chunks(self):
+        """Test that the chunks of whole groups of words are kept."""
+        packed = da.from_array(pack_bits(np.arange(16), 10), chunks=10)
+        res = unpack_bits(packed, 10)
+        self.assertEqual(res.chunks, ((8, 8),))
+        np.testing.assert_array_equal(res.compute(), np.arange(16))
+        # trailing bytes are dropped
+        np.testing.assert_array_equal(unpack_bits(packed[:-1], 10).compute(), np.arange(12))
+
+    def test_bad_words(self):
+        """Test that words which can't be unpacked are refused."""
+        self.assertRaises(ValueError, unpack_bits, np.zeros(10, dtype=np.uint8), 0)
+        self.assertRaises(ValueError, unpack_bits, np.zeros(10, dtype=np.uint8), 20)
+        self.assertRaises(ValueError, unpack_bits, np.zeros(10, dtype=np.uint8), 10, 'middle')
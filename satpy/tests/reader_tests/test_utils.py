@@ -299,3 +299,165 @@ class TestHelpers(unittest.TestCase):
         filename = 'tester.DAT'
         new_fname = hf.unzip_file(filename)
         self.assertIsNone(new_fname)
+
+
+class TestFileHandlePool(unittest.TestCase):
+    """Test the pool of open file handles."""
+
+    def test_acquire(self):
+        """Test that handles are reused and the least recently used ones closed."""
+        pool = hf.FileHandlePool(2)
+        opener = mock.MagicMock(side_effect=lambda filename, mode: mock.MagicMock(name=filename))
+        with pool.acquire('a', opener, 'r') as handle_a:
+            pass
+        with pool.acquire('b', opener, 'r') as handle_b:
+            pass
+        with pool.acquire('a', opener, 'r') as handle:
+            self.assertIs(handle, handle_a)
+        self.assertEqual(opener.call_count, 2)
+        self.assertEqual(len(pool), 2)
+
+        with pool.acquire('c', opener, 'r') as handle_c:
+            pass
+        self.assertEqual(len(pool), 2)
+        handle_b.close.assert_called_once_with()
+        self.assertNotIn('b', pool)
+        self.assertIn('a', pool)
+
+        pool.close('a')
+        handle_a.close.assert_called_once_with()
+        self.assertNotIn('a', pool)
+        pool.clear()
+        handle_c.close.assert_called_once_with()
+        self.assertEqual(len(pool), 0)
+
+    @mock.patch('satpy.readers.utils.os.getpid')
+    def test_fork(self, getpid):
+        """Test that handles from a parent process are not used nor closed."""
+        getpid.return_value = 1
+        pool = hf.FileHandlePool(2)
+        opener = mock.MagicMock(side_effect=lambda filename: mock.MagicMock(name=filename))
+        with pool.acquire('a', opener) as parent_handle:
+            pass
+        getpid.return_value = 2
+        self.assertNotIn('a', pool)
+        with pool.acquire('a', opener) as handle:
+            self.assertIsNot(handle, parent_handle)
+        parent_handle.close.assert_not_called()
+
+    def test_pooled_variable(self):
+        """Test reading through a pooled variable."""
+        import dask.array as da
+        from dask.base import tokenize
+        pool = hf.FileHandlePool(2)
+        data = np.arange(6).reshape((2, 3))
+        opener = mock.MagicMock(return_value={'group/var': data})
+        with mock.patch('satpy.readers.utils.file_handle_pool', pool):
+            var = hf.PooledVariable('a', 'group/var', (2, 3), data.dtype, opener)
+            self.assertEqual(var.ndim, 2)
+            res = da.from_array(var, chunks=1)
+            np.testing.assert_array_equal(res, data)
+        opener.assert_called_once_with('a')
+        self.assertEqual(tokenize(var),
+                         tokenize(hf.PooledVariable('a', 'group/var', (2, 3), data.dtype, opener)))
+
+
+class TestHeaderCache(unittest.TestCase):
+    """Test the cache of items derived from file headers."""
+
+    @mock.patch('satpy.readers.utils.time.time')
+    def test_get_or_create(self, time):
+        """Test that items are reused until they expire."""
+        time.return_value = 0
+        cache = hf.HeaderCache(ttl=10, max_items=2)
+        func = mock.MagicMock(side_effect=lambda val: val * 2)
+        self.assertEqual(cache.get_or_create(('area', 1), func, 1), 2)
+        self.assertEqual(cache.get_or_create(('area', 1), func, 3), 2)
+        func.assert_called_once_with(1)
+
+        time.return_value = 11
+        self.assertIsNone(cache.get(('area', 1)))
+        self.assertEqual(cache.get_or_create(('area', 1), func, 3), 6)
+
+        cache[('area', 2)] = 4
+        cache[('area', 3)] = 8
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(('area', 1)))
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_cache_dir(self):
+        """Test sharing the items through a cache directory."""
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = hf.HeaderCache(cache_dir=cache_dir)
+            cache[('table', 'HRV')] = np.arange(3)
+            new_cache = hf.HeaderCache(cache_dir=cache_dir)
+            np.testing.assert_array_equal(new_cache[('table', 'HRV')], np.arange(3))
+            self.assertIsNone(new_cache.get(('table', 'VIS006')))
+            self.assertIsNone(hf.HeaderCache(ttl=-1, cache_dir=cache_dir).get(('table', 'HRV')))
+
+    def test_cache_dir_failure(self):
+        """Test that no partially written file is left in the cache directory."""
+        import os
+        import tempfile
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = hf.HeaderCache(cache_dir=cache_dir)
+            # unpicklable items are only kept in memory
+            cache[('area', 'lambda')] = lambda: None
+            self.assertEqual(os.listdir(cache_dir), [])
+            self.assertIsNotNone(cache.get(('area', 'lambda')))
+            with mock.patch('satpy.readers.utils.os.replace', side_effect=KeyboardInterrupt):
+                with self.assertRaises(KeyboardInterrupt):
+                    cache[('table', 'HRV')] = np.arange(3)
+            self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_set_header_cache(self):
+        """Test replacing the header cache used by the file handlers."""
+        from satpy.readers._geos_area import get_area_definition
+        cache = mock.MagicMock()
+        default_cache = hf.get_header_cache()
+        try:
+            hf.set_header_cache(cache)
+            self.assertIs(hf.get_header_cache(), cache)
+            pdict = {'a': 1., 'b': 1., 'h': 1., 'ssp_lon': 0., 'ncols': 2, 'nlines': 2,
+                     'a_name': 'a', 'a_desc': 'a', 'p_id': 'a'}
+            self.assertIs(get_area_definition(pdict, (0, 0, 1, 1)), cache.get_or_create.return_value)
+        finally:
+            hf.set_header_cache(default_cache)
+
+
+class TestCalibrationLUT(unittest.TestCase):
+    """Test the lookup-table calibration."""
+
+    def setUp(self):
+        """Create a calibration table."""
+        self.lut = hf.get_calibration_lut(lambda counts: counts * 0.5 - 1, 7)
+
+    def test_get_calibration_lut(self):
+        """Test computing the table."""
+        self.assertEqual(self.lut.dtype, np.float32)
+        np.testing.assert_allclose(self.lut, np.arange(8) * 0.5 - 1)
+
+    def test_apply_lut(self):
+        """Test applying the table to numpy, dask and xarray data."""
+        import dask.array as da
+        import xarray as xr
+        counts = np.array([[0, 3], [7, 9]], dtype=np.uint16)
+        expected = np.array([[-1., 0.5], [2.5, 2.5]], dtype=np.float32)
+        np.testing.assert_allclose(hf.apply_lut(counts, self.lut), expected)
+
+        res = hf.apply_lut(da.from_array(counts, chunks=1), self.lut)
+        self.assertIsInstance(res, da.Array)
+        self.assertEqual(res.dtype, np.float32)
+        np.testing.assert_allclose(res.compute(), expected)
+
+        data = xr.DataArray(da.from_array(counts, chunks=1), dims=('y', 'x'), attrs={'units': '1'})
+        res = hf.apply_lut(data, self.lut)
+        self.assertIsInstance(res, xr.DataArray)
+        self.assertEqual(res.attrs, {'units': '1'})
+        np.testing.assert_allclose(res.values, expected)
+
+        # masked counts stay masked
+        counts = np.array([0., np.nan, 2.])
+        np.testing.assert_allclose(hf.apply_lut(counts, self.lut), [-1., np.nan, 0.])
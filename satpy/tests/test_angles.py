@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for the angles module."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+import dask.array as da
+import numpy as np
+
+
+class TestAngles(unittest.TestCase):
+    """Test the cached sun and satellite angles."""
+
+    def setUp(self):
+        """Patch in-module imports and create a test area."""
+        from pyresample.geometry import AreaDefinition
+        from satpy.angles import angle_cache
+        from satpy.utils import lonlat_cache
+        angle_cache.clear()
+        lonlat_cache.clear()
+        self.astronomy = mock.MagicMock()
+        self.orbital = mock.MagicMock()
+        self.astronomy.cos_zen.side_effect = lambda utc_time, lons, lats: lons * 0 + 1
+        self.astronomy.get_alt_az.side_effect = lambda utc_time, lons, lats: (lons * 0, lons * 0)
+        self.astronomy.sun_zenith_angle.side_effect = lambda utc_time, lons, lats: lons * 0
+        self.orbital.get_observer_look.side_effect = lambda *args: (args[4] * 0 + 1, args[4] * 0 + 2)
+        modules = {
+            'pyorbital.astronomy': self.astronomy,
+            'pyorbital.orbital': self.orbital,
+        }
+        self.module_patcher = mock.patch.dict('sys.modules', modules)
+        self.module_patcher.start()
+        self.area = AreaDefinition('test', 'test', 'test',
+                                   {'proj': 'geos', 'h': 35785831, 'lon_0': 0},
+                                   4, 4, (-2000000, -2000000, 2000000, 2000000))
+        self.satpos = (0.01, 0.001, 35785831.)
+        self.time = datetime(2020, 1, 1, 12)
+
+    def tearDown(self):
+        """Unpatch in-module imports."""
+        self.module_patcher.stop()
+
+    def test_cos_sza(self):
+        """Test that the sun zenith angles are computed once."""
+        from satpy.angles import get_cos_sza
+        res = get_cos_sza(self.area, self.time, chunks=2)
+        self.assertIsInstance(res, da.Array)
+        self.assertIs(get_cos_sza(self.area, self.time, chunks=2), res)
+        self.assertIsNot(get_cos_sza(self.area, datetime(2020, 1, 1, 12, 5), chunks=2), res)
+        self.assertEqual(self.astronomy.cos_zen.call_count, 2)
+
+    def test_lonlats_shared(self):
+        """Test that the lons/lats are shared between sun and satellite angles."""
+        from satpy.angles import get_angles
+        with mock.patch.object(self.area, 'get_lonlats', wraps=self.area.get_lonlats) as get_lonlats:
+            sata, satz, suna, sunz = get_angles(self.area, self.time, self.satpos, chunks=2)
+            get_angles(self.area, self.time, self.satpos, chunks=2)
+        get_lonlats.assert_called_once()
+        self.orbital.get_observer_look.assert_called_once()
+        args = self.orbital.get_observer_look.call_args[0]
+        self.assertEqual(args[:4], (0.01, 0.001, 35785.831, self.time))
+        np.testing.assert_allclose(satz, 88)
+
+    @mock.patch('satpy.angles.ANGLE_TIME_RESOLUTION', 600)
+    def test_time_resolution(self):
+        """Test that close times share the same angles."""
+        from satpy.angles import get_sun_angles
+        res = get_sun_angles(self.area, datetime(2020, 1, 1, 12, 2), chunks=2)
+        self.assertIs(get_sun_angles(self.area, datetime(2020, 1, 1, 11, 58), chunks=2), res)
+        self.assertEqual(self.astronomy.get_alt_az.call_args[0][0], self.time)
+
+    def test_disk_cache(self):
+        """Test saving the satellite angles to disk."""
+        from satpy.angles import get_satellite_angles, angle_cache
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch('satpy.angles.ANGLE_CACHE_DIR', cache_dir):
+                sata, satz = get_satellite_angles(self.area, self.time, self.satpos, chunks=2)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                np.testing.assert_allclose(sata, 1)
+                np.testing.assert_allclose(satz, 88)
+                angle_cache.clear()
+                # a slightly different position is found on disk
+                sata, satz = get_satellite_angles(self.area, self.time, (0.011, 0.001, 35785900.), chunks=2)
+                np.testing.assert_allclose(satz, 88)
+                self.assertEqual(satz.chunks, ((2, 2), (2, 2)))
+            self.orbital.get_observer_look.assert_called_once()
+        finally:
+            shutil.rmtree(cache_dir)
@@ -17,6 +17,7 @@
 # satpy.  If not, see <http://www.gnu.org/licenses/>.
 """Tests for compositors in composites/__init__.py."""
 
+import os
 import unittest
 from datetime import datetime
 from unittest import mock
@@ -294,6 +295,29 @@ class TestSunZenithCorrector(unittest.TestCase):
         res = comp((self.ds1, self.sza), test_attr='test')
         np.testing.assert_allclose(res.values, np.array([[66.853262, 68.168939], [66.30742, 67.601493]]))
 
+    def test_float32(self):
+        """Test that 32-bit data isn't upcast by the 64-bit angles."""
+        from satpy.composites import SunZenithCorrector, EffectiveSolarPathLengthCorrector
+        from satpy.utils import set_precision
+        comp = SunZenithCorrector(name='sza_test', modifiers=tuple())
+        ds1 = self.ds1.astype(np.float32)
+        res = comp((ds1,), test_attr='test')
+        self.assertEqual(res.dtype, np.float32)
+        self.assertEqual(res.compute().dtype, np.float32)
+        np.testing.assert_allclose(res.values, np.array([[22.401667, 22.31777], [22.437503, 22.353533]]),
+                                   rtol=1e-6)
+        self.assertEqual(comp((ds1, self.sza), test_attr='test').dtype, np.float32)
+        # 64-bit data is corrected with the full precision
+        self.assertEqual(comp((self.ds1,), test_attr='test').dtype, np.float64)
+        comp = EffectiveSolarPathLengthCorrector(name='sza_test', modifiers=tuple())
+        self.assertEqual(comp((ds1,), test_attr='test').dtype, np.float32)
+        try:
+            set_precision('float64')
+            comp = SunZenithCorrector(name='sza_test', modifiers=tuple())
+            self.assertEqual(comp((ds1,), test_attr='test').dtype, np.float32)
+        finally:
+            set_precision('float32')
+
     def test_imcompatible_areas(self):
         """Test sunz correction on incompatible areas."""
         from satpy.composites import SunZenithCorrector, IncompatibleAreas
@@ -415,6 +439,17 @@ class TestDayNightCompositor(unittest.TestCase):
         expected = np.array([[0., 0.33164983], [0.66835017, 1.]])
         np.testing.assert_allclose(res.values[0], expected)
 
+    def test_float32(self):
+        """Test that 32-bit images aren't upcast by the 64-bit angles."""
+        from satpy.composites import DayNightCompositor
+        comp = DayNightCompositor(name='dn_test')
+        data_a = self.data_a.astype(np.float32)
+        data_b = self.data_b.astype(np.float32)
+        for projectables in ((data_a, data_b, self.sza), (data_a, data_b)):
+            res = comp(projectables)
+            self.assertEqual(res.dtype, np.float32)
+            self.assertEqual(res.compute().dtype, np.float32)
+
 
 class TestFillingCompositor(unittest.TestCase):
     """Test case for the filling compositor."""
@@ -528,6 +563,30 @@ class TestInlineComposites(unittest.TestCase):
                          ['IR_108', 'IR_087'])
 
 
+class TestCompositorLoader(unittest.TestCase):
+    """Test the compositor loader."""
+
+    def test_shared_compositors(self):
+        """Test that the compositors are shared between loaders."""
+        from satpy.composites import CompositorLoader, sensor_composites_cache
+        sensor_composites_cache.clear()
+        cl_ = CompositorLoader()
+        cl_.load_sensor_composites('seviri')
+        cl2 = CompositorLoader()
+        with mock.patch('satpy.composites.read_yaml_file') as read_yaml_file:
+            cl2.load_sensor_composites('seviri')
+        read_yaml_file.assert_not_called()
+        self.assertIn('visir', cl2.compositors)
+        self.assertIsNot(cl2.compositors['seviri'], cl_.compositors['seviri'])
+        self.assertIs(cl2.compositors['seviri']['natural_color'], cl_.compositors['seviri']['natural_color'])
+
+        # changed configuration files are read again
+        with mock.patch('satpy.composites._get_file_stamp', return_value=(0, 0)):
+            cl3 = CompositorLoader()
+            cl3.load_sensor_composites('seviri')
+        self.assertIsNot(cl3.compositors['seviri']['natural_color'], cl_.compositors['seviri']['natural_color'])
+
+
 class TestNIRReflectance(unittest.TestCase):
     """Test NIR reflectance compositor."""
 
@@ -584,7 +643,9 @@ class TestNIRReflectance(unittest.TestCase):
         calculator.assert_called()
         calculator.assert_called_with('Meteosat-11', 'seviri', 'IR_039', sunz_threshold=None)
         self.assertTrue(apply_modifier_info.call_args[0][0] is nir)
-        self.assertTrue(comp._refl3x is calculator.return_value)
+        # the compositors are shared between scenes, no state is kept
+        self.assertFalse(hasattr(comp, '_refl3x'))
+        refl_from_tbs.assert_called_once()
         refl_from_tbs.reset_mock()
 
         res = comp([nir, ir_], optional_datasets=[], **info)
@@ -1023,6 +1084,13 @@ class TestStaticImageCompositor(unittest.TestCase):
         self.assertTrue('modifiers' not in res.attrs)
         self.assertTrue('calibration' not in res.attrs)
 
+        # the file found in SATPY_ANCPATH isn't kept in the shared compositor
+        with mock.patch('os.path.isfile', side_effect=lambda path: path != "foo.tif"), \
+                mock.patch('satpy.composites.get_environ_ancpath', return_value='/anc'):
+            comp()
+        Scene.assert_called_with(reader='generic_image', filenames=[os.path.join('/anc', 'foo.tif')])
+        self.assertEqual(comp.filename, "foo.tif")
+
         # Non-georeferenced image, no area given
         img.attrs.pop('area')
         comp = StaticImageCompositor("name", filename="foo.tif")
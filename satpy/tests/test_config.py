@@ -127,3 +127,75 @@ class TestPluginsConfigs(unittest.TestCase):
         from satpy.config import get_entry_points_config_dirs
         dirs = get_entry_points_config_dirs('satpy.composites')
         self.assertListEqual(dirs, [os.path.join(ep.dist.module_path, 'satpy_cpe', 'etc')])
+
+
+class TestReadYAMLFile(unittest.TestCase):
+    """Test the cache of parsed YAML files."""
+
+    def setUp(self):
+        """Create a test YAML file."""
+        import tempfile
+        from satpy.config import config_cache
+        config_cache.clear()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmp_dir, 'test.yaml')
+        with open(self.filename, 'w') as fd:
+            fd.write("reader:\n  name: test\n  sensors: [a, b]\n")
+
+    def tearDown(self):
+        """Remove the test files."""
+        import shutil
+        from satpy.config import config_cache
+        config_cache.clear()
+        shutil.rmtree(self.tmp_dir)
+
+    def test_memory_cache(self):
+        """Test that a file is parsed only once as long as it isn't modified."""
+        import yaml
+        from satpy.config import read_yaml_file
+        with mock.patch('yaml.load', wraps=yaml.load) as load:
+            conf = read_yaml_file(self.filename)
+            self.assertDictEqual(conf, {'reader': {'name': 'test', 'sensors': ['a', 'b']}})
+            # the cached configs can't be modified by the callers
+            conf['reader']['sensors'].append('c')
+            self.assertListEqual(read_yaml_file(self.filename)['reader']['sensors'], ['a', 'b'])
+            self.assertEqual(load.call_count, 1)
+            if hasattr(yaml, 'CUnsafeLoader'):
+                self.assertIs(load.call_args[1]['Loader'], yaml.CUnsafeLoader)
+
+            with open(self.filename, 'w') as fd:
+                fd.write("reader:\n  name: test2\n")
+            stat = os.stat(self.filename)
+            os.utime(self.filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+            self.assertEqual(read_yaml_file(self.filename)['reader']['name'], 'test2')
+            self.assertEqual(load.call_count, 2)
+
+    def test_disk_cache(self):
+        """Test that the parsed files are shared through the cache directory."""
+        from satpy.config import read_yaml_file, config_cache
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        with mock.patch('satpy.config.CONFIG_CACHE_DIR', cache_dir):
+            read_yaml_file(self.filename)
+            # the cache file is only written once for all the parsed files
+            self.assertFalse(os.path.exists(cache_dir))
+            config_cache.save()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            with mock.patch('pickle.dump') as dump:
+                config_cache.save()
+            dump.assert_not_called()
+            config_cache.clear()
+            with mock.patch('yaml.load') as load:
+                conf = read_yaml_file(self.filename)
+            load.assert_not_called()
+        self.assertEqual(conf['reader']['name'], 'test')
+
+    def test_disk_cache_failure(self):
+        """Test that no temporary file is left when the configs can't be pickled."""
+        import pickle
+        from satpy.config import read_yaml_file, config_cache
+        cache_dir = os.path.join(self.tmp_dir, 'cache')
+        with mock.patch('satpy.config.CONFIG_CACHE_DIR', cache_dir):
+            read_yaml_file(self.filename)
+            with mock.patch('pickle.dump', side_effect=pickle.PicklingError):
+                config_cache.save()
+        self.assertListEqual(os.listdir(cache_dir), [])
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for the execution plans."""
+
+import unittest
+from unittest import mock
+
+import dask
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+
+class TestEliminateCommonSubexpressions(unittest.TestCase):
+    """Test merging the tasks doing the same work."""
+
+    def test_merge(self):
+        """Test that identical tasks with different names are merged."""
+        from dask.base import collections_to_dsk
+        from satpy.plan import eliminate_common_subexpressions
+        arr = da.arange(16, chunks=4)
+        sqrt1 = arr.map_blocks(np.sqrt, name='sqrt1')
+        sqrt2 = arr.map_blocks(np.sqrt, name='sqrt2')
+        res1 = sqrt1 + 1
+        res2 = sqrt2 + 2
+        dsk = dict(collections_to_dsk([res1, res2], optimize_graph=False))
+        new_dsk, merged = eliminate_common_subexpressions(dsk)
+        self.assertEqual(merged, 4)
+        self.assertTrue(new_dsk[(sqrt2.name, 0)] == (sqrt1.name, 0) or new_dsk[(sqrt1.name, 0)] == (sqrt2.name, 0))
+        res = dask.get(new_dsk, [res2.__dask_keys__()])
+        np.testing.assert_allclose(np.concatenate(res[0]), np.sqrt(np.arange(16)) + 2)
+
+
+class TestExecutionPlan(unittest.TestCase):
+    """Test the execution plans."""
+
+    def test_plan(self):
+        """Test describing and computing datasets together."""
+        from satpy.plan import ExecutionPlan
+        arr = da.arange(64, chunks=16, dtype=np.float32).reshape((8, 8))
+        ds1 = xr.DataArray(arr.map_blocks(np.sqrt, name='sqrt1') * 2, dims=('y', 'x'), attrs={'name': 'ds1'})
+        ds2 = xr.DataArray(arr.map_blocks(np.sqrt, name='sqrt2') * 3, dims=('y', 'x'), attrs={'name': 'ds2'})
+        ds3 = xr.DataArray(np.ones((2, 2)), dims=('y', 'x'), attrs={'name': 'ds3'})
+        plan = ExecutionPlan([ds1, ds2, ds3])
+        self.assertEqual(plan.duplicate_tasks, 4)
+        self.assertGreater(plan.shared_tasks, 0)
+        self.assertEqual(plan.nbytes, 2 * 64 * 4 + 4 * 8)
+        self.assertEqual(plan.nodes[0].chunk_nbytes, 16 * 4)
+        self.assertIn('ds1 [user] (8, 8) float32 256.0 B', str(plan))
+
+        res = plan.compute(scheduler='sync')
+        np.testing.assert_allclose(res['ds2'].values, np.sqrt(np.arange(64).reshape((8, 8))) * 3)
+        self.assertEqual(res['ds2'].attrs['name'], 'ds2')
+        np.testing.assert_allclose(res['ds3'].values, 1)
+
+    @mock.patch('satpy.composites.CompositorLoader.load_compositors')
+    @mock.patch('satpy.scene.Scene.create_reader_instances')
+    def test_scene_plan(self, cri, cl):
+        """Test the plan of the datasets loaded in a scene."""
+        from satpy.scene import Scene
+        from satpy.tests.utils import FakeReader, test_composites
+        cri.return_value = {'fake_reader': FakeReader('fake_reader', 'fake_sensor')}
+        cl.return_value = test_composites('fake_sensor')
+        scene = Scene(filenames=['bla'], base_dir='bli', reader='fake_reader')
+        scene.load(['comp4'], unload=False)
+        plan = scene.plan()
+        self.assertListEqual([(str(node.name.name), node.kind, node.depth) for node in plan.nodes],
+                             [('comp4', 'composite', 0), ('comp2', 'composite', 1), ('ds1', 'reader', 2),
+                              ('ds2', 'reader', 2), ('ds3', 'reader', 1)])
+        self.assertListEqual(list(plan.compute().keys(names=True)), ['comp4'])
+
+        scene.unload()
+        self.assertIn('ds1 [reader] (not loaded)', str(scene.plan()))
@@ -181,6 +181,60 @@ class TestDatasetDict(unittest.TestCase):
         self.assertEqual(d[0.5]['resolution'], 500)
         self.assertEqual(d[0.5]['name'], 'testh')
 
+    def test_index_updates(self):
+        """Test that the index follows the changes of the dictionary."""
+        import copy
+        import pickle
+        from satpy.dataset import DatasetID
+        d = self.test_dict
+        del d['test']
+        self.assertNotIn('test', d)
+        self.assertEqual(d[0.5], '1h')
+        d.pop(DatasetID(name='testh', wavelength=(0, 0.5, 1), resolution=500))
+        self.assertNotIn(0.5, d)
+        d.update({DatasetID(name='new', wavelength=(0.4, 0.5, 0.6)): 'new'})
+        self.assertEqual(d[0.5], 'new')
+        d.setdefault(DatasetID(name='other'), 'other')
+        self.assertEqual(d['other'], 'other')
+        for d2 in (copy.copy(d), copy.deepcopy(d), pickle.loads(pickle.dumps(d))):
+            self.assertEqual(d2['test2'], '2')
+            d2[DatasetID(name='copied')] = {}
+            self.assertIn('copied', d2)
+            self.assertNotIn('copied', d)
+        d.clear()
+        self.assertNotIn('test2', d)
+
+
+class TestDatasetIDIndex(unittest.TestCase):
+    """Test the DatasetIDIndex class."""
+
+    def test_filter(self):
+        """Test that the index gives the same results as scanning the keys."""
+        from satpy.dataset import DatasetID
+        from satpy.readers import DatasetIDIndex, filter_keys_by_dataset_id, get_key
+        keys = [DatasetID(name='C{:02d}'.format(i), wavelength=(i / 10., i / 10. + 0.05, i / 10. + 0.1),
+                          resolution=(500, 1000)[i % 2], calibration=('reflectance', 'radiance')[i % 3 // 2],
+                          modifiers=((), ('mod1',))[i % 4 // 3])
+                for i in range(30)]
+        keys += [DatasetID(name='scalar', wavelength=2.5), DatasetID(name='lonely', modifiers=None)]
+        index = DatasetIDIndex(keys)
+        self.assertEqual(len(index), 32)
+        queries = [DatasetID(name='C05', modifiers=None), DatasetID(wavelength=1.52, modifiers=None),
+                   DatasetID(wavelength=1.5), DatasetID(resolution=500, modifiers=None),
+                   DatasetID(wavelength=2.5, modifiers=None), DatasetID(modifiers=('mod1',)),
+                   DatasetID(name='C07', calibration='radiance', modifiers=None),
+                   DatasetID(name='lonely', modifiers=None), DatasetID(name='missing', modifiers=None)]
+        for query in queries:
+            self.assertEqual(filter_keys_by_dataset_id(query, index),
+                             filter_keys_by_dataset_id(query, keys))
+        self.assertEqual(get_key(1.52, index, resolution=1000).name, 'C15')
+
+        index.discard(keys[15])
+        self.assertNotIn(keys[15], index)
+        self.assertEqual(filter_keys_by_dataset_id(DatasetID(wavelength=1.5, modifiers=None), index), [keys[14]])
+        index.clear()
+        self.assertEqual(filter_keys_by_dataset_id(DatasetID(name='C05', modifiers=None), index), [])
+
 
 class TestReaderLoader(unittest.TestCase):
     """Test the `load_readers` function.
@@ -547,8 +601,10 @@ class TestFindFilesAndReaders(unittest.TestCase):
     def test_reader_load_failed(self):
         """Test that an exception is raised when a reader can't be loaded."""
         from satpy.readers import find_files_and_readers
+        from satpy.config import config_cache
         import yaml
-        # touch the file so it exists on disk
+        # make sure the config is parsed again
+        config_cache.clear()
         with mock.patch('yaml.load') as load:
             load.side_effect = yaml.YAMLError("Import problems")
             self.assertRaises(yaml.YAMLError, find_files_and_readers, reader='viirs_sdr')
@@ -657,8 +713,10 @@ class TestGroupFiles(unittest.TestCase):
     def test_bad_reader(self):
         """Test that reader not existing causes an error."""
         from satpy.readers import group_files
+        from satpy.config import config_cache
         import yaml
-        # touch the file so it exists on disk
+        # make sure the config is parsed again
+        config_cache.clear()
         with mock.patch('yaml.load') as load:
             load.side_effect = yaml.YAMLError("Import problems")
             self.assertRaises(yaml.YAMLError, group_files, [], reader='abi_l1b')
@@ -127,10 +127,58 @@ class TestHLResample(unittest.TestCase):
         self.assertEqual(res.dtype, data.dtype)
         self.assertTrue(np.all(res.values == expected_filled))
 
+    def test_resample_datasets(self):
+        """Test resampling several datasets sharing the source area."""
+        from satpy.resample import resample_dataset, resample_datasets
+        import xarray as xr
+        import dask.array as da
+        import numpy as np
+        data, source_area, _, _, target_area = get_test_data(input_shape=(10, 5), output_shape=(20, 10))
+        datasets = []
+        for idx, dtype in enumerate((np.float32, np.float32, np.uint8)):
+            arr = da.arange(50, chunks=10).reshape((10, 5)).astype(dtype) + idx
+            datasets.append(xr.DataArray(arr, dims=('y', 'x'),
+                                         attrs={'name': 'ds%d' % idx, 'area': source_area, '_FillValue': 255}))
+        results = resample_datasets(datasets, target_area)
+        self.assertEqual(len(results), 3)
+        for dataset, res in zip(datasets, results):
+            expected = resample_dataset(dataset, target_area)
+            self.assertEqual(res.dtype, dataset.dtype)
+            self.assertEqual(res.attrs['name'], dataset.attrs['name'])
+            self.assertIs(res.attrs['area'], target_area)
+            self.assertIn('x', res.coords)
+            np.testing.assert_array_equal(res.values, expected.values)
+
+    def test_float32(self):
+        """Test that the resampled data is cast down to 32-bit floats."""
+        from satpy.resample import resample_dataset
+        from satpy.utils import set_precision
+        import xarray as xr
+        import dask.array as da
+        import numpy as np
+        data, source_area, _, _, target_area = get_test_data(input_shape=(10, 5), output_shape=(20, 10))
+        arr = da.arange(50, chunks=10).reshape((10, 5)).astype(np.float64)
+        for dtype, expected in ((np.float64, np.float32), (np.int16, np.int16)):
+            dataset = xr.DataArray(arr.astype(dtype), dims=('y', 'x'), attrs={'name': 'ds', 'area': source_area})
+            res = resample_dataset(dataset, target_area)
+            self.assertEqual(res.dtype, expected)
+            self.assertEqual(res.compute().dtype, expected)
+        dataset = xr.DataArray(arr, dims=('y', 'x'), attrs={'name': 'ds', 'area': source_area})
+        try:
+            set_precision('float64')
+            self.assertEqual(resample_dataset(dataset, target_area).dtype, np.float64)
+        finally:
+            set_precision('float32')
+
 
 class TestKDTreeResampler(unittest.TestCase):
     """Test the kd-tree resampler."""
 
+    def setUp(self):
+        """Clear the shared neighbour info cache."""
+        from satpy.resample import nn_cache
+        nn_cache.clear()
+
     @mock.patch('satpy.resample.KDTreeResampler._check_numpy_cache')
     @mock.patch('satpy.resample.xr.Dataset')
     @mock.patch('satpy.resample.zarr.open')
@@ -141,23 +189,32 @@ class TestKDTreeResampler(unittest.TestCase):
         """Test the kd resampler."""
         import numpy as np
         import dask.array as da
-        from satpy.resample import KDTreeResampler
+        from satpy.resample import KDTreeResampler, nn_cache
         data, source_area, swath_data, source_swath, target_area = get_test_data()
         mock_dset = mock.MagicMock()
         xr_dset.return_value = mock_dset
         resampler = KDTreeResampler(source_swath, target_area)
+        zarr_open.side_effect = ValueError()
         resampler.precompute(
             mask=da.arange(5, chunks=5).astype(np.bool), cache_dir='.')
         xr_resampler.assert_called_once()
         resampler.resampler.get_neighbour_info.assert_called()
-        # swath definitions should not be cached
-        self.assertFalse(len(mock_dset.to_zarr.mock_calls), 0)
+        # masked swath definitions are cached with their mask
+        self.assertEqual(len(mock_dset.to_zarr.mock_calls), 1)
+        mask_arr = mock_dset.__setitem__.call_args_list[-1][0]
+        self.assertEqual(mask_arr[0], 'mask')
         resampler.resampler.reset_mock()
         cnc.assert_called_once()
+        mock_dset.reset_mock()
+        zarr_open.reset_mock()
+        zarr_open.side_effect = None
 
         resampler = KDTreeResampler(source_area, target_area)
         resampler.precompute()
         resampler.resampler.get_neighbour_info.assert_called_with(mask=None)
+        # both the swath and the area neighbour info are cached in-memory
+        self.assertEqual(len(nn_cache), 2)
+        nn_cache.clear()
 
         try:
             the_dir = tempfile.mkdtemp()
@@ -198,10 +255,18 @@ class TestKDTreeResampler(unittest.TestCase):
             self.assertEqual(len(resampler._index_caches), 1)
             self.assertEqual(len(resampler.resampler.get_neighbour_info.mock_calls), nbcalls)
 
+            # test reusing the shared in-memory cache from another resampler
+            resampler = KDTreeResampler(source_area, target_area)
+            resampler.precompute(cache_dir=the_dir)
+            self.assertEqual(len(zarr_open.mock_calls), 1)
+            self.assertEqual(len(resampler.resampler.get_neighbour_info.mock_calls), nbcalls)
+
             # test loading saved resampler
+            nn_cache.clear()
             resampler = KDTreeResampler(source_area, target_area)
             resampler.precompute(cache_dir=the_dir)
-            self.assertEqual(len(zarr_open.mock_calls), 4)
+            # the cache file is opened once for all the index arrays
+            self.assertEqual(len(zarr_open.mock_calls), 2)
             self.assertEqual(len(resampler.resampler.get_neighbour_info.mock_calls), nbcalls)
             # we should have cached things in-memory now
             self.assertEqual(len(resampler._index_caches), 1)
@@ -212,6 +277,189 @@ class TestKDTreeResampler(unittest.TestCase):
         resampler.compute(data, fill_value=fill_value)
         resampler.resampler.get_sample_from_neighbour_info.assert_called_with(data, fill_value)
 
+    def test_resample_batch(self):
+        """Test that datasets sharing the neighbour info are gathered together."""
+        import numpy as np
+        import xarray as xr
+        from satpy.resample import KDTreeResampler
+        data, source_area, swath_data, source_swath, target_area = get_test_data(
+            input_shape=(10, 5), output_shape=(20, 10))
+        data1 = xr.DataArray(np.arange(50.).reshape((10, 5)), dims=('y', 'x')).chunk(5)
+        data2 = data1.rename('data2')
+        data3 = data1.where(data1 > 10)
+        resampler = KDTreeResampler(source_area, target_area)
+        with mock.patch.object(resampler, 'compute', wraps=resampler.compute) as compute, \
+                mock.patch('satpy.resample.compute_mask') as compute_mask:
+            results = resampler.resample_batch([data1, data2, data3], [np.nan] * 3, mask_area=True)
+        # the two first datasets have the same lazy mask and are resampled in one pass
+        self.assertEqual(compute.call_count, 1)
+        compute_mask.assert_not_called()
+        self.assertEqual(len(resampler._index_caches), 2)
+        for data, res in zip((data1, data2, data3), results):
+            expected = KDTreeResampler(source_area, target_area).resample(data, mask_area=True)
+            self.assertTupleEqual(res.dims, ('y', 'x'))
+            np.testing.assert_array_equal(res.values, expected.values)
+
+        # without mask all the datasets share the neighbour info
+        resampler = KDTreeResampler(source_area, target_area)
+        with mock.patch.object(resampler, 'compute', wraps=resampler.compute) as compute:
+            resampler.resample_batch([data1, data1 + 100, data3], [np.nan] * 3, mask_area=False)
+        compute.assert_not_called()
+        self.assertEqual(len(resampler._index_caches), 1)
+
+    def test_resample_batch_swath(self):
+        """Test that swath datasets are gathered together only without mask."""
+        import numpy as np
+        import xarray as xr
+        from satpy.resample import KDTreeResampler
+        data, source_area, swath_data, source_swath, target_area = get_test_data(
+            input_shape=(10, 5), output_shape=(20, 10))
+        data1 = xr.DataArray(np.arange(50.).reshape((10, 5)), dims=('y', 'x')).chunk(5)
+        data2 = xr.DataArray(np.arange(50.).reshape((10, 5)) + 100, dims=('y', 'x')).chunk(5)
+        # by default each band has its own invalid pixel mask
+        resampler = KDTreeResampler(source_swath, target_area)
+        with mock.patch.object(resampler, 'compute', wraps=resampler.compute) as compute:
+            resampler.resample_batch([data1, data2], [np.nan] * 2)
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(len(resampler._index_caches), 2)
+
+        resampler = KDTreeResampler(source_swath, target_area)
+        with mock.patch.object(resampler, 'compute', wraps=resampler.compute) as compute:
+            results = resampler.resample_batch([data1, data2], [np.nan] * 2, mask_area=False)
+        compute.assert_not_called()
+        self.assertEqual(len(resampler._index_caches), 1)
+        for data, res in zip((data1, data2), results):
+            expected = KDTreeResampler(source_swath, target_area).resample(data, mask_area=False)
+            np.testing.assert_array_equal(res.values, expected.values)
+
+    def test_masked_cache_roundtrip(self):
+        """Test that masked neighbour info is cached in memory and on disk."""
+        import numpy as np
+        import xarray as xr
+        from satpy.resample import KDTreeResampler, nn_cache
+        data, source_area, swath_data, source_swath, target_area = get_test_data(
+            input_shape=(10, 5), output_shape=(20, 10))
+        mask = xr.DataArray(np.zeros(source_area.shape, dtype=bool), dims=('y', 'x')).chunk(5)
+        other_mask = mask.copy(data=np.ones(source_area.shape, dtype=bool)).chunk(5)
+        the_dir = tempfile.mkdtemp()
+        try:
+            resampler = KDTreeResampler(source_area, target_area)
+            resampler.precompute(mask=mask, cache_dir=the_dir)
+            self.assertEqual(len(nn_cache), 1)
+            self.assertEqual(len(os.listdir(the_dir)), 1)
+
+            # a new resampler uses the shared in-memory cache
+            resampler = KDTreeResampler(source_area, target_area)
+            with mock.patch('satpy.resample.zarr.open') as zarr_open:
+                resampler.precompute(mask=mask, cache_dir=the_dir)
+            zarr_open.assert_not_called()
+            self.assertIsNone(resampler.resampler.delayed_kdtree)
+
+            # the disk cache is used when the in-memory cache is empty
+            nn_cache.clear()
+            resampler = KDTreeResampler(source_area, target_area)
+            with mock.patch.object(resampler, 'save_neighbour_info') as save:
+                resampler.precompute(mask=mask, cache_dir=the_dir)
+            save.assert_not_called()
+
+            # a different mask gives different neighbour info
+            resampler.precompute(mask=other_mask, cache_dir=the_dir)
+            self.assertEqual(len(nn_cache), 2)
+            self.assertEqual(len(os.listdir(the_dir)), 2)
+        finally:
+            shutil.rmtree(the_dir)
+
+    def test_lazy_mask(self):
+        """Test that dask masks aren't computed without on-disk cache."""
+        import numpy as np
+        import xarray as xr
+        from satpy.resample import KDTreeResampler, nn_cache, get_mask_fingerprint
+        data, source_area, swath_data, source_swath, target_area = get_test_data(
+            input_shape=(10, 5), output_shape=(20, 10))
+        mask = xr.DataArray(np.zeros(source_area.shape, dtype=bool), dims=('y', 'x')).chunk(5)
+        self.assertEqual(get_mask_fingerprint(mask, compute=False), get_mask_fingerprint(mask.copy(), compute=False))
+        self.assertNotEqual(get_mask_fingerprint(mask, compute=False), get_mask_fingerprint(~mask, compute=False))
+        resampler = KDTreeResampler(source_area, target_area)
+        with mock.patch('satpy.resample.compute_mask') as compute_mask, \
+                mock.patch('satpy.resample.np.packbits') as packbits:
+            resampler.precompute(mask=mask)
+            resampler.precompute(mask=mask)
+        compute_mask.assert_not_called()
+        packbits.assert_not_called()
+        # the lazy neighbour info is only kept by the resampler
+        self.assertEqual(len(resampler._index_caches), 1)
+        self.assertEqual(len(nn_cache), 0)
+
+        # computed masks are shared by their contents
+        from satpy.resample import compute_mask
+        resampler.precompute(mask=compute_mask(mask))
+        self.assertEqual(len(nn_cache), 1)
+        resampler = KDTreeResampler(source_area, target_area)
+        with mock.patch.object(resampler, 'save_neighbour_info') as save:
+            resampler.precompute(mask=compute_mask(mask.copy()))
+        save.assert_not_called()
+
+    def test_lazy_source_data(self):
+        """Test that no source chunk is computed before the masked data is resampled."""
+        import numpy as np
+        import xarray as xr
+        import dask.array as da
+        from pyresample.geometry import SwathDefinition
+        from satpy.resample import resample_dataset
+        data, source_area, swath_data, source_swath, target_area = get_test_data(
+            input_shape=(14, 5), output_shape=(20, 10))
+        lons, lats = source_area.get_lonlats()
+        swath = SwathDefinition(xr.DataArray(da.from_array(lons, chunks=2), dims=('y', 'x')),
+                                xr.DataArray(da.from_array(lats, chunks=2), dims=('y', 'x')))
+        computed = []
+
+        def _count(block):
+            computed.append(block.shape)
+            return block
+
+        arr = da.from_array(np.arange(70.).reshape((14, 5)), chunks=(2, 5))
+        arr = arr.map_blocks(_count, meta=np.array((), dtype=np.float64))
+        dataset = xr.DataArray(arr, dims=('y', 'x'), attrs={'name': 'ds', 'area': swath})
+        res = resample_dataset(dataset, target_area, resampler='nearest')
+        self.assertEqual(computed, [])
+        res.compute()
+        self.assertLessEqual(len(computed), 2 * 7)
+
+    def test_npy_cache(self):
+        """Test that the npy cache is memory mapped when loaded."""
+        import numpy as np
+        import dask.array as da
+        from satpy.resample import KDTreeResampler, nn_cache, NN_COORDINATES
+        data, source_area, swath_data, source_swath, target_area = get_test_data(
+            input_shape=(10, 5), output_shape=(20, 10))
+        the_dir = tempfile.mkdtemp()
+        try:
+            resampler = KDTreeResampler(source_area, target_area)
+            resampler.precompute(cache_dir=the_dir, cache_format='npy')
+            expected = {idx_name: np.asarray(getattr(resampler.resampler, idx_name))
+                        for idx_name in NN_COORDINATES}
+            cache_files = os.listdir(the_dir)
+            self.assertEqual(len(cache_files), 1)
+            self.assertTrue(cache_files[0].endswith('.npy'))
+
+            nn_cache.clear()
+            resampler = KDTreeResampler(source_area, target_area)
+            with mock.patch.object(resampler, 'save_neighbour_info') as save, \
+                    mock.patch('satpy.resample.np.load', wraps=np.load) as np_load:
+                resampler.precompute(cache_dir=the_dir)
+            save.assert_not_called()
+            self.assertEqual(len(np_load.mock_calls), len(NN_COORDINATES))
+            for call in np_load.mock_calls:
+                self.assertEqual(call[2]['mmap_mode'], 'r')
+            for idx_name, expected_arr in expected.items():
+                arr = getattr(resampler.resampler, idx_name)
+                self.assertIsInstance(arr, da.Array)
+                np.testing.assert_array_equal(arr.compute(), expected_arr)
+            res = resampler.compute(data.chunk(5), fill_value=np.nan)
+            self.assertEqual(res.shape, target_area.shape)
+        finally:
+            shutil.rmtree(the_dir)
+
     @mock.patch('satpy.resample.np.load')
     @mock.patch('satpy.resample.xr.Dataset')
     def test_check_numpy_cache(self, xr_Dataset, np_load):
@@ -252,6 +500,11 @@ class TestKDTreeResampler(unittest.TestCase):
 class TestEWAResampler(unittest.TestCase):
     """Test EWA resampler class."""
 
+    def setUp(self):
+        """Clear the shared ll2cr cache."""
+        from satpy.resample import ll2cr_cache
+        ll2cr_cache.clear()
+
     @mock.patch('satpy.resample.fornav')
     @mock.patch('satpy.resample.ll2cr')
     @mock.patch('satpy.resample.SwathDefinition.get_lonlats')
@@ -356,6 +609,53 @@ class TestEWAResampler(unittest.TestCase):
             if hasattr(target_area, 'crs'):
                 self.assertIs(target_area.crs, new_data.coords['crs'].item())
 
+    @mock.patch('satpy.resample.fornav')
+    @mock.patch('satpy.resample.ll2cr')
+    def test_ewa_disk_cache(self, ll2cr, fornav):
+        """Test that ll2cr results are cached on disk."""
+        import numpy as np
+        from satpy.resample import EWAResampler, ll2cr_cache
+        ll2cr.side_effect = lambda src, tgt: (100,
+                                              np.ones(src.shape, dtype=np.float32),
+                                              np.zeros(src.shape, dtype=np.float32))
+        _, _, swath_data, source_swath, target_area = get_test_data()
+        the_dir = tempfile.mkdtemp()
+        try:
+            resampler = EWAResampler(source_swath, target_area)
+            resampler.precompute()
+            # without disk cache the results stay lazy
+            ll2cr.assert_not_called()
+            # and are shared with the other resamplers of the same swath
+            other = EWAResampler(source_swath, target_area)
+            other.precompute()
+            self.assertIs(other.cache, resampler.cache)
+            ll2cr_cache.clear()
+
+            resampler = EWAResampler(source_swath, target_area)
+            resampler.precompute(cache_dir=the_dir)
+            num_calls = ll2cr.call_count
+            cache_files = os.listdir(the_dir)
+            self.assertEqual(len(cache_files), 1)
+            self.assertTrue(cache_files[0].startswith('ll2cr-'))
+
+            ll2cr_cache.clear()
+            resampler = EWAResampler(source_swath, target_area)
+            resampler.precompute(cache_dir=the_dir)
+            self.assertEqual(ll2cr.call_count, num_calls)
+            np.testing.assert_array_equal(resampler.cache['cols'].compute(),
+                                          np.ones(source_swath.shape))
+            np.testing.assert_array_equal(resampler.cache['rows'].compute(),
+                                          np.zeros(source_swath.shape))
+            self.assertEqual(len(ll2cr_cache), 1)
+            self.assertEqual(ll2cr.call_count, num_calls)
+
+            # the swath usage is part of the cache key
+            EWAResampler(source_swath, target_area).precompute(cache_dir=the_dir, swath_usage=0.5)
+            self.assertEqual(len(ll2cr_cache), 2)
+            self.assertEqual(len(os.listdir(the_dir)), 2)
+        finally:
+            shutil.rmtree(the_dir)
+
 
 class TestNativeResampler(unittest.TestCase):
     """Tests for the 'native' resampling method."""
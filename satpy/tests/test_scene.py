@@ -1053,6 +1053,36 @@ class TestSceneLoading(unittest.TestCase):
         self.assertTupleEqual(
             tuple(loaded_ids[0]), tuple(DatasetID(name='comp4')))
 
+    @mock.patch('satpy.composites.CompositorLoader.load_compositors')
+    @mock.patch('satpy.scene.Scene.create_reader_instances')
+    def test_load_cached_plan(self, cri, cl):
+        """Test that a second scene reuses the dependency tree of the first one."""
+        import satpy.scene
+        from satpy.node import DependencyTree, plan_cache
+        from satpy.tests.utils import FakeReader, test_composites
+        plan_cache.clear()
+        cri.return_value = {'fake_reader': FakeReader(
+            'fake_reader', 'fake_sensor')}
+        comps, mods = test_composites('fake_sensor')
+        cl.return_value = (comps, mods)
+        scene = satpy.scene.Scene(filenames=['bla'],
+                                  base_dir='bli',
+                                  reader='fake_reader')
+        scene.load(['comp4', 'ds1'])
+        self.assertEqual(len(plan_cache), 1)
+
+        scene2 = satpy.scene.Scene(filenames=['bla'],
+                                   base_dir='bli',
+                                   reader='fake_reader')
+        with mock.patch.object(DependencyTree, '_find_dependencies') as find_deps:
+            scene2.load(['comp4', 'ds1'])
+        find_deps.assert_not_called()
+        self.assertListEqual(list(scene2.datasets.keys()), list(scene.datasets.keys()))
+        self.assertSetEqual(scene2.wishlist, scene.wishlist)
+        self.assertIsNot(scene2.dep_tree['comp2'], scene.dep_tree['comp2'])
+        self.assertIs(scene2.dep_tree['comp4'].data[1][0], scene2.dep_tree['comp2'])
+        self.assertIs(scene2.dep_tree['comp2'].data[0], scene.dep_tree['comp2'].data[0])
+
     @mock.patch('satpy.composites.CompositorLoader.load_compositors')
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_load_multiple_resolutions(self, cri, cl):
@@ -1874,11 +1904,11 @@ class TestSceneLoading(unittest.TestCase):
 class TestSceneResampling(unittest.TestCase):
     """Test resampling a Scene to another Scene object."""
 
-    def _fake_resample_dataset(self, dataset, dest_area, **kwargs):
-        """Return copy of dataset pretending it was resampled."""
-        return dataset.copy()
+    def _fake_resample_datasets(self, datasets, dest_area, **kwargs):
+        """Return copies of datasets pretending they were resampled."""
+        return [dataset.copy() for dataset in datasets]
 
-    @mock.patch('satpy.scene.resample_dataset')
+    @mock.patch('satpy.scene.resample_datasets')
     @mock.patch('satpy.composites.CompositorLoader.load_compositors')
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_resample_scene_copy(self, cri, cl, rs):
@@ -1897,7 +1927,7 @@ class TestSceneResampling(unittest.TestCase):
             'fake_reader', 'fake_sensor')}
         comps, mods = test_composites('fake_sensor')
         cl.return_value = (comps, mods)
-        rs.side_effect = self._fake_resample_dataset
+        rs.side_effect = self._fake_resample_datasets
 
         proj_dict = proj4_str_to_dict('+proj=lcc +datum=WGS84 +ellps=WGS84 '
                                       '+lon_0=-95. +lat_0=25 +lat_1=25 '
@@ -1933,7 +1963,7 @@ class TestSceneResampling(unittest.TestCase):
         self.assertTupleEqual(tuple(loaded_ids[0]), tuple(DatasetID(name='comp19')))
         self.assertTupleEqual(tuple(loaded_ids[1]), tuple(DatasetID(name='new_ds')))
 
-    @mock.patch('satpy.scene.resample_dataset')
+    @mock.patch('satpy.scene.resample_datasets')
     @mock.patch('satpy.composites.CompositorLoader.load_compositors')
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_resample_reduce_data_toggle(self, cri, cl, rs):
@@ -1949,7 +1979,7 @@ class TestSceneResampling(unittest.TestCase):
             'fake_reader', 'fake_sensor')}
         comps, mods = test_composites('fake_sensor')
         cl.return_value = (comps, mods)
-        rs.side_effect = self._fake_resample_dataset
+        rs.side_effect = self._fake_resample_datasets
 
         proj_dict = proj4_str_to_dict('+proj=lcc +datum=WGS84 +ellps=WGS84 '
                                       '+lon_0=-95. +lat_0=25 +lat_1=25 '
@@ -2063,7 +2093,7 @@ class TestSceneResampling(unittest.TestCase):
         self.assertTupleEqual(new_scene2['comp19'].shape, (2, 2, 3))
         self.assertTupleEqual(new_scene3['comp19'].shape, (2, 2, 3))
 
-    @mock.patch('satpy.scene.resample_dataset')
+    @mock.patch('satpy.scene.resample_datasets')
     @mock.patch('satpy.composites.CompositorLoader.load_compositors')
     @mock.patch('satpy.scene.Scene.create_reader_instances')
     def test_no_generate_comp10(self, cri, cl, rs):
@@ -2076,7 +2106,7 @@ class TestSceneResampling(unittest.TestCase):
             'fake_reader', 'fake_sensor')}
         comps, mods = test_composites('fake_sensor')
         cl.return_value = (comps, mods)
-        rs.side_effect = self._fake_resample_dataset
+        rs.side_effect = self._fake_resample_datasets
 
         proj_dict = proj4_str_to_dict('+proj=lcc +datum=WGS84 +ellps=WGS84 '
                                       '+lon_0=-95. +lat_0=25 +lat_1=25 '
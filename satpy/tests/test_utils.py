@@ -17,6 +17,7 @@
 # satpy.  If not, see <http://www.gnu.org/licenses/>.
 """Testing of utils."""
 
+import os
 import unittest
 from unittest import mock
 from numpy import sqrt
@@ -248,3 +249,151 @@ class TestUtils(unittest.TestCase):
         dataset.attrs.pop('orbital_parameters')
         lon, lat, alt = get_satpos(dataset)
         self.assertTupleEqual((lon, lat, alt), (-1, -2, -3))
+
+
+class TestSizedLRUCache(unittest.TestCase):
+    """Test the size-bounded LRU cache."""
+
+    def test_eviction(self):
+        """Test that the least recently used items are dropped."""
+        import numpy as np
+        from satpy.utils import SizedLRUCache
+        cache = SizedLRUCache(250)
+        cache['a'] = np.zeros(100, dtype=np.uint8)
+        cache['b'] = {'x': np.zeros(50, dtype=np.uint8), 'y': np.zeros(50, dtype=np.uint8)}
+        self.assertEqual(cache.nbytes, 200)
+        # use 'a' so 'b' becomes the least recently used
+        cache['a']
+        cache['c'] = np.zeros(100, dtype=np.uint8)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(cache.nbytes, 200)
+        self.assertIsNone(cache.get('b'))
+
+    def test_too_big(self):
+        """Test that items bigger than the cache are not stored."""
+        import numpy as np
+        from satpy.utils import SizedLRUCache
+        cache = SizedLRUCache(10)
+        cache['a'] = np.zeros(100, dtype=np.uint8)
+        self.assertEqual(len(cache), 0)
+        cache['b'] = np.zeros(10, dtype=np.uint8)
+        self.assertEqual(len(cache), 1)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.nbytes, 0)
+
+    def test_sizeof(self):
+        """Test bounding the cache by the number of items."""
+        import numpy as np
+        from satpy.utils import SizedLRUCache
+        cache = SizedLRUCache(2, sizeof=lambda val: 1)
+        cache['a'] = np.zeros(100, dtype=np.uint8)
+        cache['b'] = np.zeros(100, dtype=np.uint8)
+        cache['c'] = np.zeros(100, dtype=np.uint8)
+        self.assertEqual(len(cache), 2)
+        self.assertNotIn('a', cache)
+
+
+class TestGetAreaLonlats(unittest.TestCase):
+    """Test the lon/lat cache."""
+
+    def setUp(self):
+        """Create a test area."""
+        from pyresample.geometry import AreaDefinition
+        from satpy.utils import lonlat_cache
+        lonlat_cache.clear()
+        self.area = AreaDefinition('test', 'test', 'test',
+                                   {'proj': 'geos', 'h': 35785831, 'lon_0': 0},
+                                   4, 4, (-2000000, -2000000, 2000000, 2000000))
+
+    def test_lazy(self):
+        """Test that the lon/lats are not computed without cache directory."""
+        import dask
+        import numpy as np
+        from satpy.utils import get_area_lonlats, lonlat_cache
+        with dask.config.set(scheduler='raise'):
+            lons, lats = get_area_lonlats(self.area, chunks=2)
+        # the graphs of all the callers share the same keys
+        self.assertEqual(lons.name, get_area_lonlats(self.area, chunks=2)[0].name)
+        self.assertEqual(get_area_lonlats(self.area, chunks=1)[0].chunks, ((1,) * 4,) * 2)
+        np_lons, np_lats = get_area_lonlats(self.area)
+        self.assertIsInstance(np_lons, np.ndarray)
+        np.testing.assert_array_equal(lons, np_lons)
+        self.assertEqual(len(lonlat_cache), 0)
+
+    def test_disk_cache(self):
+        """Test that the lon/lats are saved to disk and memory mapped."""
+        import shutil
+        import tempfile
+        import numpy as np
+        from satpy.utils import get_area_lonlats, lonlat_cache
+        expected = self.area.get_lonlats()
+        cache_dir = tempfile.mkdtemp()
+        try:
+            with mock.patch('satpy.utils.LONLAT_CACHE_DIR', cache_dir):
+                lons, lats = get_area_lonlats(self.area, chunks=2)
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                self.assertEqual(lons.chunks, ((2, 2), (2, 2)))
+                np.testing.assert_allclose(lons, expected[0])
+                lonlat_cache.clear()
+                with mock.patch.object(self.area, 'get_lonlats') as get_lonlats:
+                    lons, lats = get_area_lonlats(self.area)
+                get_lonlats.assert_not_called()
+                self.assertIsInstance(lons, np.memmap)
+                np.testing.assert_allclose(lats, expected[1])
+                # the memory maps are kept open up to the size of the cache
+                self.assertEqual(lonlat_cache.nbytes, lons.nbytes + lats.nbytes)
+                lonlat_cache.clear()
+                with mock.patch('satpy.utils.LONLAT_CACHE_BYTES', lons.nbytes), \
+                        mock.patch.object(self.area, 'get_lonlats') as get_lonlats:
+                    get_area_lonlats(self.area, chunks=2)
+                get_lonlats.assert_called_once_with(chunks=2)
+                self.assertEqual(len(lonlat_cache), 0)
+        finally:
+            shutil.rmtree(cache_dir)
+
+
+class TestPrecision(unittest.TestCase):
+    """Test the floating point precision policy."""
+
+    def tearDown(self):
+        """Restore the default precision."""
+        from satpy.utils import set_precision
+        set_precision('float32')
+
+    def test_apply_precision(self):
+        """Test casting the data to the precision."""
+        import numpy as np
+        import xarray as xr
+        import dask.array as da
+        from satpy.utils import apply_precision, get_precision, set_precision
+        self.assertEqual(get_precision(), 'float32')
+        data = xr.DataArray(da.zeros((2, 2), dtype=np.float64), dims=('y', 'x'), attrs={'name': 'a'})
+        res = apply_precision(data)
+        self.assertEqual(res.dtype, np.float32)
+        self.assertEqual(res.attrs, {'name': 'a'})
+        self.assertEqual(apply_precision(np.zeros(2)).dtype, np.float32)
+        for dtype in (np.uint16, np.float16, np.float32, np.complex128):
+            arr = np.zeros(2, dtype=dtype)
+            self.assertIs(apply_precision(arr), arr)
+
+        set_precision('float64')
+        self.assertIs(apply_precision(data), data)
+        self.assertRaises(ValueError, set_precision, 'float128')
+
+    def test_match_float_dtype(self):
+        """Test that the 64-bit factors don't upcast 32-bit data."""
+        import numpy as np
+        import xarray as xr
+        import dask.array as da
+        from satpy.utils import match_float_dtype, sunzen_corr_cos, atmospheric_path_length_correction
+        data = xr.DataArray(da.ones((2, 2), dtype=np.float32), dims=('y', 'x'))
+        factor = xr.DataArray(da.full((2, 2), 0.5), dims=('y', 'x'))
+        self.assertEqual(match_float_dtype(factor, data).dtype, np.float32)
+        self.assertEqual(match_float_dtype(factor, data.astype(np.uint16)).dtype, np.float64)
+        self.assertEqual(match_float_dtype(2., data), 2.)
+        for func in (sunzen_corr_cos, atmospheric_path_length_correction):
+            self.assertEqual(func(data, factor).dtype, np.float32)
+            self.assertEqual(func(data.astype(np.float64), factor).dtype, np.float64)
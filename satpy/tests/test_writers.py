@@ -24,7 +24,9 @@ import warnings
 
 import numpy as np
 import xarray as xr
+from PIL import Image
 from trollimage.colormap import greys
+from trollimage.xrimage import XRImage
 from unittest import mock
 
 
@@ -556,7 +558,7 @@ class TestOverlays(unittest.TestCase):
                      'units': 'm', 'no_defs': True}
         self.area_def = AreaDefinition(
             'test', 'test', 'test', proj_dict,
-            200, 400, (-1000., -1500., 1000., 1500.),
+            5, 5, (-1000., -1500., 1000., 1500.),
         )
         self.orig_rgb_img = XRImage(
             xr.DataArray(da.arange(75., chunks=10).reshape(3, 5, 5) / 75.,
@@ -599,58 +601,103 @@ class TestOverlays(unittest.TestCase):
                    'pydecorate': import_mock.pydecorate}
         self.module_patcher = mock.patch.dict('sys.modules', modules)
         self.module_patcher.start()
+        # opaque red first row and half transparent blue second row
+        layer = np.zeros((5, 5, 4), dtype=np.uint8)
+        layer[0] = (255, 0, 0, 255)
+        layer[1] = (0, 0, 255, 128)
+        self.add_overlay_from_dict = import_mock.pycoast.ContourWriterAGG.return_value.add_overlay_from_dict
+        self.add_overlay_from_dict.return_value = Image.fromarray(layer, 'RGBA')
 
     def tearDown(self):
         """Turn off pycoast/pydecorate mocking."""
+        from satpy.writers import overlay_cache
         self.module_patcher.stop()
+        overlay_cache.clear()
 
     def test_add_overlay_basic_rgb(self):
         """Test basic add_overlay usage with RGB data."""
-        from satpy.writers import add_overlay, _burn_overlay
+        from satpy.writers import add_overlay
         from pycoast import ContourWriterAGG
         coast_dir = '/path/to/coast/data'
-        with mock.patch.object(self.orig_rgb_img, "apply_pil") as apply_pil:
-            apply_pil.return_value = self.orig_rgb_img
-            new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir, fill_value=0)
-            self.assertEqual(self.orig_rgb_img.mode, new_img.mode)
-            new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir)
-            self.assertEqual(self.orig_rgb_img.mode + 'A', new_img.mode)
-
-            with mock.patch.object(self.orig_rgb_img, "convert") as convert:
-                convert.return_value = self.orig_rgb_img
-                overlays = {'coasts': {'outline': 'red'}}
-                new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir,
-                                      overlays=overlays, fill_value=0)
-                pil_args = None
-                pil_kwargs = {'fill_value': 0}
-                fun_args = (self.orig_rgb_img.data.area, ContourWriterAGG.return_value, overlays)
-                fun_kwargs = None
-                apply_pil.assert_called_with(_burn_overlay, self.orig_rgb_img.mode,
-                                             pil_args, pil_kwargs, fun_args, fun_kwargs)
-                ContourWriterAGG.assert_called_with(coast_dir)
-
-                # test legacy call
-
-                grid = {'minor_is_tick': True}
-                color = 'red'
-                expected_overlays = {'coasts': {'outline': color, 'width': 0.5, 'level': 1},
-                                     'borders': {'outline': color, 'width': 0.5, 'level': 1},
-                                     'grid': grid}
-                with warnings.catch_warnings(record=True) as wns:
-                    warnings.simplefilter("always")
-                    new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir,
-                                          color=color, grid=grid, fill_value=0)
-                    assert len(wns) == 1
-                    assert issubclass(wns[0].category, DeprecationWarning)
-                    assert "deprecated" in str(wns[0].message)
-
-                pil_args = None
-                pil_kwargs = {'fill_value': 0}
-                fun_args = (self.orig_rgb_img.data.area, ContourWriterAGG.return_value, expected_overlays)
-                fun_kwargs = None
-                apply_pil.assert_called_with(_burn_overlay, self.orig_rgb_img.mode,
-                                             pil_args, pil_kwargs, fun_args, fun_kwargs)
-                ContourWriterAGG.assert_called_with(coast_dir)
+        new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir, fill_value=0)
+        self.assertEqual(self.orig_rgb_img.mode, new_img.mode)
+        new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir)
+        self.assertEqual(self.orig_rgb_img.mode + 'A', new_img.mode)
+
+        overlays = {'coasts': {'outline': 'red'}}
+        new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir,
+                              overlays=overlays, fill_value=0)
+        ContourWriterAGG.assert_called_with(coast_dir)
+        self.add_overlay_from_dict.assert_called_with(overlays, self.area_def)
+
+        # test legacy call
+        grid = {'minor_is_tick': True}
+        color = 'red'
+        expected_overlays = {'coasts': {'outline': color, 'width': 0.5, 'level': 1},
+                             'borders': {'outline': color, 'width': 0.5, 'level': 1},
+                             'grid': grid}
+        with warnings.catch_warnings(record=True) as wns:
+            warnings.simplefilter("always")
+            new_img = add_overlay(self.orig_rgb_img, self.area_def, coast_dir,
+                                  color=color, grid=grid, fill_value=0)
+            assert len(wns) == 1
+            assert issubclass(wns[0].category, DeprecationWarning)
+            assert "deprecated" in str(wns[0].message)
+        self.add_overlay_from_dict.assert_called_with(expected_overlays, self.area_def)
+
+    def test_add_overlay_blending(self):
+        """Test blending the cached overlay layers over the images."""
+        from satpy.writers import add_overlay
+        overlays = {'coasts': {'outline': 'red'}}
+        new_img = add_overlay(self.orig_rgb_img, self.area_def, '', overlays=overlays, fill_value=0)
+        res = new_img.data.values
+        orig = self.orig_rgb_img.data.values
+        # opaque red line on the first row, half transparent blue on the second
+        np.testing.assert_allclose(res[:, 0, :], [[1.] * 5, [0.] * 5, [0.] * 5])
+        np.testing.assert_allclose(res[:, 1, :], orig[:, 1, :] * (1 - 128 / 255.) +
+                                   np.array([[0.], [0.], [128 / 255.]]), rtol=1e-6)
+        np.testing.assert_allclose(res[:, 2:, :], orig[:, 2:, :])
+        self.assertEqual(new_img.data.dtype, self.orig_rgb_img.data.dtype)
+
+        # the layer is rasterized once
+        add_overlay(self.orig_rgb_img, self.area_def, '', overlays=overlays, fill_value=0)
+        self.assertEqual(self.add_overlay_from_dict.call_count, 1)
+
+        # the alpha band is kept
+        data = self.orig_rgb_img.data.copy()
+        data[:, 2:, :] = np.nan
+        new_img = add_overlay(XRImage(data), self.area_def, '', overlays=overlays)
+        self.assertEqual(new_img.mode, 'RGBA')
+        alpha = new_img.data.sel(bands='A').values
+        np.testing.assert_allclose(alpha[:2], 1.)
+        np.testing.assert_allclose(alpha[2:], 0.)
+
+    def test_add_overlay_disk_cache(self):
+        """Test sharing the overlay layers through a cache directory."""
+        import tempfile
+        from satpy.writers import add_overlay, overlay_cache
+        overlays = {'coasts': {'outline': 'red'}}
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with mock.patch('satpy.writers.OVERLAY_CACHE_DIR', cache_dir):
+                expected = add_overlay(self.orig_rgb_img, self.area_def, '', overlays=overlays).data.values
+                self.assertEqual(len(os.listdir(cache_dir)), 1)
+                overlay_cache.clear()
+                res = add_overlay(self.orig_rgb_img, self.area_def, '', overlays=overlays).data.values
+        self.assertEqual(self.add_overlay_from_dict.call_count, 1)
+        np.testing.assert_allclose(res, expected)
+
+    def test_add_overlay_integer(self):
+        """Test that pycoast draws on integer images directly."""
+        from satpy.writers import add_overlay, _burn_overlay
+        from pycoast import ContourWriterAGG
+        img = XRImage(self.orig_rgb_img.data.astype(np.uint8))
+        overlays = {'coasts': {'outline': 'red'}}
+        with mock.patch.object(img, "apply_pil") as apply_pil, mock.patch.object(img, "convert") as convert:
+            apply_pil.return_value = img
+            convert.return_value = img
+            add_overlay(img, self.area_def, '', overlays=overlays, fill_value=0)
+            apply_pil.assert_called_with(_burn_overlay, img.mode, None, {'fill_value': 0},
+                                         (self.area_def, ContourWriterAGG.return_value, overlays), None)
 
     def test_add_overlay_basic_l(self):
         """Test basic add_overlay usage with L data."""
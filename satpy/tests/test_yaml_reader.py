@@ -150,7 +150,7 @@ class TestFileFileYAMLReaderMultiplePatterns(unittest.TestCase):
     """Test units from FileYAMLReader with multiple readers."""
 
     @patch('satpy.readers.yaml_reader.recursive_dict_update')
-    @patch('satpy.readers.yaml_reader.yaml', spec=yr.yaml)
+    @patch('satpy.readers.yaml_reader.read_yaml_file')
     def setUp(self, _, rec_up):  # pylint: disable=arguments-differ
         """Prepare a reader instance with a fake config."""
         patterns = ['a{something:3s}.bla',
@@ -208,12 +208,35 @@ class TestFileFileYAMLReaderMultiplePatterns(unittest.TestCase):
         self.reader.create_filehandlers(filelist)
         self.assertEqual(len(self.reader.file_handlers['ftype1']), 3)
 
+    def test_create_filehandlers_in_pool(self):
+        """Check create_filehandlers with a pool of workers."""
+        filelist = ['a001.bla', 'a002.bla', 'abcd.bla', 'k001.bla', 'a003.bli']
+        ft_info = self.config['file_types']['ftype1']
+        items = list(self.reader.filename_items_for_filetype(filelist, ft_info))
+        serial = [fh.filename for fh in self.reader._new_filehandler_instances(ft_info, items)]
+
+        self.reader.filehandler_workers = 3
+        with patch('satpy.readers.yaml_reader.ThreadPoolExecutor',
+                   wraps=yr.ThreadPoolExecutor) as tpe:
+            pooled = [fh.filename for fh in self.reader._new_filehandler_instances(ft_info, items)]
+        tpe.assert_called_once_with(max_workers=3)
+        self.assertListEqual(serial, pooled)
+        self.assertSetEqual(set(self.reader.filehandler_timings.keys()), set(serial))
+
+    def test_bad_filehandler_pool(self):
+        """Check that unknown pool types are refused."""
+        with patch('satpy.readers.yaml_reader.recursive_dict_update') as rec_up, \
+                patch('satpy.readers.yaml_reader.read_yaml_file'):
+            rec_up.return_value = self.config
+            self.assertRaises(ValueError, yr.FileYAMLReader, [__file__],
+                              filehandler_pool='gpu')
+
 
 class TestFileFileYAMLReader(unittest.TestCase):
     """Test units from FileYAMLReader."""
 
     @patch('satpy.readers.yaml_reader.recursive_dict_update')
-    @patch('satpy.readers.yaml_reader.yaml', spec=yr.yaml)
+    @patch('satpy.readers.yaml_reader.read_yaml_file')
     def setUp(self, _, rec_up):  # pylint: disable=arguments-differ
         """Prepare a reader instance with a fake config."""
         patterns = ['a{something:3s}.bla']
@@ -524,12 +547,74 @@ class TestFileFileYAMLReader(unittest.TestCase):
 
         self.assertIs(proj, xarray.concat.return_value)
 
+    def test_load_cropped_dataset(self):
+        """Check loading only the part of a dataset covering a bounding box."""
+        import numpy as np
+        import xarray as xr
+        from pyresample.geometry import AreaDefinition
+        area = AreaDefinition('test', 'test', 'test', {'proj': 'eqc', 'lon_0': 0}, 10, 8, (0, 0, 1000, 800))
+        fh = FakeFH(datetime(2000, 1, 1), datetime(2000, 1, 2))
+        fh.get_dataset.return_value = xr.DataArray(np.arange(80).reshape((8, 10)), dims=('y', 'x'))
+        fh.get_area_def = MagicMock(return_value=area)
+        fh.combine_info.return_value = {'name': 'ch01'}
+        self.reader.file_handlers = {'ftype1': [fh]}
+
+        res = self.reader.load(['ch01'], xy_bbox=(200, 300, 500, 600))['ch01']
+        y_slice, x_slice = area.get_area_slices(res.attrs['area'])
+        self.assertLess(res.shape[0], 8)
+        self.assertLess(res.shape[1], 10)
+        self.assertEqual(res.attrs['area'].shape, res.shape)
+        np.testing.assert_array_equal(res.values, np.arange(80).reshape((8, 10))[y_slice, x_slice])
+
+        with self.assertRaises(ValueError):
+            self.reader.load(['ch01'], area=area, xy_bbox=(200, 300, 500, 600))
+
+    def test_load_precision(self):
+        """Check that the loaded datasets but the lon/lats are cast to the precision."""
+        import numpy as np
+        import xarray as xr
+        from satpy.utils import set_precision
+        fh = FakeFH(datetime(2000, 1, 1), datetime(2000, 1, 2))
+        fh.get_dataset.return_value = xr.DataArray(np.zeros((8, 10)), dims=('y', 'x'))
+        fh.get_area_def = MagicMock(side_effect=NotImplementedError)
+        fh.combine_info.return_value = {'name': 'ch01'}
+        self.reader.file_handlers = {'ftype1': [fh]}
+
+        self.assertEqual(self.reader.load(['ch01'])['ch01'].dtype, np.float32)
+        try:
+            set_precision('float64')
+            self.assertEqual(self.reader.load(['ch01'])['ch01'].dtype, np.float64)
+        finally:
+            set_precision('float32')
+        fh.combine_info.return_value = {'name': 'ch01', 'standard_name': 'latitude'}
+        self.assertEqual(self.reader.load(['ch01'])['ch01'].dtype, np.float64)
+
+    def test_crop_windows_resolutions(self):
+        """Check that the datasets of different resolutions are cropped to the same extent."""
+        import numpy as np
+        from pyresample.geometry import AreaDefinition
+        from satpy.readers.yaml_reader import _get_crop_windows
+        proj = {'proj': 'geos', 'h': 35786023., 'lon_0': -75., 'sweep': 'x'}
+        extent = (-3627271., 1583173., 1382771., 4589199.)
+        area_1km = AreaDefinition('1km', '1km', '1km', proj, 5000, 3000, extent)
+        area_500m = AreaDefinition('500m', '500m', '500m', proj, 10000, 6000, extent)
+        other_extent = AreaDefinition('other', 'other', 'other', proj, 10000, 6000, (-3e6, 1.6e6, 1.4e6, 4.6e6))
+        windows = _get_crop_windows({area_1km, area_500m, other_extent}, {'ll_bbox': (-105, 40, -95, 50)})
+        (y_1km, x_1km), (y_500m, x_500m) = windows[area_1km], windows[area_500m]
+        self.assertEqual((y_500m.start, y_500m.stop), (2 * y_1km.start, 2 * y_1km.stop))
+        self.assertEqual((x_500m.start, x_500m.stop), (2 * x_1km.start, 2 * x_1km.stop))
+        np.testing.assert_allclose(area_1km[y_1km, x_1km].area_extent, area_500m[y_500m, x_500m].area_extent)
+        # areas which aren't aligned with the coarsest one get their own window
+        self.assertIsNotNone(windows[other_extent])
+        # windows covering everything are dropped
+        self.assertDictEqual(_get_crop_windows({area_1km}, {'xy_bbox': extent}), {area_1km: None})
+
 
 class TestFileFileYAMLReaderMultipleFileTypes(unittest.TestCase):
     """Test units from FileYAMLReader with multiple file types."""
 
     @patch('satpy.readers.yaml_reader.recursive_dict_update')
-    @patch('satpy.readers.yaml_reader.yaml', spec=yr.yaml)
+    @patch('satpy.readers.yaml_reader.read_yaml_file')
     def setUp(self, _, rec_up):  # pylint: disable=arguments-differ
         """Prepare a reader instance with a fake config."""
         # Example: GOES netCDF data
@@ -837,6 +922,85 @@ class TestGEOSegmentYAMLReader(unittest.TestCase):
                          seg1_extent)
         AreaDefinition.assert_called_once_with(*expected_call)
 
+    def test_get_segments_in_window(self):
+        """Test finding the segments covering the rows to load."""
+        from satpy.readers.yaml_reader import _get_segments_in_window
+        file_handlers = []
+        for segment in (2, 3, 5):
+            fh = MagicMock(filename_info={'segment': segment}, filetype_info={'expected_segments': 6})
+            fh.get_area_def.return_value.shape = (10, 20)
+            file_handlers.append(fh)
+        self.assertEqual(_get_segments_in_window(file_handlers, 'dsid', (slice(15, 32), slice(0, 20))), {2, 3, 4})
+        # no available segment in the window
+        self.assertIsNone(_get_segments_in_window(file_handlers, 'dsid', (slice(0, 9), slice(0, 20))))
+        file_handlers[0].get_area_def.side_effect = NotImplementedError
+        self.assertIsNone(_get_segments_in_window(file_handlers, 'dsid', (slice(15, 32), slice(0, 20))))
+
+    def test_lazy_segments(self):
+        """Test that only the first and last segments are opened with lazy_segments."""
+        from satpy.readers.yaml_reader import GEOSegmentYAMLReader, LazyFileHandler
+        opened = []
+
+        def new_filehandler_instances(self, filetype_info, filename_items, fh_kwargs=None):
+            for filename, filename_info in filename_items:
+                opened.append(filename)
+                yield MagicMock(filename=filename, filename_info=filename_info)
+
+        GEOSegmentYAMLReader.__bases__[0]._new_filehandler_instances = new_filehandler_instances
+        filename_items = [('seg{}'.format(seg), {'segment': seg}) for seg in (3, 1, 4, 2)]
+        fh_cls = MagicMock()
+        self.reader._filehandler_args = lambda filetype_info, items, fh_kwargs=None: [
+            (fh_cls, filename, filename_info, filetype_info, [], {}) for filename, filename_info in items]
+
+        self.reader.lazy_segments = False
+        fhs = list(self.reader._new_filehandler_instances({}, filename_items))
+        self.assertEqual(len(opened), 4)
+        self.assertFalse(any(isinstance(fh, LazyFileHandler) for fh in fhs))
+
+        opened.clear()
+        self.reader.lazy_segments = True
+        fhs = list(self.reader._new_filehandler_instances({}, filename_items))
+        self.assertListEqual(opened, ['seg1', 'seg4'])
+        self.assertListEqual([fh.filename for fh in fhs], ['seg1', 'seg2', 'seg3', 'seg4'])
+        self.assertIsInstance(fhs[1], LazyFileHandler)
+        self.assertIs(fhs[1].reference, fhs[0])
+        fh_cls.assert_not_called()
+
+        del GEOSegmentYAMLReader.__bases__[0]._new_filehandler_instances
+
+    def test_lazy_file_handler(self):
+        """Test opening a segment only when needed."""
+        from satpy.readers.yaml_reader import LazyFileHandler, segment_area_cache
+        segment_area_cache.clear()
+        reference = MagicMock()
+        reference.get_area_def.return_value = 'ref_area'
+        filename_info = {'segment': 2, 'start_time': datetime(2020, 1, 1)}
+        filetype_info = {'file_type': 'foo'}
+        fh_cls = MagicMock()
+        fh_cls.return_value.get_area_def.return_value = 'seg2_area'
+        fh = LazyFileHandler(reference, fh_cls, 'seg2', filename_info, filetype_info, [], {})
+        self.assertEqual(fh.start_time, datetime(2020, 1, 1))
+        self.assertEqual(fh.end_time, datetime(2020, 1, 1))
+        self.assertIs(fh.sensor_names, reference.sensor_names)
+        fh.available_datasets(configured_datasets='configured')
+        reference.available_datasets.assert_called_once_with(configured_datasets='configured')
+        fh_cls.assert_not_called()
+
+        self.assertEqual(fh.get_area_def('dsid'), 'seg2_area')
+        fh_cls.assert_called_once_with('seg2', filename_info, filetype_info)
+        self.assertTrue(fh.is_open)
+        fh.get_dataset('dsid', {})
+        fh_cls.return_value.get_dataset.assert_called_once_with('dsid', {})
+
+        # the area of the segment is known without opening it for the same reference area
+        fh = LazyFileHandler(reference, fh_cls, 'seg2', filename_info, filetype_info, [], {})
+        self.assertEqual(fh.get_area_def('dsid'), 'seg2_area')
+        self.assertFalse(fh.is_open)
+        reference.get_area_def.return_value = 'other_area'
+        fh.get_area_def('dsid')
+        self.assertTrue(fh.is_open)
+        segment_area_cache.clear()
+
     def test_find_missing_segments(self):
         """Test _find_missing_segments()."""
         from satpy.readers.yaml_reader import _find_missing_segments as fms
@@ -878,3 +1042,11 @@ class TestGEOSegmentYAMLReader(unittest.TestCase):
         self.assertEqual(slice_list, [None, projectable, None])
         self.assertFalse(failure)
         self.assertTrue(proj is projectable)
+
+        # Segments outside the window aren't loaded
+        fh_seg3 = MagicMock(filename_info={'segment': 3}, filetype_info=filetype_info)
+        res = fms([fh_seg2, fh_seg3], ds_info, dsid, segments={1, 2})
+        counter, expected_segments, slice_list, failure, proj = res
+        self.assertEqual(counter, 4)
+        self.assertEqual(slice_list, [None, projectable, None])
+        fh_seg3.get_dataset.assert_not_called()
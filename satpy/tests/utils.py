@@ -277,8 +277,7 @@ class FakeReader(FileYAMLReader):
 
         """
         with mock.patch('satpy.readers.yaml_reader.recursive_dict_update') as rdu, \
-                mock.patch('satpy.readers.yaml_reader.open'), \
-                mock.patch('satpy.readers.yaml_reader.yaml.load'):
+                mock.patch('satpy.readers.yaml_reader.read_yaml_file'):
             rdu.return_value = {'reader': {'name': name}, 'file_types': {}}
             super(FakeReader, self).__init__(['fake.yaml'])
 
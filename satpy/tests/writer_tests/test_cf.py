@@ -196,6 +196,44 @@ class TestCFWriter(unittest.TestCase):
         with TempFile() as filename:
             self.assertRaises(ValueError, scn.save_datasets, datasets=['VIS006', 'HRV'], filename=filename, writer='cf')
 
+    def test_single_pass(self):
+        """Test writing all the groups and variables with one store."""
+        import xarray as xr
+        import dask.array as da
+        from pyresample.geometry import AreaDefinition
+        from satpy import Scene
+        from satpy.writers import compute_writer_results
+
+        area = AreaDefinition('test', 'test', 'test', {'proj': 'geos', 'h': 35785831., 'lon_0': 0.},
+                              4, 4, (-1e5, -1e5, 1e5, 1e5))
+        tstart = datetime(2019, 4, 1, 12, 0)
+        tend = datetime(2019, 4, 1, 12, 15)
+        scn = Scene()
+        for idx, name in enumerate(('VIS006', 'IR_108', 'HRV')):
+            scn[name] = xr.DataArray(da.arange(16., chunks=8).reshape((4, 4)) * idx,
+                                     dims=('y', 'x'), coords={'time': tstart},
+                                     attrs={'name': name, 'start_time': tstart, 'end_time': tend, 'area': area})
+        groups = {'visir': ['IR_108', 'VIS006'], 'hrv': ['HRV']}
+        for engine in ('netcdf4', 'h5netcdf'):
+            with TempFile() as expected_file, TempFile() as filename:
+                scn.save_datasets(filename=expected_file, writer='cf', groups=groups, engine=engine)
+                res = scn.save_datasets(filename=filename, writer='cf', groups=groups, engine=engine,
+                                        single_pass=True, compute=False)
+                # the lon/lats are stored lazily too
+                self.assertEqual(len(res[0]), 7)
+                compute_writer_results([res])
+                for group in (None, 'visir', 'hrv'):
+                    with xr.open_dataset(expected_file, group=group) as expected, \
+                            xr.open_dataset(filename, group=group) as written:
+                        if group is None:
+                            self.assertEqual(set(written.attrs), set(expected.attrs))
+                        else:
+                            xr.testing.assert_identical(written, expected)
+
+        with TempFile() as filename:
+            self.assertRaises(ValueError, scn.save_datasets, filename=filename, writer='cf', engine='scipy',
+                              single_pass=True)
+
     def test_single_time_value(self):
         """Test setting a single time value."""
         from satpy import Scene
@@ -960,6 +998,34 @@ class TestCFWriter(unittest.TestCase):
         self.assertDictContainsSubset({'name': 'longitude', 'standard_name': 'longitude', 'units': 'degrees_east'},
                                       lon.attrs)
 
+    def test_area2lonlat_lazy(self):
+        """Test that the lon/lats of areas are not computed without disk cache."""
+        import dask
+        import pyresample.geometry
+        import xarray as xr
+        import dask.array as da
+        from satpy.writers.cf_writer import area2lonlat
+
+        area = pyresample.geometry.AreaDefinition(
+            'seviri',
+            'Native SEVIRI grid',
+            'geos',
+            "+a=6378169.0 +h=35785831.0 +b=6356583.8 +lon_0=0 +proj=geos",
+            10, 10,
+            [-5570248.686685662, -5567248.28340708, 5567248.28340708, 5570248.686685662]
+        )
+        for data, chunks in ((np.zeros((10, 10)), ((10,), (10,))),
+                             (da.zeros((10, 10), chunks=5), ((5, 5), (5, 5)))):
+            dataarray = xr.DataArray(data=data, dims=('y', 'x'), attrs={'area': area})
+            with mock.patch('satpy.utils.LONLAT_CACHE_DIR', None), dask.config.set(scheduler='raise'):
+                res = area2lonlat(dataarray)
+            for name in ('longitude', 'latitude'):
+                self.assertIsInstance(res[name].data, da.Array)
+                self.assertEqual(res[name].chunks, chunks)
+        lons_ref, lats_ref = area.get_lonlats()
+        np.testing.assert_allclose(res['longitude'].values, lons_ref)
+        np.testing.assert_allclose(res['latitude'].values, lats_ref)
+
 
 def suite():
     """Test suite for this writer's tests."""
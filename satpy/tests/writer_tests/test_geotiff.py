@@ -144,3 +144,121 @@ class TestGeoTIFFWriter(unittest.TestCase):
             w.save_datasets(datasets, tags={'test2': 2}, compute=False, include_scale_offset=True)
             called_include = save_method.call_args[1]['include_scale_offset_tags']
             self.assertTrue(called_include)
+
+    def test_cog(self):
+        """Test writing a cloud optimized geotiff with its overviews."""
+        import os
+        import rasterio
+        import xarray as xr
+        import dask.array as da
+        from datetime import datetime
+        from pyresample.geometry import AreaDefinition
+        from satpy.writers import compute_writer_results
+        from satpy.writers.geotiff import GeoTIFFWriter
+        area = AreaDefinition('test', 'test', 'test', {'proj': 'eqc'}, 301, 203, (-1e5, -1e5, 1e5, 1e5))
+        dataset = xr.DataArray(da.from_array(np.random.rand(203, 301), chunks=64), dims=('y', 'x'),
+                               attrs={'name': 'test', 'start_time': datetime(2020, 1, 1), 'area': area})
+        filename = os.path.join(self.base_dir, 'test.tif')
+        w = GeoTIFFWriter(base_dir=self.base_dir)
+        res = w.save_datasets([dataset], filename=filename, cog=True, overviews=[2, 4], compute=False)
+        # full resolution and overviews are computed in the same graph
+        self.assertEqual(len(res[0]), 3)
+        copy = rasterio.shutil.copy
+        tmp_compressions = []
+
+        def _copy(src, dst, **kwargs):
+            if kwargs.get('driver') == 'GTiff':
+                for tmp_filename in sorted(os.listdir(os.path.dirname(src))):
+                    if tmp_filename.endswith('.tif'):
+                        with rasterio.open(os.path.join(os.path.dirname(src), tmp_filename)) as rfile:
+                            tmp_compressions.append(rfile.profile['compress'])
+            return copy(src, dst, **kwargs)
+
+        with mock.patch('rasterio.shutil.copy', side_effect=_copy) as copy_method:
+            compute_writer_results([res])
+        # the temporary files are compressed and GDAL uses all the CPUs
+        self.assertEqual(tmp_compressions, ['deflate'] * 3)
+        self.assertEqual(copy_method.call_args[1]['num_threads'], 'ALL_CPUS')
+        # the temporary files are removed
+        self.assertEqual(os.listdir(self.base_dir), ['test.tif'])
+        with rasterio.open(filename) as rfile:
+            self.assertEqual(rfile.tags(ns='IMAGE_STRUCTURE')['LAYOUT'], 'COG')
+            self.assertTrue(rfile.profile['tiled'])
+            self.assertEqual(rfile.overviews(1), [2, 4])
+            full = rfile.read()
+        with rasterio.open(filename, overview_level=0) as rfile:
+            np.testing.assert_array_equal(rfile.read(), full[:, ::2, ::2])
+        with rasterio.open(filename, overview_level=1) as rfile:
+            self.assertEqual(rfile.shape, (51, 76))
+
+        self.assertRaises(ValueError, w.save_datasets, [dataset], filename=filename, cog=True,
+                          overviews_resampling='cubic')
+
+        # lossy compressions aren't applied twice
+        from satpy.writers.geotiff import CloudOptimizedGeoTIFF
+        self.assertEqual(CloudOptimizedGeoTIFF._get_tmp_options({'compress': 'jpeg', 'jpeg_quality': 80,
+                                                                 'num_threads': 'ALL_CPUS'}),
+                         {'compress': 'DEFLATE', 'num_threads': 'ALL_CPUS'})
+        self.assertEqual(CloudOptimizedGeoTIFF._get_tmp_options({'compress': 'lzw', 'predictor': 2,
+                                                                 'tiled': True, 'num_threads': 2}),
+                         {'compress': 'lzw', 'predictor': 2, 'num_threads': 2})
+
+    def test_downsample(self):
+        """Test downsampling images block by block."""
+        import dask.array as da
+        from satpy.writers.geotiff import downsample, get_overview_factors
+        data = np.arange(2 * 5 * 7, dtype=np.uint8).reshape((2, 5, 7))
+        res = downsample(da.from_array(data, chunks=(1, 3, 3)), 2, 'average')
+        self.assertEqual(res.dtype, np.uint8)
+        padded = np.pad(data, ((0, 0), (0, 1), (0, 1)), mode='edge').astype(np.float64)
+        expected = np.round(padded.reshape((2, 3, 2, 4, 2)).mean(axis=(2, 4)))
+        np.testing.assert_array_equal(res.compute(), expected)
+        res = downsample(da.from_array(data, chunks=(1, 3, 3)), 2)
+        np.testing.assert_array_equal(res.compute(), data[:, ::2, ::2])
+        self.assertEqual(get_overview_factors(1000, 600), [2, 4])
+        self.assertEqual(get_overview_factors(200, 600), [])
+
+        # the fill values aren't averaged
+        data = np.array([[[10, 20, 0, 0], [0, 30, 0, 0]]], dtype=np.uint8)
+        res = downsample(da.from_array(data, chunks=(1, 2, 2)), 2, 'average', fill_value=0)
+        np.testing.assert_array_equal(res.compute(), [[[20, 0]]])
+        res = downsample(da.from_array(data.astype(np.float32), chunks=(1, 2, 2)), 2, 'average', fill_value=0)
+        np.testing.assert_array_equal(res.compute(), [[[20., 0.]]])
+        # nor the transparent pixels
+        data = np.array([[[10, 200]], [[30, 200]], [[255, 0]]], dtype=np.uint8)
+        res = downsample(da.from_array(data, chunks=(3, 1, 2)), 2, 'average', alpha=True)
+        np.testing.assert_array_equal(res.compute()[:, 0, 0], [10, 30, 255])
+        res = downsample(da.from_array(data[:, :, 1:], chunks=(3, 1, 1)), 2, 'average', alpha=True)
+        np.testing.assert_array_equal(res.compute()[:, 0, 0], [0, 0, 0])
+
+    def test_cog_cleanup(self):
+        """Test that the temporary files of cloud optimized geotiffs are removed when they aren't assembled."""
+        import gc
+        import os
+        import xarray as xr
+        import dask.array as da
+        from datetime import datetime
+        from pyresample.geometry import AreaDefinition
+        from satpy.writers.geotiff import GeoTIFFWriter
+
+        def _fail(block):
+            raise RuntimeError('failed')
+
+        area = AreaDefinition('test', 'test', 'test', {'proj': 'eqc'}, 30, 20, (-1e5, -1e5, 1e5, 1e5))
+        data = da.from_array(np.random.rand(20, 30), chunks=10)
+        attrs = {'name': 'test', 'start_time': datetime(2020, 1, 1), 'area': area}
+        filename = os.path.join(self.base_dir, 'test.tif')
+        w = GeoTIFFWriter(base_dir=self.base_dir)
+
+        res = w.save_datasets([xr.DataArray(data, dims=('y', 'x'), attrs=attrs)], filename=filename, cog=True,
+                              overviews=[2], compute=False)
+        self.assertEqual(len(os.listdir(self.base_dir)), 1)
+        # the overviews are only created once they are written
+        self.assertEqual(os.listdir(os.path.join(self.base_dir, os.listdir(self.base_dir)[0])), ['image.tif'])
+        del res
+        gc.collect()
+        self.assertEqual(os.listdir(self.base_dir), [])
+
+        failing = xr.DataArray(data.map_blocks(_fail, dtype=data.dtype), dims=('y', 'x'), attrs=attrs)
+        self.assertRaises(RuntimeError, w.save_datasets, [failing], filename=filename, cog=True, overviews=[2])
+        self.assertEqual(os.listdir(self.base_dir), [])
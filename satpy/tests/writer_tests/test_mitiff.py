@@ -941,3 +941,94 @@ class TestMITIFFWriter(unittest.TestCase):
         dataset = self._get_test_dataset_three_bands_two_prereq()
         w = MITIFFWriter(base_dir=self.base_dir)
         w.save_dataset(dataset)
+
+    def test_strip_writer_read_back(self):
+        """Test that the pages written strip by strip in any order are read back unchanged."""
+        import os
+        import numpy as np
+        import dask.array as da
+        from libtiff import TIFF
+        from satpy.writers.mitiff import MITIFFStripWriter
+        filename = os.path.join(self.base_dir, 'strips.mitiff')
+        expected = [np.random.randint(0, 256, (10, 7), dtype=np.uint8) for _ in range(3)]
+        pages = [(da.from_array(data, chunks=(3, 4)), {}) for data in expected]
+        writer = MITIFFStripWriter(filename, 'description', pages)
+        # the last strip of the last page comes first
+        for source, target in reversed(list(zip(writer.sources, writer.targets))):
+            for start in reversed(range(0, source.shape[0], target.rows_per_strip)):
+                rows = slice(start, min(start + target.rows_per_strip, source.shape[0]))
+                target[rows, slice(None)] = source[rows].compute()
+        writer.close()
+
+        tif = TIFF.open(filename)
+        images = list(tif.iter_images())
+        self.assertEqual(len(images), 3)
+        tif.SetDirectory(0)
+        self.assertEqual(tif.GetField('IMAGEDESCRIPTION'), b'description')
+        for image, data in zip(images, expected):
+            np.testing.assert_array_equal(image, data)
+
+
+class TestMITIFFStripWriter(unittest.TestCase):
+    """Test writing the MITIFF pages strip by strip."""
+
+    def setUp(self):
+        """Mock libtiff."""
+        from unittest import mock
+        self.libtiff = mock.MagicMock()
+        self.module_patcher = mock.patch.dict('sys.modules', {'libtiff': self.libtiff})
+        self.module_patcher.start()
+        self.tif = self.libtiff.TIFF.open.return_value
+        self.calls = []
+        self.tif.WriteEncodedStrip.side_effect = lambda strip, ptr, size: self.calls.append(('strip', strip, size))
+        self.tif.WriteDirectory.side_effect = lambda: self.calls.append(('directory', ))
+
+    def tearDown(self):
+        """Stop mocking libtiff."""
+        self.module_patcher.stop()
+
+    def test_write_pages(self):
+        """Test that all the pages are written one after the other in one graph."""
+        import dask.array as da
+        from satpy.writers.mitiff import MITIFFStripWriter
+        pages = [(da.zeros((10, 4), chunks=(4, 2)), {}),
+                 (da.ones((10, 4), chunks=(5, 4)), {'PHOTOMETRIC': 3, 'COLORMAP': 'cmap'})]
+        writer = MITIFFStripWriter('test.mitiff', 'description', pages)
+        self.assertEqual([src.chunks for src in writer.sources], [((4, 4, 2), (4, )), ((5, 5), (4, ))])
+        # the strips of the second page come first
+        for source, target in reversed(list(zip(writer.sources, writer.targets))):
+            da.store(source, target)
+        writer.close()
+        writer.close()
+
+        self.libtiff.TIFF.open.assert_called_once_with('test.mitiff', mode='wb')
+        self.assertEqual(self.calls, [('strip', 0, 16), ('strip', 1, 16), ('strip', 2, 8), ('directory', ),
+                                      ('strip', 0, 20), ('strip', 1, 20), ('directory', )])
+        self.tif.SetField.assert_any_call(270, b'description')
+        self.tif.SetField.assert_any_call('PHOTOMETRIC', 3)
+        self.tif.SetField.assert_any_call('COLORMAP', 'cmap')
+        self.tif.SetField.assert_any_call('ROWSPERSTRIP', 4)
+        self.tif.close.assert_called_once_with()
+
+    def test_spill_pending_strips(self):
+        """Test that the strips of the following pages are spilled to disk until their page comes."""
+        import ctypes
+        import numpy as np
+        import dask.array as da
+        from satpy.writers.mitiff import MITIFFStripWriter
+        written = []
+        self.tif.WriteEncodedStrip.side_effect = lambda strip, ptr, size: written.append(ctypes.string_at(ptr, size))
+        pages = [(da.full((12, 4), val, chunks=(4, 4)), {}) for val in range(3)]
+        writer = MITIFFStripWriter('test.mitiff', 'description', pages)
+        for source, target in reversed(list(zip(writer.sources, writer.targets))[1:]):
+            da.store(source, target)
+        self.assertEqual(written, [])
+        # only the strip numbers are kept in memory
+        self.assertEqual(writer._pending, {1: {0, 1, 2}, 2: {0, 1, 2}})
+        for spill, spilled in writer._spills.values():
+            self.assertIsInstance(spilled, np.memmap)
+        da.store(writer.sources[0], writer.targets[0])
+        self.assertEqual(writer._pending, {})
+        self.assertEqual(writer._spills, {})
+        self.assertEqual(written, [bytes([val]) * 16 for val in range(3) for _ in range(3)])
+        writer.close()
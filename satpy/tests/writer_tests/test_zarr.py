@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Tests for the Zarr writer."""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+import dask.array as da
+import numpy as np
+import xarray as xr
+
+
+class TestZarrWriter(unittest.TestCase):
+    """Test case for the Zarr writer."""
+
+    def setUp(self):
+        """Create a temporary directory to save stores to."""
+        self.base_dir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.base_dir, 'test.zarr')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.base_dir, ignore_errors=True)
+
+    def _get_scene(self, start_time, offset=0):
+        """Get a scene with irregularly chunked datasets."""
+        from pyresample.geometry import AreaDefinition
+        from satpy import Scene
+        area = AreaDefinition('test', 'test', 'test', {'proj': 'geos', 'h': 35785831., 'lon_0': 0.},
+                              4, 4, (-1e5, -1e5, 1e5, 1e5))
+        scn = Scene()
+        for idx, name in enumerate(('VIS006', 'IR_108', 'HRV')):
+            data = da.from_array(np.arange(16.).reshape((4, 4)) * idx + offset, chunks=((1, 3), 4))
+            scn[name] = xr.DataArray(data, dims=('y', 'x'),
+                                     attrs={'name': name, 'start_time': start_time,
+                                            'end_time': start_time + timedelta(minutes=15), 'area': area})
+        return scn
+
+    def test_save_datasets(self):
+        """Test saving the datasets in groups with consolidated metadata."""
+        from satpy.writers import compute_writer_results
+        scn = self._get_scene(datetime(2019, 4, 1, 12, 0))
+        groups = {'visir': ['IR_108', 'VIS006'], 'hrv': ['HRV']}
+        res = scn.save_datasets(filename=self.filename, writer='zarr', groups=groups,
+                                header_attrs={'platform': 'Meteosat-11'}, compute=False)
+        self.assertEqual(len(res), 2)
+        # the layout is there before the data is computed
+        self.assertTrue(os.path.exists(os.path.join(self.base_dir, 'test.zarr', '.zmetadata')))
+        compute_writer_results([res])
+
+        root = xr.open_zarr(self.filename, consolidated=True)
+        self.assertEqual(root.attrs['platform'], 'Meteosat-11')
+        self.assertIn('history', root.attrs)
+        visir = xr.open_zarr(self.filename, group='visir', consolidated=True)
+        self.assertEqual(set(visir.data_vars), {'VIS006', 'IR_108', 'test'})
+        # irregular chunks are made regular for zarr
+        self.assertEqual(visir['VIS006'].chunks, ((3, 1), (4,)))
+        np.testing.assert_array_equal(visir['IR_108'].values, np.arange(16.).reshape((4, 4)))
+        hrv = xr.open_zarr(self.filename, group='hrv', consolidated=True)
+        np.testing.assert_array_equal(hrv['HRV'].values, np.arange(16.).reshape((4, 4)) * 2)
+
+    def test_append_time(self):
+        """Test appending time slots to a store."""
+        start_time = datetime(2019, 4, 1, 12, 0)
+        for slot in range(3):
+            scn = self._get_scene(start_time + timedelta(minutes=15 * slot), offset=slot)
+            scn.save_datasets(filename=self.filename, writer='zarr', datasets=['VIS006'], append_dim='time')
+
+        res = xr.open_zarr(self.filename, consolidated=True)
+        self.assertEqual(res['VIS006'].dims, ('time', 'y', 'x'))
+        np.testing.assert_array_equal(res['time'].values,
+                                      np.array(['2019-04-01T12:00', '2019-04-01T12:15', '2019-04-01T12:30'],
+                                               dtype='datetime64[ns]'))
+        np.testing.assert_array_equal(res['time_bnds'].values[:, 1],
+                                      np.array(['2019-04-01T12:15', '2019-04-01T12:30', '2019-04-01T12:45'],
+                                               dtype='datetime64[ns]'))
+        np.testing.assert_array_equal(res['VIS006'].values[:, 0, 0], [0, 1, 2])
+
+        # without append dimension the store is overwritten
+        scn.save_datasets(filename=self.filename, writer='zarr', datasets=['VIS006'])
+        res = xr.open_zarr(self.filename, consolidated=True)
+        self.assertEqual(res['VIS006'].dims, ('y', 'x'))
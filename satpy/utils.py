@@ -18,10 +18,14 @@
 # along with satpy.  If not, see <http://www.gnu.org/licenses/>.
 """Module defining various utilities."""
 
+import hashlib
 import logging
 import os
 import re
+import shutil
+import threading
 import warnings
+from collections import OrderedDict
 import numpy as np
 import configparser
 
@@ -208,6 +212,8 @@ def sunzen_corr_cos(data, cos_zen, limit=88., max_sza=95.):
     is `None`. The default behavior is to gradually reduce the correction
     past ``limit`` degrees up to ``max_sza`` where the correction becomes
     0. Both ``data`` and ``cos_zen`` should be 2D arrays of the same shape.
+    The correction is computed in the precision of ``cos_zen`` and applied in
+    the precision of floating point ``data``.
 
     """
     # Convert the zenith angle limit to cosine of zenith angle
@@ -231,7 +237,7 @@ def sunzen_corr_cos(data, cos_zen, limit=88., max_sza=95.):
     # Force "night" pixels to 0 (where SZA is invalid)
     corr = corr.where(cos_zen.notnull(), 0)
 
-    return data * corr
+    return data * match_float_dtype(corr, data)
 
 
 def atmospheric_path_length_correction(data, cos_zen, limit=88., max_sza=95.):
@@ -245,7 +251,8 @@ def atmospheric_path_length_correction(data, cos_zen, limit=88., max_sza=95.):
     ``max_sza`` is `None`. The default behavior is to gradually reduce the
     correction past ``limit`` degrees up to ``max_sza`` where the correction
     becomes 0. Both ``data`` and ``cos_zen`` should be 2D arrays of the same
-    shape.
+    shape. The correction is computed in the precision of ``cos_zen`` and
+    applied in the precision of floating point ``data``.
 
     """
     # Convert the zenith angle limit to cosine of zenith angle
@@ -272,7 +279,7 @@ def atmospheric_path_length_correction(data, cos_zen, limit=88., max_sza=95.):
     # Force "night" pixels to 0 (where SZA is invalid)
     corr = corr.where(cos_zen.notnull(), 0)
 
-    return data * corr
+    return data * match_float_dtype(corr, data)
 
 
 def get_satpos(dataset):
@@ -325,3 +332,257 @@ def get_satpos(dataset):
         alt = dataset.attrs['satellite_altitude']
 
     return lon, lat, alt
+
+
+def get_nbytes(obj):
+    """Get the number of bytes held by *obj*.
+
+    Arrays (numpy, dask or xarray) report their ``nbytes``, dictionaries,
+    lists and tuples are summed recursively and anything else counts as 0.
+
+    """
+    if isinstance(obj, dict):
+        return sum(get_nbytes(val) for val in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(get_nbytes(val) for val in obj)
+    try:
+        return int(obj.nbytes)
+    except (AttributeError, TypeError):
+        return 0
+
+
+class SizedLRUCache(object):
+    """Thread-safe least-recently-used cache bounded by the size of its items.
+
+    The size of every item is determined with `sizeof`, :func:`get_nbytes` by
+    default. When adding an item makes the cache exceed `max_bytes`, the least
+    recently used items are dropped. Items that are bigger than `max_bytes` on
+    their own are not stored at all.
+
+    Passing ``sizeof=lambda val: 1`` bounds the cache by the number of items
+    instead, which is useful for lazy (dask) items whose `nbytes` doesn't
+    reflect the memory they use.
+
+    """
+
+    def __init__(self, max_bytes, sizeof=get_nbytes):
+        """Initialize the cache with a maximum size of `max_bytes`."""
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._items = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self):
+        """Get the total size of the cached items in bytes."""
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def __len__(self):
+        """Get the number of cached items."""
+        return len(self._items)
+
+    def __contains__(self, key):
+        """Check if *key* is cached."""
+        return key in self._items
+
+    def __getitem__(self, key):
+        """Get the item for *key* and mark it as the most recently used."""
+        with self._lock:
+            val = self._items[key]
+            self._items.move_to_end(key)
+            return val
+
+    def get(self, key, default=None):
+        """Get the item for *key* or *default* if it isn't cached."""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, val):
+        """Cache *val* under *key*, evicting old items if needed."""
+        size = self.sizeof(val)
+        with self._lock:
+            self.pop(key, None)
+            if size > self.max_bytes:
+                logging.getLogger(__name__).debug(
+                    "Not caching %s, it is bigger than the cache size", key)
+                return
+            self._items[key] = val
+            self._sizes[key] = size
+            while self.nbytes > self.max_bytes:
+                self.pop(next(iter(self._items)))
+
+    def pop(self, key, *default):
+        """Remove the item for *key* from the cache and return it."""
+        with self._lock:
+            self._sizes.pop(key, None)
+            return self._items.pop(key, *default)
+
+    def clear(self):
+        """Remove all items from the cache."""
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+
+
+def save_npy_cache(filename, arrays):
+    """Save *arrays* as ``.npy`` files in the *filename* directory.
+
+    The files are written to a temporary directory first which is then
+    renamed, so other processes never see a partially written cache.
+
+    """
+    import dask.array as da
+    tmp_dir = "{}.{}.tmp".format(filename, os.getpid())
+    os.makedirs(tmp_dir, exist_ok=True)
+    sources = []
+    targets = []
+    for name, arr in arrays.items():
+        arr = da.asarray(arr)
+        targets.append(np.lib.format.open_memmap(os.path.join(tmp_dir, name + '.npy'),
+                                                 mode='w+', dtype=arr.dtype, shape=arr.shape))
+        sources.append(arr)
+    da.store(sources, targets)
+    for target in targets:
+        target.flush()
+    try:
+        os.rename(tmp_dir, filename)
+    except OSError:
+        # another process was faster
+        logging.getLogger(__name__).debug("Cache %s already exists", filename)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def load_npy_cache(filename, names):
+    """Memory map the ``.npy`` files named *names* in the *filename* directory."""
+    if not os.path.isdir(filename):
+        raise IOError("No such cache: {}".format(filename))
+    return {name: np.load(os.path.join(filename, name + '.npy'), mmap_mode='r')
+            for name in names}
+
+
+LONLAT_CACHE_BYTES = int(os.getenv('SATPY_LONLAT_CACHE_BYTES', 1024 ** 3))
+LONLAT_CACHE_DIR = os.getenv('SATPY_LONLAT_CACHE_DIR')
+lonlat_cache = SizedLRUCache(LONLAT_CACHE_BYTES)
+
+
+def _load_area_lonlats(area, area_hash):
+    """Memory map the lon/lats of *area* from the cache directory, computing and saving them first if needed."""
+    from satpy import CHUNK_SIZE
+    filename = os.path.join(LONLAT_CACHE_DIR, 'lonlats-{}.npy'.format(area_hash))
+    try:
+        cached = load_npy_cache(filename, ('lons', 'lats'))
+        logging.getLogger(__name__).debug("Loading lon/lats from %s", filename)
+    except IOError:
+        logging.getLogger(__name__).debug("Saving lon/lats to %s", filename)
+        save_npy_cache(filename, dict(zip(('lons', 'lats'), area.get_lonlats(chunks=CHUNK_SIZE))))
+        cached = load_npy_cache(filename, ('lons', 'lats'))
+    return cached['lons'], cached['lats']
+
+
+def get_area_lonlats(area, chunks=None):
+    """Get the longitudes and latitudes of *area*, projecting them only once.
+
+    If the ``SATPY_LONLAT_CACHE_DIR`` environment variable is set, the
+    lon/lats of :class:`~pyresample.geometry.AreaDefinition` objects are
+    computed once and saved there as memory-mapped ``.npy`` files, so fixed
+    grids like the geostationary full disks are projected only once and then
+    shared by all the processes using the directory. The memory maps of the
+    last areas used are kept open up to ``SATPY_LONLAT_CACHE_BYTES`` bytes
+    (1 GiB by default), so all the satpy components working on the same area
+    share the same read-only arrays.
+
+    Without cache directory, or for areas bigger than
+    ``SATPY_LONLAT_CACHE_BYTES``, the lon/lats are not computed here: the
+    lazy lon/lats of pyresample are returned, which are named after the area
+    so the graphs of all the callers share the same keys. The lon/lats of
+    other geometries (e.g. swaths) are returned as they are.
+
+    Args:
+        area: Area to get the lon/lats of.
+        chunks: Chunks of the returned dask arrays, or None to get numpy arrays.
+
+    """
+    from pyresample.geometry import AreaDefinition
+    if (not isinstance(area, AreaDefinition) or not LONLAT_CACHE_DIR or
+            2 * area.size * np.dtype(np.float64).itemsize > LONLAT_CACHE_BYTES):
+        return area.get_lonlats(chunks=chunks)
+    area_hash = area.update_hash(hashlib.sha1()).hexdigest()
+    try:
+        lonlats = lonlat_cache[area_hash]
+    except KeyError:
+        lonlats = _load_area_lonlats(area, area_hash)
+        lonlat_cache[area_hash] = lonlats
+    if chunks is None:
+        return lonlats
+    import dask.array as da
+    from dask.base import tokenize
+    # named after the area so the graphs of all the callers share the same keys
+    return tuple(da.from_array(arr, chunks=chunks, name='{}-{}'.format(name, tokenize(area_hash, chunks)))
+                 for name, arr in zip(('lons', 'lats'), lonlats))
+
+
+PRECISIONS = ('float32', 'float64')
+_precision = os.getenv('SATPY_PRECISION', 'float32')
+
+
+def get_precision():
+    """Get the floating point precision of the datasets.
+
+    With ``'float32'`` (the default, or the ``SATPY_PRECISION`` environment
+    variable), the floating point datasets produced by the readers,
+    compositors, modifiers and resamplers are kept in 32 bits. The 64-bit
+    factors derived from the geolocation, like the sun zenith angles, are
+    cast to the type of the data before being applied, so 32-bit data isn't
+    upcast by them. With ``'float64'`` the datasets keep whatever precision
+    their computations give.
+
+    """
+    if _precision not in PRECISIONS:
+        raise ValueError("Unknown precision '{}', expected one of {}".format(_precision, PRECISIONS))
+    return _precision
+
+
+def set_precision(precision):
+    """Set the floating point precision of the datasets (see :func:`get_precision`)."""
+    global _precision
+    if precision not in PRECISIONS:
+        raise ValueError("Unknown precision '{}', expected one of {}".format(precision, PRECISIONS))
+    _precision = precision
+
+
+def get_float_dtype():
+    """Get the floating point type of the datasets with the current precision."""
+    return np.dtype(get_precision())
+
+
+def match_float_dtype(factor, data):
+    """Cast *factor* to the floating point type of *data*.
+
+    This keeps *data* from being upcast when it is combined with factors
+    computed in a higher precision. *factor* is returned unchanged if *data*
+    isn't floating point or if *factor* is a Python number.
+
+    """
+    if not hasattr(factor, 'astype') or data.dtype.kind != 'f' or factor.dtype == data.dtype:
+        return factor
+    return factor.astype(data.dtype)
+
+
+def apply_precision(data):
+    """Cast the floating point *data* down to the current precision.
+
+    Integer, complex and lower precision data is returned unchanged, as is
+    all data with the ``'float64'`` precision.
+
+    Args:
+        data (xarray.DataArray, dask.array.Array or numpy.ndarray): Data to cast.
+
+    """
+    dtype = get_float_dtype()
+    if data.dtype.kind != 'f' or data.dtype.itemsize <= dtype.itemsize:
+        return data
+    return data.astype(dtype)
@@ -20,6 +20,8 @@
 For now, this includes enhancement configuration utilities.
 """
 
+import hashlib
+import json
 import logging
 import os
 import warnings
@@ -34,11 +36,12 @@ try:
 except ImportError:
     from yaml import Loader as UnsafeLoader
 
-from satpy.config import (config_search_paths, glob_config,
-                          get_environ_config_dir, recursive_dict_update)
+from satpy.config import (config_search_paths, glob_config, get_environ_config_dir,
+                          read_yaml_file, recursive_dict_update)
 from satpy import CHUNK_SIZE
 from satpy.plugin_base import Plugin
 from satpy.resample import get_area_def
+from satpy.utils import SizedLRUCache, load_npy_cache, save_npy_cache
 
 from trollsift import parser
 
@@ -46,14 +49,17 @@ from trollimage.xrimage import XRImage
 
 LOG = logging.getLogger(__name__)
 
+OVERLAY_CACHE_BYTES = int(os.getenv('SATPY_OVERLAY_CACHE_BYTES', 512 * 1024 ** 2))
+OVERLAY_CACHE_DIR = os.getenv('SATPY_OVERLAY_CACHE_DIR')
+overlay_cache = SizedLRUCache(OVERLAY_CACHE_BYTES)
+
 
 def read_writer_config(config_files, loader=UnsafeLoader):
     """Read the writer `config_files` and return the info extracted."""
     conf = {}
     LOG.debug('Reading %s', str(config_files))
     for config_file in config_files:
-        with open(config_file) as fd:
-            conf.update(yaml.load(fd.read(), Loader=loader))
+        conf.update(read_yaml_file(config_file, loader=loader))
 
     try:
         writer_info = conf['writer']
@@ -184,6 +190,87 @@ def _burn_overlay(img, image_metadata, area, cw_, overlays):
     return img
 
 
+def _get_overlays_token(overlays):
+    """Get a string identifying the *overlays* configuration."""
+    return json.dumps(overlays, sort_keys=True, default=repr)
+
+
+def _rasterize_overlays(area, coast_dir, overlays):
+    """Draw the *overlays* of *area* on a transparent image."""
+    from pycoast import ContourWriterAGG
+    LOG.debug("Rasterizing the overlays of %s", area.area_id)
+    cw_ = ContourWriterAGG(coast_dir)
+    layer = cw_.add_overlay_from_dict(overlays, area)
+    return np.asarray(layer.convert('RGBA'))
+
+
+def _compute_overlay_layer(area, coast_dir, overlays):
+    if not OVERLAY_CACHE_DIR:
+        return _rasterize_overlays(area, coast_dir, overlays)
+    the_hash = area.update_hash(hashlib.sha1())
+    the_hash.update(str(coast_dir).encode())
+    the_hash.update(_get_overlays_token(overlays).encode())
+    filename = os.path.join(OVERLAY_CACHE_DIR, 'overlay-{}.npy'.format(the_hash.hexdigest()))
+    try:
+        return load_npy_cache(filename, ('rgba', ))['rgba']
+    except IOError:
+        save_npy_cache(filename, {'rgba': _rasterize_overlays(area, coast_dir, overlays)})
+        return load_npy_cache(filename, ('rgba', ))['rgba']
+
+
+def get_overlay_layer(area, coast_dir, overlays):
+    """Get the *overlays* of *area* rasterized as an RGBA layer.
+
+    The overlays are drawn by pycoast only once for each area, coastline
+    directory and overlays configuration. The layers are kept in memory
+    (``SATPY_OVERLAY_CACHE_BYTES``, 512 MiB by default) and, if the
+    ``SATPY_OVERLAY_CACHE_DIR`` environment variable is set, saved there as
+    memory-mapped ``.npy`` files shared by all the processes using the
+    directory.
+
+    Returns:
+        A (y, x, 4) uint8 array, transparent where nothing was drawn.
+
+    """
+    key = (hash(area), coast_dir, _get_overlays_token(overlays))
+    try:
+        return overlay_cache[key]
+    except KeyError:
+        pass
+    layer = _compute_overlay_layer(area, coast_dir, overlays)
+    overlay_cache[key] = layer
+    return layer
+
+
+def _blend_overlay(img, layer, fill_value=None):
+    """Blend the RGBA *layer* over the floating point RGB(A) image *img*.
+
+    The invalid pixels of an RGB image are filled with *fill_value* (in the
+    0-255 range of the final image), the alpha band of an RGBA image is
+    composited with the alpha of the layer.
+
+    """
+    data = img.data
+    if layer.shape[:2] != (data.sizes['y'], data.sizes['x']):
+        raise ValueError("Overlay layer of shape {} doesn't match the image of shape {}".format(
+            layer.shape[:2], (data.sizes['y'], data.sizes['x'])))
+    data = data.transpose('bands', 'y', 'x')
+    arr = data.data
+    layer = da.from_array(layer, chunks=arr.chunks[1:] + ((4, ), ))
+    alpha = layer[:, :, 3].astype(data.dtype) / 255
+    colors = da.moveaxis(layer[:, :, :3], -1, 0).astype(data.dtype) / 255
+
+    rgb = arr[:3]
+    if fill_value is not None:
+        rgb = da.where(da.isnan(rgb), data.dtype.type(fill_value / 255), rgb)
+    # invalid pixels under the overlays take their color
+    rgb = da.where(da.isnan(rgb) & (alpha > 0), colors, rgb.clip(0, 1))
+    bands = [rgb * (1 - alpha) + colors * alpha]
+    if img.mode == 'RGBA':
+        bands.append((arr[3] + alpha * (1 - arr[3]))[None])
+    return XRImage(data.copy(data=da.concatenate(bands, axis=0)))
+
+
 def add_overlay(orig_img, area, coast_dir, color=None, width=None, resolution=None,
                 level_coast=None, level_borders=None, fill_value=None,
                 grid=None, overlays=None):
@@ -192,9 +279,11 @@ def add_overlay(orig_img, area, coast_dir, color=None, width=None, resolution=No
     Uses ``color`` for feature colors where ``color`` is a 3-element tuple
     of integers between 0 and 255 representing (R, G, B).
 
-    .. warning::
-
-        This function currently loses the data mask (alpha band).
+    The overlays are rasterized once for each area and configuration (see
+    :func:`get_overlay_layer`) and blended over the floating point images
+    with array operations, so many images of the same area can share them.
+    The alpha band of RGBA images is kept. Integer images are drawn on by
+    pycoast directly and lose their alpha band.
 
     ``resolution`` is chosen automatically if None (default),
     otherwise it should be one of:
@@ -273,6 +362,10 @@ def add_overlay(orig_img, area, coast_dir, color=None, width=None, resolution=No
             for key, val in grid.items():
                 overlays.setdefault('grid', {}).setdefault(key, val)
 
+    if np.issubdtype(orig_img.data.dtype, np.floating):
+        layer = get_overlay_layer(area, coast_dir, overlays)
+        return _blend_overlay(orig_img, layer, fill_value)
+
     cw_ = ContourWriterAGG(coast_dir)
     new_image = orig_img.apply_pil(_burn_overlay, res_mode,
                                    None, {'fill_value': fill_value},
@@ -955,17 +1048,16 @@ class EnhancementDecisionTree(DecisionTree):
         conf = {}
         for config_file in decision_dict:
             if os.path.isfile(config_file):
-                with open(config_file) as fd:
-                    enhancement_config = yaml.load(fd, Loader=UnsafeLoader)
-                    if enhancement_config is None:
-                        # empty file
-                        continue
-                    enhancement_section = enhancement_config.get(
-                        self.prefix, {})
-                    if not enhancement_section:
-                        LOG.debug("Config '{}' has no '{}' section or it is empty".format(config_file, self.prefix))
-                        continue
-                    conf = recursive_dict_update(conf, enhancement_section)
+                enhancement_config = read_yaml_file(config_file)
+                if enhancement_config is None:
+                    # empty file
+                    continue
+                enhancement_section = enhancement_config.get(
+                    self.prefix, {})
+                if not enhancement_section:
+                    LOG.debug("Config '{}' has no '{}' section or it is empty".format(config_file, self.prefix))
+                    continue
+                conf = recursive_dict_update(conf, enhancement_section)
             elif isinstance(config_file, dict):
                 conf = recursive_dict_update(conf, config_file)
             else:
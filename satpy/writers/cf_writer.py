@@ -53,6 +53,22 @@ datasets with common grids in separate netCDF groups as follows:
 Note that the resulting file will not be fully CF compliant.
 
 
+Single pass writing
+~~~~~~~~~~~~~~~~~~~
+
+By default the file is created with the global attributes and then every group is appended to it, reopening the file
+and computing the datasets of each group separately. With ``single_pass=True`` the layout of the whole file is created
+through one file handle and the data of all the variables, including the longitudes and latitudes, is written with a
+single :func:`dask.array.store`. With ``compute=False`` several products can then be computed together:
+
+    >>> from satpy.writers import compute_writer_results
+    >>> res1 = scn.save_datasets(writer='cf', datasets=['VIS006', 'IR_108'], filename='seviri_visir.nc',
+                                 single_pass=True, compute=False)
+    >>> res2 = scn.save_datasets(writer='cf', datasets=['HRV'], filename='seviri_hrv.nc',
+                                 single_pass=True, compute=False)
+    >>> compute_writer_results([res1, res2])
+
+
 Attribute Encoding
 ~~~~~~~~~~~~~~~~~~
 
@@ -104,6 +120,7 @@ from datetime import datetime
 import json
 import warnings
 
+import dask.array as da
 from dask.base import tokenize
 import xarray as xr
 from xarray.coding.times import CFDatetimeCoder
@@ -112,6 +129,8 @@ import numpy as np
 from pyresample.geometry import AreaDefinition, SwathDefinition
 from satpy.writers import Writer
 from satpy.writers.utils import flatten_dict
+from satpy import CHUNK_SIZE
+from satpy.utils import get_area_lonlats
 
 from distutils.version import LooseVersion
 import pyproj
@@ -164,12 +183,16 @@ def get_extra_ds(dataset):
 
 
 def area2lonlat(dataarray):
-    """Convert an area to longitudes and latitudes."""
+    """Convert an area to longitudes and latitudes.
+
+    The lon/lats are dask arrays chunked like the data (or by ``CHUNK_SIZE``
+    for numpy data), so they are only computed when the file is written.
+    """
     dataarray = dataarray.copy()
     area = dataarray.attrs['area']
     ignore_dims = {dim: 0 for dim in dataarray.dims if dim not in ['x', 'y']}
-    chunks = getattr(dataarray.isel(**ignore_dims), 'chunks', None)
-    lons, lats = area.get_lonlats(chunks=chunks)
+    chunks = getattr(dataarray.isel(**ignore_dims), 'chunks', None) or CHUNK_SIZE
+    lons, lats = get_area_lonlats(area, chunks=chunks)
     dataarray['longitude'] = xr.DataArray(lons, dims=['y', 'x'],
                                           attrs={'name': "longitude",
                                                  'standard_name': "longitude",
@@ -398,6 +421,28 @@ def encode_attrs_nc(attrs):
     return OrderedDict(encoded_attrs)
 
 
+class CFVariableTarget(object):
+    """Target writing the chunks of a variable of a netCDF file opened by :class:`CFWriter`.
+
+    Closing the target closes the file, which happens once all the targets
+    of the file have been written by :func:`~satpy.writers.compute_writer_results`.
+
+    """
+
+    def __init__(self, target, store):
+        """Wrap the xarray variable *target* of the file *store*."""
+        self.target = target
+        self.store = store
+
+    def __setitem__(self, key, value):
+        """Write the chunk *value* at *key*."""
+        self.target[key] = value
+
+    def close(self):
+        """Close the file."""
+        self.store.close()
+
+
 class CFWriter(Writer):
     """Writer producing NetCDF/CF compatible datasets."""
 
@@ -549,7 +594,7 @@ class CFWriter(Writer):
 
     def save_datasets(self, datasets, filename=None, groups=None, header_attrs=None, engine=None, epoch=EPOCH,
                       flatten_attrs=False, exclude_attrs=None, include_lonlats=True, pretty=False,
-                      compression=None, **to_netcdf_kwargs):
+                      compression=None, single_pass=False, **to_netcdf_kwargs):
         """Save the given datasets in one netCDF file.
 
         Note that all datasets (if grouping: in one group) must have the same projection coordinates.
@@ -583,6 +628,13 @@ class CFWriter(Writer):
                 Compression to use on the datasets before saving, for example {'zlib': True, 'complevel': 9}.
                 This is in turn passed the xarray's `to_netcdf` method:
                 http://xarray.pydata.org/en/stable/generated/xarray.Dataset.to_netcdf.html for more possibilities.
+            single_pass (bool):
+                Create the layout of the whole file (all groups and variables) at once and write the data of all
+                the variables with one :func:`dask.array.store` through a single file handle, instead of appending
+                the groups one after the other. Only the 'netcdf4' (default) and 'h5netcdf' engines are supported.
+                With ``compute=False`` the sources and targets are returned to be passed to
+                :func:`~satpy.writers.compute_writer_results`, so they can be computed together with other
+                products.
 
         """
         logger.info('Saving datasets to NetCDF4/CF.')
@@ -620,29 +672,77 @@ class CFWriter(Writer):
         for kwarg in satpy_kwargs:
             to_netcdf_kwargs.pop(kwarg, None)
 
+        group_datasets = {}
+        for group_name, datasets_ in groups_.items():
+            group_datasets[group_name] = self._make_group_dataset(
+                datasets_, group_name, epoch=epoch, flatten_attrs=flatten_attrs, exclude_attrs=exclude_attrs,
+                include_lonlats=include_lonlats, pretty=pretty, compression=compression)
+        if single_pass:
+            return self._save_single_pass(root, group_datasets, filename, engine=engine, **to_netcdf_kwargs)
+
         init_nc_kwargs = to_netcdf_kwargs.copy()
         init_nc_kwargs.pop('encoding', None)  # No variables to be encoded at this point
         init_nc_kwargs.pop('unlimited_dims', None)
         written = [root.to_netcdf(filename, engine=engine, mode='w', **init_nc_kwargs)]
 
         # Write datasets to groups (appending to the file; group=None means no group)
-        for group_name, group_datasets in groups_.items():
-            # XXX: Should we combine the info of all datasets?
-            datas, start_times, end_times = self._collect_datasets(
-                group_datasets, epoch=epoch, flatten_attrs=flatten_attrs, exclude_attrs=exclude_attrs,
-                include_lonlats=include_lonlats, pretty=pretty, compression=compression)
-            dataset = xr.Dataset(datas)
-            if 'time' in dataset:
-                dataset['time_bnds'] = make_time_bounds(start_times,
-                                                        end_times)
-                dataset['time'].attrs['bounds'] = "time_bnds"
-                dataset['time'].attrs['standard_name'] = "time"
-            else:
-                grp_str = ' of group {}'.format(group_name) if group_name is not None else ''
-                logger.warning('No time dimension in datasets{}, skipping time bounds creation.'.format(grp_str))
-
+        for group_name, dataset in group_datasets.items():
             encoding, other_to_netcdf_kwargs = self.update_encoding(dataset, to_netcdf_kwargs)
             res = dataset.to_netcdf(filename, engine=engine, group=group_name, mode='a', encoding=encoding,
                                     **other_to_netcdf_kwargs)
             written.append(res)
         return written
+
+    def _make_group_dataset(self, datasets, group_name, **kwargs):
+        """Make the dataset of a group, with time bounds if possible."""
+        # XXX: Should we combine the info of all datasets?
+        datas, start_times, end_times = self._collect_datasets(datasets, **kwargs)
+        dataset = xr.Dataset(datas)
+        if 'time' in dataset:
+            dataset['time_bnds'] = make_time_bounds(start_times,
+                                                    end_times)
+            dataset['time'].attrs['bounds'] = "time_bnds"
+            dataset['time'].attrs['standard_name'] = "time"
+        else:
+            grp_str = ' of group {}'.format(group_name) if group_name is not None else ''
+            logger.warning('No time dimension in datasets{}, skipping time bounds creation.'.format(grp_str))
+        return dataset
+
+    def _save_single_pass(self, root, group_datasets, filename, engine=None, compute=True, **to_netcdf_kwargs):
+        """Write the layout of the file through one file handle, then store the data of all variables at once."""
+        from xarray.backends.api import dump_to_store
+        from xarray.backends.common import ArrayWriter
+
+        engine = engine or 'netcdf4'
+        try:
+            store_cls = {'netcdf4': xr.backends.NetCDF4DataStore,
+                         'h5netcdf': xr.backends.H5NetCDFStore}[engine]
+        except KeyError:
+            raise ValueError("Engine '{}' can't write the file in a single pass".format(engine))
+        open_kwargs = {}
+        if engine == 'netcdf4':
+            open_kwargs['format'] = to_netcdf_kwargs.get('format') or 'NETCDF4'
+        unlimited_dims = to_netcdf_kwargs.get('unlimited_dims')
+        if isinstance(unlimited_dims, str):
+            unlimited_dims = [unlimited_dims]
+
+        root_store = store_cls.open(filename, mode='w', **open_kwargs)
+        writer = ArrayWriter()
+        try:
+            dump_to_store(root, root_store, writer)
+            for group_name, dataset in group_datasets.items():
+                store = root_store if group_name is None else store_cls(root_store.ds, group=group_name, mode='a')
+                encoding, _ = self.update_encoding(dataset, to_netcdf_kwargs)
+                dump_to_store(dataset, store, writer, encoding=encoding, unlimited_dims=unlimited_dims)
+        except Exception:
+            root_store.close()
+            raise
+
+        targets = [CFVariableTarget(target, root_store) for target in writer.targets]
+        if not compute:
+            return writer.sources, targets
+        try:
+            if writer.sources:
+                da.store(writer.sources, targets, lock=False)
+        finally:
+            root_store.close()
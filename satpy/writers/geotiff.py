@@ -18,14 +18,244 @@
 """GeoTIFF writer objects for creating GeoTIFF files from `DataArray` objects."""
 
 import logging
+import os
+import shutil
+import tempfile
+import threading
+import warnings
+import weakref
+import xml.etree.ElementTree as ET
+
+import dask.array as da
 import numpy as np
-from satpy.writers import ImageWriter
+from satpy.writers import ImageWriter, compute_writer_results
 # make sure we have rasterio even though we don't use it until trollimage
 # saves the image
 import rasterio  # noqa
+import rasterio.shutil
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.windows import Window
 
 LOG = logging.getLogger(__name__)
 
+COG_BLOCKSIZE = 512
+COG_RESAMPLINGS = ('nearest', 'average')
+COG_LOSSLESS_COMPRESSIONS = ('NONE', 'DEFLATE', 'LZW', 'ZSTD', 'LZMA', 'PACKBITS')
+
+
+def get_overview_factors(width, height, overviews_minsize=256):
+    """Get the powers of two reducing the image until its smallest side is less than *overviews_minsize*."""
+    factors = []
+    factor = 1
+    while min(width, height) // factor > overviews_minsize:
+        factor *= 2
+        factors.append(factor)
+    return factors
+
+
+def _average(data, factor, fill_value=None, alpha=False):
+    """Average the (bands, y, x) numpy array *data* over blocks of *factor* x *factor* pixels.
+
+    The NaN and *fill_value* pixels, and all the bands of the pixels with a
+    zero *alpha* (last) band, are left out of the mean. The blocks without
+    any valid pixel get *fill_value*, or zero with an alpha band.
+    """
+    is_float = np.issubdtype(data.dtype, np.floating)
+    valid = ~np.isnan(data) if is_float else np.ones(data.shape, dtype=bool)
+    if fill_value is not None and not np.isnan(fill_value):
+        valid &= data != fill_value
+    if alpha:
+        valid &= data[-1:] != 0
+    shape = (data.shape[0], data.shape[1] // factor, factor, data.shape[2] // factor, factor)
+    total = np.where(valid, data, 0).astype(np.float64).reshape(shape).sum(axis=(2, 4))
+    count = valid.reshape(shape).sum(axis=(2, 4))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        res = total / count
+    if not is_float:
+        res = np.round(res)
+    empty = fill_value if fill_value is not None else (np.nan if is_float else 0)
+    return np.where(count > 0, res, empty).astype(data.dtype)
+
+
+def downsample(data, factor, resampling='nearest', fill_value=None, alpha=False):
+    """Reduce the (bands, y, x) dask array *data* by *factor* block by block.
+
+    The reduced image has the size of GDAL's overviews, i.e. ``ceil(size / factor)``.
+    With the 'average' resampling, the *fill_value* pixels and the transparent
+    pixels of images with an *alpha* (last) band aren't averaged, like GDAL
+    does for nodata and alpha.
+    """
+    if resampling not in COG_RESAMPLINGS:
+        raise ValueError("Overviews resampling must be one of {} in COG mode".format(COG_RESAMPLINGS))
+    if resampling == 'nearest':
+        return data[:, ::factor, ::factor]
+    padding = [(0, 0)] + [(0, -size % factor) for size in data.shape[1:]]
+    if any(pad for _, pad in padding):
+        data = da.pad(data, padding, mode='edge')
+    chunks = [data.chunks[0]] + [max(factor, max(dim_chunks) // factor * factor) for dim_chunks in data.chunks[1:]]
+    data = data.rechunk(chunks)
+    reduced_chunks = (data.chunks[0], ) + tuple(tuple(size // factor for size in dim_chunks)
+                                                for dim_chunks in data.chunks[1:])
+    return data.map_blocks(_average, factor, fill_value=fill_value, alpha=alpha, chunks=reduced_chunks,
+                           dtype=data.dtype)
+
+
+class _OverviewFile(object):
+    """Temporary tiled GeoTIFF an overview level is stored to.
+
+    The file is created when the first chunk is written.
+    """
+
+    def __init__(self, filename, data, **options):
+        """Prepare the file for the (bands, y, x) *data*, to be created with the GDAL *options*."""
+        self.filename = filename
+        self.shape = data.shape
+        self.dtype = data.dtype
+        self.options = options
+        self.lock = threading.Lock()
+        self.rfile = None
+
+    def _open(self):
+        """Create the file."""
+        with warnings.catch_warnings():
+            # the overviews get their georeferencing from the full resolution image
+            warnings.simplefilter('ignore', NotGeoreferencedWarning)
+            return rasterio.open(self.filename, 'w', driver='GTiff', width=self.shape[2], height=self.shape[1],
+                                 count=self.shape[0], dtype=self.dtype, tiled=True,
+                                 blockxsize=COG_BLOCKSIZE, blockysize=COG_BLOCKSIZE, **self.options)
+
+    def __setitem__(self, key, item):
+        """Write the chunk *item* at *key*."""
+        bands, rows, cols = key
+        indexes = list(range(bands.start + 1, bands.stop + 1))
+        window = Window(cols.start, rows.start, cols.stop - cols.start, rows.stop - rows.start)
+        with self.lock:
+            if self.rfile is None:
+                self.rfile = self._open()
+            self.rfile.write(item, window=window, indexes=indexes)
+
+    def close(self):
+        """Close the file."""
+        with self.lock:
+            if self.rfile is not None:
+                self.rfile.close()
+
+
+class _COGPart(object):
+    """Target of the cloud optimized GeoTIFF telling it when it's closed."""
+
+    def __init__(self, target, cog):
+        """Wrap *target*."""
+        self.target = target
+        self.cog = cog
+
+    def __setitem__(self, key, item):
+        """Store *item* in the target."""
+        self.target[key] = item
+
+    def close(self):
+        """Close the target."""
+        self.target.close()
+        self.cog.part_closed()
+
+
+class CloudOptimizedGeoTIFF(object):
+    """Cloud optimized GeoTIFF assembled from an image and its overviews.
+
+    The full resolution image and every overview level are stored in parallel
+    to temporary tiled files of a directory next to *filename*, compressed
+    like *filename* unless its compression is lossy (``DEFLATE`` is used
+    then). Once they are all closed, they are copied once to *filename* with
+    the overviews first and internal tiling, as in a cloud optimized GeoTIFF,
+    and the temporary files are removed. They are also removed if the file is
+    never assembled, once this object is garbage collected.
+
+    The pixels are thus written twice, so this doesn't save I/O compared to a
+    GeoTIFF whose overviews are added by GDAL. GDAL compresses the temporary
+    files and the final copy with all the CPUs, unless ``num_threads`` is
+    given.
+    """
+
+    def __init__(self, filename, **gdal_options):
+        """Prepare the temporary directory of *filename*, to be created with *gdal_options*."""
+        self.filename = filename
+        self.gdal_options = gdal_options
+        self.gdal_options.setdefault('num_threads', 'ALL_CPUS')
+        self.tmp_options = self._get_tmp_options(self.gdal_options)
+        self.tmp_dir = tempfile.mkdtemp(prefix='.cog_', dir=os.path.dirname(os.path.abspath(filename)))
+        self._cleanup = weakref.finalize(self, shutil.rmtree, self.tmp_dir, ignore_errors=True)
+        self.base_filename = os.path.join(self.tmp_dir, 'image.tif')
+        self.overviews = []
+        self._open_parts = 0
+
+    @staticmethod
+    def _get_tmp_options(gdal_options):
+        """Get the GDAL options of the temporary files from the *gdal_options* of the final file."""
+        compress = str(gdal_options.get('compress', 'NONE')).upper()
+        if compress not in COG_LOSSLESS_COMPRESSIONS:
+            return {'compress': 'DEFLATE', 'num_threads': gdal_options['num_threads']}
+        return {key: val for key, val in gdal_options.items()
+                if key in ('compress', 'predictor', 'zlevel', 'num_threads')}
+
+    def cleanup(self):
+        """Remove the temporary files."""
+        self._cleanup()
+
+    def add_overviews(self, data, factors, resampling='nearest', fill_value=None, alpha=False):
+        """Add the overviews of the (bands, y, x) *data* at *factors*.
+
+        Each level is reduced from the previous one if possible. Returns the
+        sources and targets to store them.
+        """
+        sources = []
+        level, level_factor = data, 1
+        for factor in sorted(factors):
+            if factor % level_factor:
+                level, level_factor = data, 1
+            level = downsample(level, factor // level_factor, resampling, fill_value=fill_value, alpha=alpha)
+            level_factor = factor
+            sources.append(level)
+            self.overviews.append(_OverviewFile(os.path.join(self.tmp_dir, 'overview_{}.tif'.format(factor)),
+                                                level, **self.tmp_options))
+        return sources, self.wrap(self.overviews)
+
+    def wrap(self, targets):
+        """Wrap *targets* so the file is assembled once they are all closed."""
+        self._open_parts += len(targets)
+        return [_COGPart(target, self) for target in targets]
+
+    def part_closed(self):
+        """Assemble the file once all the parts are closed."""
+        self._open_parts -= 1
+        if self._open_parts == 0:
+            self.assemble()
+
+    def _make_vrt(self):
+        """Make a virtual dataset of the full resolution image with the overview levels."""
+        vrt_filename = os.path.join(self.tmp_dir, 'image.vrt')
+        rasterio.shutil.copy(self.base_filename, vrt_filename, driver='VRT')
+        tree = ET.parse(vrt_filename)
+        for band in tree.getroot().iter('VRTRasterBand'):
+            for overview in self.overviews:
+                element = ET.SubElement(band, 'Overview')
+                ET.SubElement(element, 'SourceFilename', relativeToVRT='1').text = os.path.basename(
+                    overview.filename)
+                ET.SubElement(element, 'SourceBand').text = band.get('band')
+        tree.write(vrt_filename)
+        return vrt_filename
+
+    def assemble(self):
+        """Copy the image and its overviews to the cloud optimized GeoTIFF."""
+        try:
+            vrt_filename = self._make_vrt()
+            LOG.debug("Assembling the cloud optimized GeoTIFF %s", self.filename)
+            options = {'blockxsize': COG_BLOCKSIZE, 'blockysize': COG_BLOCKSIZE}
+            options.update(self.gdal_options)
+            options.update({'tiled': True, 'copy_src_overviews': True})
+            rasterio.shutil.copy(vrt_filename, self.filename, driver='GTiff', **options)
+        finally:
+            self.cleanup()
+
 
 class GeoTIFFWriter(ImageWriter):
     """Writer to save GeoTIFF images.
@@ -43,6 +273,10 @@ class GeoTIFFWriter(ImageWriter):
         >>> scn.save_dataset(dataset_name, writer='geotiff',
         ...                  tags={'offset': 291.8, 'scale': -0.35})
 
+    Cloud optimized GeoTIFF with overviews made from the enhanced image:
+
+        >>> scn.save_datasets(writer='geotiff', cog=True, overviews=[2, 4, 8, 16])
+
     For performance tips on creating geotiffs quickly and making them smaller
     see the :doc:`faq`.
 
@@ -104,7 +338,7 @@ class GeoTIFFWriter(ImageWriter):
                    compute=True, keep_palette=False, cmap=None, tags=None,
                    overviews=None, overviews_minsize=256,
                    overviews_resampling=None, include_scale_offset=False,
-                   **kwargs):
+                   cog=False, **kwargs):
         """Save the image to the given ``filename`` in geotiff_ format.
 
         Note for faster output and reduced memory usage the ``rasterio``
@@ -170,6 +404,15 @@ class GeoTIFFWriter(ImageWriter):
             include_scale_offset (bool): Activate inclusion of scale and offset
                 factors in the geotiff to allow retrieving original values from
                 the pixel values. ``False`` by default.
+            cog (bool): Save a cloud optimized GeoTIFF: the overviews are
+                computed block by block from the enhanced image in the same
+                dask graph as the full resolution image, instead of by
+                re-reading the file once it is written, and the file is tiled
+                (512x512 by default) with the overviews first. Only `nearest`
+                and `average` overviews resampling are supported. Overviews
+                default to the powers of two down to `overviews_minsize`.
+                The image is written to compressed temporary files first, so
+                this doesn't save I/O. ``False`` by default.
 
         .. _geotiff: http://trac.osgeo.org/geotiff/
 
@@ -209,6 +452,10 @@ class GeoTIFFWriter(ImageWriter):
         if tags is None:
             tags = {}
         tags.update(self.tags)
+        if cog:
+            return self._save_cog(img, filename, fill_value, dtype, compute, keep_palette, cmap, tags,
+                                  include_scale_offset, overviews, overviews_minsize, overviews_resampling,
+                                  gdal_options)
         return img.save(filename, fformat='tif', fill_value=fill_value,
                         dtype=dtype, compute=compute,
                         keep_palette=keep_palette, cmap=cmap,
@@ -217,3 +464,40 @@ class GeoTIFFWriter(ImageWriter):
                         overviews_resampling=overviews_resampling,
                         overviews_minsize=overviews_minsize,
                         **gdal_options)
+
+    @staticmethod
+    def _save_cog(img, filename, fill_value, dtype, compute, keep_palette, cmap, tags, include_scale_offset,
+                  overviews, overviews_minsize, overviews_resampling, gdal_options):
+        """Save the image and its overviews as a cloud optimized GeoTIFF."""
+        resampling = overviews_resampling or 'nearest'
+        if resampling not in COG_RESAMPLINGS:
+            raise ValueError("Overviews resampling must be one of {} in COG mode".format(COG_RESAMPLINGS))
+        if keep_palette and resampling != 'nearest':
+            raise ValueError("Palette images only support 'nearest' overviews resampling")
+        if not np.issubdtype(dtype, np.floating):
+            gdal_options.setdefault('compress', 'DEFLATE')
+        # trollimage adds an alpha band to the integer images without fill value
+        alpha = img.mode.endswith('A') or (fill_value is None and not np.issubdtype(dtype, np.floating))
+        cog = CloudOptimizedGeoTIFF(filename, **gdal_options)
+        try:
+            # the full resolution image is stored compressed to a temporary file, then recompressed in the copy
+            to_store = img.save(cog.base_filename, fformat='tif', fill_value=fill_value,
+                                dtype=dtype, compute=False,
+                                keep_palette=keep_palette, cmap=cmap,
+                                tags=tags, include_scale_offset_tags=include_scale_offset,
+                                tiled=True, blockxsize=COG_BLOCKSIZE, blockysize=COG_BLOCKSIZE, **cog.tmp_options)
+            sources, targets = to_store
+            if not isinstance(sources, (list, tuple)):
+                sources, targets = [sources], [targets]
+            data = sources[0]
+            if not overviews:
+                overviews = get_overview_factors(data.shape[2], data.shape[1], overviews_minsize)
+            overview_sources, overview_targets = cog.add_overviews(data, overviews, resampling,
+                                                                   fill_value=fill_value, alpha=alpha)
+            to_store = (list(sources) + overview_sources, cog.wrap(targets) + overview_targets)
+            if compute:
+                return compute_writer_results([to_store])
+        except Exception:
+            cog.cleanup()
+            raise
+        return to_store
@@ -18,6 +18,11 @@
 """MITIFF writer objects for creating MITIFF files from `Dataset` objects."""
 
 import logging
+import os
+import tempfile
+import threading
+
+import dask.array as da
 import numpy as np
 
 from satpy.writers import ImageWriter
@@ -25,8 +30,6 @@ from satpy.writers import ImageWriter
 from satpy.writers import get_enhanced_image
 from satpy.dataset import DatasetID
 
-import dask
-
 IMAGEDESCRIPTION = 270
 
 LOG = logging.getLogger(__name__)
@@ -59,112 +62,102 @@ class MITIFFWriter(ImageWriter):
 
     def save_dataset(self, dataset, filename=None, fill_value=None,
                      compute=True, **kwargs):
-        """Save single dataset as mitiff file."""
-        LOG.debug("Starting in mitiff save_dataset ... ")
+        """Save single dataset as mitiff file.
 
-        def _delayed_create(create_opts, dataset):
-            try:
-                if 'palette' in kwargs:
-                    self.palette = kwargs['palette']
-                if 'platform_name' not in kwargs:
-                    kwargs['platform_name'] = dataset.attrs['platform_name']
-                if 'name' not in kwargs:
-                    kwargs['name'] = dataset.attrs['name']
-                if 'start_time' not in kwargs:
-                    kwargs['start_time'] = dataset.attrs['start_time']
-                if 'sensor' not in kwargs:
-                    kwargs['sensor'] = dataset.attrs['sensor']
-
-                # Sensor attrs could be set. MITIFFs needing to handle sensor can only have one sensor
-                # Assume the first value of set as the sensor.
-                if isinstance(kwargs['sensor'], set):
-                    LOG.warning('Sensor is set, will use the first value: %s', kwargs['sensor'])
-                    kwargs['sensor'] = (list(kwargs['sensor']))[0]
+        The data is written strip by strip while dask computes it, see
+        :class:`MITIFFStripWriter`. With ``compute=False`` the sources and
+        targets to pass to :func:`dask.array.store` are returned (see
+        :func:`~satpy.writers.compute_writer_results`).
 
-                try:
-                    self.mitiff_config[kwargs['sensor']] = dataset.attrs['metadata_requirements']['config']
-                    self.channel_order[kwargs['sensor']] = dataset.attrs['metadata_requirements']['order']
-                    self.file_pattern = dataset.attrs['metadata_requirements']['file_pattern']
-                except KeyError:
-                    # For some mitiff products this info is needed, for others not.
-                    # If needed you should know how to fix this
-                    pass
+        """
+        LOG.debug("Starting in mitiff save_dataset ... ")
 
-                try:
-                    self.translate_channel_name[kwargs['sensor']] = \
-                        dataset.attrs['metadata_requirements']['translate']
-                except KeyError:
-                    # For some mitiff products this info is needed, for others not.
-                    # If needed you should know how to fix this
-                    pass
+        if 'palette' in kwargs:
+            self.palette = kwargs['palette']
+        if 'platform_name' not in kwargs:
+            kwargs['platform_name'] = dataset.attrs['platform_name']
+        if 'name' not in kwargs:
+            kwargs['name'] = dataset.attrs['name']
+        if 'start_time' not in kwargs:
+            kwargs['start_time'] = dataset.attrs['start_time']
+        if 'sensor' not in kwargs:
+            kwargs['sensor'] = dataset.attrs['sensor']
+
+        # Sensor attrs could be set. MITIFFs needing to handle sensor can only have one sensor
+        # Assume the first value of set as the sensor.
+        if isinstance(kwargs['sensor'], set):
+            LOG.warning('Sensor is set, will use the first value: %s', kwargs['sensor'])
+            kwargs['sensor'] = (list(kwargs['sensor']))[0]
 
-                image_description = self._make_image_description(dataset, **kwargs)
-                gen_filename = filename or self.get_filename(**dataset.attrs)
-                LOG.info("Saving mitiff to: %s ...", gen_filename)
-                self._save_datasets_as_mitiff(dataset, image_description,
-                                              gen_filename, **kwargs)
-            except (KeyError, ValueError, RuntimeError):
-                raise
+        try:
+            self.mitiff_config[kwargs['sensor']] = dataset.attrs['metadata_requirements']['config']
+            self.channel_order[kwargs['sensor']] = dataset.attrs['metadata_requirements']['order']
+            self.file_pattern = dataset.attrs['metadata_requirements']['file_pattern']
+        except KeyError:
+            # For some mitiff products this info is needed, for others not.
+            # If needed you should know how to fix this
+            pass
 
-        create_opts = ()
-        delayed = dask.delayed(_delayed_create)(create_opts, dataset)
+        try:
+            self.translate_channel_name[kwargs['sensor']] = \
+                dataset.attrs['metadata_requirements']['translate']
+        except KeyError:
+            # For some mitiff products this info is needed, for others not.
+            # If needed you should know how to fix this
+            pass
 
-        if compute:
-            return delayed.compute()
-        return delayed
+        image_description = self._make_image_description(dataset, **kwargs)
+        gen_filename = filename or self.get_filename(**dataset.attrs)
+        LOG.info("Saving mitiff to: %s ...", gen_filename)
+        return self._save_datasets_as_mitiff(dataset, image_description,
+                                             gen_filename, compute=compute, **kwargs)
 
     def save_datasets(self, datasets, filename=None, fill_value=None,
                       compute=True, **kwargs):
-        """Save all datasets to one or more files."""
+        """Save all datasets to one or more files.
+
+        All the channels are computed in one dask graph and written strip by
+        strip, see :meth:`save_dataset`.
+
+        """
         LOG.debug("Starting in mitiff save_datasets ... ")
 
-        def _delayed_create(create_opts, datasets):
-            LOG.debug("create_opts: %s", create_opts)
-            try:
-                if 'platform_name' not in kwargs:
-                    kwargs['platform_name'] = datasets[0].attrs['platform_name']
-                if 'name' not in kwargs:
-                    kwargs['name'] = datasets[0].attrs['name']
-                if 'start_time' not in kwargs:
-                    kwargs['start_time'] = datasets[0].attrs['start_time']
-                if 'sensor' not in kwargs:
-                    kwargs['sensor'] = datasets[0].attrs['sensor']
-
-                # Sensor attrs could be set. MITIFFs needing to handle sensor can only have one sensor
-                # Assume the first value of set as the sensor.
-                if isinstance(kwargs['sensor'], set):
-                    LOG.warning('Sensor is set, will use the first value: %s', kwargs['sensor'])
-                    kwargs['sensor'] = (list(kwargs['sensor']))[0]
+        if 'platform_name' not in kwargs:
+            kwargs['platform_name'] = datasets[0].attrs['platform_name']
+        if 'name' not in kwargs:
+            kwargs['name'] = datasets[0].attrs['name']
+        if 'start_time' not in kwargs:
+            kwargs['start_time'] = datasets[0].attrs['start_time']
+        if 'sensor' not in kwargs:
+            kwargs['sensor'] = datasets[0].attrs['sensor']
+
+        # Sensor attrs could be set. MITIFFs needing to handle sensor can only have one sensor
+        # Assume the first value of set as the sensor.
+        if isinstance(kwargs['sensor'], set):
+            LOG.warning('Sensor is set, will use the first value: %s', kwargs['sensor'])
+            kwargs['sensor'] = (list(kwargs['sensor']))[0]
 
-                try:
-                    self.mitiff_config[kwargs['sensor']] = datasets[0].attrs['metadata_requirements']['config']
-                    translate = datasets[0].attrs['metadata_requirements']['translate']
-                    self.translate_channel_name[kwargs['sensor']] = translate
-                    self.channel_order[kwargs['sensor']] = datasets[0].attrs['metadata_requirements']['order']
-                    self.file_pattern = datasets[0].attrs['metadata_requirements']['file_pattern']
-                except KeyError:
-                    # For some mitiff products this info is needed, for others not.
-                    # If needed you should know how to fix this
-                    pass
-
-                image_description = self._make_image_description(datasets, **kwargs)
-                LOG.debug("File pattern %s", self.file_pattern)
-                if isinstance(datasets, list):
-                    kwargs['start_time'] = datasets[0].attrs['start_time']
-                else:
-                    kwargs['start_time'] = datasets.attrs['start_time']
-                gen_filename = filename or self.get_filename(**kwargs)
-                LOG.info("Saving mitiff to: %s ...", gen_filename)
-                self._save_datasets_as_mitiff(datasets, image_description, gen_filename, **kwargs)
-            except (KeyError, ValueError, RuntimeError):
-                raise
-
-        create_opts = ()
-        delayed = dask.delayed(_delayed_create)(create_opts, datasets)
-        LOG.debug("About to call delayed compute ...")
-        if compute:
-            return delayed.compute()
-        return delayed
+        try:
+            self.mitiff_config[kwargs['sensor']] = datasets[0].attrs['metadata_requirements']['config']
+            translate = datasets[0].attrs['metadata_requirements']['translate']
+            self.translate_channel_name[kwargs['sensor']] = translate
+            self.channel_order[kwargs['sensor']] = datasets[0].attrs['metadata_requirements']['order']
+            self.file_pattern = datasets[0].attrs['metadata_requirements']['file_pattern']
+        except KeyError:
+            # For some mitiff products this info is needed, for others not.
+            # If needed you should know how to fix this
+            pass
+
+        image_description = self._make_image_description(datasets, **kwargs)
+        LOG.debug("File pattern %s", self.file_pattern)
+        if isinstance(datasets, list):
+            kwargs['start_time'] = datasets[0].attrs['start_time']
+        else:
+            kwargs['start_time'] = datasets.attrs['start_time']
+        gen_filename = filename or self.get_filename(**kwargs)
+        LOG.info("Saving mitiff to: %s ...", gen_filename)
+        return self._save_datasets_as_mitiff(datasets, image_description, gen_filename,
+                                             compute=compute, **kwargs)
 
     def _make_channel_list(self, datasets, **kwargs):
         channels = []
@@ -609,69 +602,54 @@ class MITIFFWriter(ImageWriter):
             # If data is brightness temperature, the data must be inverted.
             reverse_offset = 255.
             reverse_scale = -1.
-            dataset.data += KELVIN_TO_CELSIUS
+            data = dataset.data + KELVIN_TO_CELSIUS
+        else:
+            data = dataset.data
 
         # Need to possible translate channels names from satpy to mitiff
-        _data = reverse_offset + reverse_scale * ((dataset.data - float(min_val)) /
+        _data = reverse_offset + reverse_scale * ((data - float(min_val)) /
                                                   (float(max_val) - float(min_val))) * 255.
         return _data.clip(0, 255)
 
-    def _save_as_palette(self, tif, datasets, **kwargs):
+    def _get_palette_page(self, datasets, **kwargs):
+        """Get the data and tags of the palette image."""
         # MITIFF palette has only one data channel
-        if len(datasets.dims) == 2:
-            LOG.debug("Palette ok with only 2 dimensions. ie only x and y")
-            # 3 = Palette color. In this model, a color is described with a single component.
-            # The value of the component is used as an index into the red, green and blue curves
-            # in the ColorMap field to retrieve an RGB triplet that defines the color. When
-            # PhotometricInterpretation=3 is used, ColorMap must be present and SamplesPerPixel must be 1.
-            tif.SetField('PHOTOMETRIC', 3)
-
-            # As write_image can not save tiff image as palette, this has to be done basicly
-            # ie. all needed tags needs to be set.
-            tif.SetField('IMAGEWIDTH', datasets.sizes['x'])
-            tif.SetField('IMAGELENGTH', datasets.sizes['y'])
-            tif.SetField('BITSPERSAMPLE', 8)
-            tif.SetField('COMPRESSION', tif.get_tag_define('deflate'))
-
-            if 'palette_color_map' in kwargs:
-                tif.SetField('COLORMAP', kwargs['palette_color_map'])
-            else:
-                LOG.ERROR("In a mitiff palette image a color map must be provided: palette_color_map is missing.")
-
-            data_type = np.uint8
-            # Looks like we need to pass the data to writeencodedstrip as ctypes
-            cont_data = np.ascontiguousarray(datasets.data, data_type)
-            tif.WriteEncodedStrip(0, cont_data.ctypes.data,
-                                  datasets.sizes['x'] * datasets.sizes['y'])
-            tif.WriteDirectory()
+        if len(datasets.dims) != 2:
+            return None
+        LOG.debug("Palette ok with only 2 dimensions. ie only x and y")
+        # 3 = Palette color. In this model, a color is described with a single component.
+        # The value of the component is used as an index into the red, green and blue curves
+        # in the ColorMap field to retrieve an RGB triplet that defines the color. When
+        # PhotometricInterpretation=3 is used, ColorMap must be present and SamplesPerPixel must be 1.
+        fields = {'PHOTOMETRIC': 3}
+        if 'palette_color_map' in kwargs:
+            fields['COLORMAP'] = kwargs['palette_color_map']
+        else:
+            LOG.error("In a mitiff palette image a color map must be provided: palette_color_map is missing.")
+        return datasets.data, fields
 
-    def _save_as_enhanced(self, tif, datasets, **kwargs):
-        """Save datasets as an enhanced RGB image."""
+    def _get_enhanced_pages(self, datasets, image_description, **kwargs):
+        """Get the image description and the bands of the enhanced RGB image."""
         img = get_enhanced_image(datasets.squeeze(), enhance=self.enhancer)
         if 'bands' in img.data.sizes and 'bands' not in datasets.sizes:
             LOG.debug("Datasets without 'bands' become image with 'bands' due to enhancement.")
             LOG.debug("Needs to regenerate mitiff image description")
             image_description = self._make_image_description(img.data, **kwargs)
-            tif.SetField(IMAGEDESCRIPTION, (image_description).encode('utf-8'))
+        pages = []
         for band in img.data['bands']:
             chn = img.data.sel(bands=band)
-            data = chn.values.clip(0, 1) * 254. + 1
-            data = data.clip(0, 255)
-            tif.write_image(data.astype(np.uint8), compression='deflate')
+            data = chn.data.clip(0, 1) * 254. + 1
+            pages.append((data.clip(0, 255), {}))
+        return image_description, pages
 
     def _save_datasets_as_mitiff(self, datasets, image_description,
-                                 gen_filename, **kwargs):
+                                 gen_filename, compute=True, **kwargs):
         """Put all together and save as a tiff file.
 
         Include the special tags making it a mitiff file.
 
         """
-        from libtiff import TIFF
-
-        tif = TIFF.open(gen_filename, mode='wb')
-
-        tif.SetField(IMAGEDESCRIPTION, (image_description).encode('utf-8'))
-
+        pages = []
         cns = self.translate_channel_name.get(kwargs['sensor'], {})
         if isinstance(datasets, list):
             LOG.debug("Saving datasets as list")
@@ -683,7 +661,7 @@ class MITIFFWriter(ImageWriter):
                         data = self._calibrate_data(dataset, dataset.attrs['calibration'],
                                                     self.mitiff_config[kwargs['sensor']][cn]['min-val'],
                                                     self.mitiff_config[kwargs['sensor']][cn]['max-val'])
-                        tif.write_image(data.astype(np.uint8), compression='deflate')
+                        pages.append((data, {}))
                         break
         elif 'dataset' in datasets.attrs['name']:
             LOG.debug("Saving %s as a dataset.", datasets.attrs['name'])
@@ -698,7 +676,7 @@ class MITIFFWriter(ImageWriter):
                                             self.mitiff_config[kwargs['sensor']][cn]['min-val'],
                                             self.mitiff_config[kwargs['sensor']][cn]['max-val'])
 
-                tif.write_image(data.astype(np.uint8), compression='deflate')
+                pages.append((data, {}))
             else:
                 for _cn_i, _cn in enumerate(self.channel_order[kwargs['sensor']]):
                     for band in datasets['bands']:
@@ -712,12 +690,155 @@ class MITIFFWriter(ImageWriter):
                                                         self.mitiff_config[kwargs['sensor']][cn]['min-val'],
                                                         self.mitiff_config[kwargs['sensor']][cn]['max-val'])
 
-                            tif.write_image(data.astype(np.uint8), compression='deflate')
+                            pages.append((data, {}))
                             break
         elif self.palette:
             LOG.debug("Saving dataset as palette.")
-            self._save_as_palette(tif, datasets, **kwargs)
+            page = self._get_palette_page(datasets, **kwargs)
+            if page is not None:
+                pages.append(page)
         else:
             LOG.debug("Saving datasets as enhanced image")
-            self._save_as_enhanced(tif, datasets, **kwargs)
-        del tif
+            image_description, pages = self._get_enhanced_pages(datasets, image_description, **kwargs)
+
+        writer = MITIFFStripWriter(gen_filename, image_description, pages)
+        if not compute:
+            return writer.sources, writer.targets
+        try:
+            da.store(writer.sources, writer.targets)
+        finally:
+            writer.close()
+
+
+class MITIFFStripWriter(object):
+    """Write the pages of a MITIFF file strip by strip while dask computes them.
+
+    Every page (one per channel) is written as 8-bit strips of the rows of
+    its chunks, so only the chunks being computed are held in memory. libtiff
+    writes the pages of a file one after the other: the strips of the page
+    being written go to the file as soon as they are computed, the strips of
+    the following pages are spilled to a temporary file per page, and copied
+    from there to the MITIFF file when their page comes.
+
+    The :attr:`sources` and :attr:`targets` are meant for
+    :func:`dask.array.store`, the file is complete once :meth:`close` is
+    called.
+
+    """
+
+    def __init__(self, filename, image_description, pages):
+        """Open *filename* to write the *pages*, a list of (data, tags) tuples."""
+        from libtiff import TIFF
+        self.sources = []
+        self.targets = []
+        self._fields = []
+        self._nstrips = []
+        self._shapes = []
+        for idx, (data, fields) in enumerate(pages):
+            data = da.asarray(data)
+            rows_per_strip = max(data.chunks[0][0], 1)
+            self.sources.append(data.rechunk((rows_per_strip, -1)).astype(np.uint8))
+            self.targets.append(_MITIFFPage(self, idx, rows_per_strip))
+            self._fields.append(dict(fields, ROWSPERSTRIP=rows_per_strip,
+                                     IMAGEWIDTH=data.shape[1], IMAGELENGTH=data.shape[0]))
+            self._nstrips.append(-(-data.shape[0] // rows_per_strip))
+            self._shapes.append(data.shape)
+        self._tmp_dir = os.path.dirname(os.path.abspath(filename))
+        self._tif = TIFF.open(filename, mode='wb')
+        self._tif.SetField(IMAGEDESCRIPTION, image_description.encode('utf-8'))
+        self._lock = threading.Lock()
+        self._page = 0
+        self._written = 0
+        # strip numbers of the following pages, and the files they are spilled to
+        self._pending = {}
+        self._spills = {}
+        if self._fields:
+            self._start_page()
+
+    def _start_page(self):
+        """Set the tags of the current page."""
+        tif = self._tif
+        fields = self._fields[self._page]
+        tif.SetField('BITSPERSAMPLE', 8)
+        tif.SetField('SAMPLESPERPIXEL', 1)
+        tif.SetField('SAMPLEFORMAT', 1)
+        tif.SetField('PHOTOMETRIC', fields.get('PHOTOMETRIC', 1))
+        tif.SetField('PLANARCONFIG', 1)
+        tif.SetField('COMPRESSION', tif.get_tag_define('deflate'))
+        for key, val in fields.items():
+            if key != 'PHOTOMETRIC':
+                tif.SetField(key, val)
+
+    def _flush(self):
+        """Write the pending strips of the current page and go to the next page once it's complete."""
+        while self._page < len(self._fields):
+            strips = sorted(self._pending.pop(self._page, ()))
+            if strips:
+                rows_per_strip = self._fields[self._page]['ROWSPERSTRIP']
+                spill, spilled = self._spills.pop(self._page)
+                for strip in strips:
+                    self._write_strip(strip, spilled[strip * rows_per_strip:(strip + 1) * rows_per_strip])
+                del spilled
+                spill.close()
+            if self._written < self._nstrips[self._page]:
+                return
+            self._tif.WriteDirectory()
+            self._page += 1
+            self._written = 0
+            if self._page < len(self._fields):
+                self._start_page()
+
+    def _write_strip(self, strip, data):
+        data = np.ascontiguousarray(data, np.uint8)
+        self._tif.WriteEncodedStrip(strip, data.ctypes.data, data.size)
+        self._written += 1
+
+    def _spill(self, page, strip, data):
+        """Keep the *strip* of *page* in the temporary file of *page* until *page* is written."""
+        try:
+            spilled = self._spills[page][1]
+        except KeyError:
+            spill = tempfile.TemporaryFile(dir=self._tmp_dir)
+            spilled = np.memmap(spill, dtype=np.uint8, mode='w+', shape=self._shapes[page])
+            self._spills[page] = (spill, spilled)
+        rows_per_strip = self._fields[page]['ROWSPERSTRIP']
+        spilled[strip * rows_per_strip:(strip + 1) * rows_per_strip] = data
+        self._pending.setdefault(page, set()).add(strip)
+
+    def write_strip(self, page, strip, data):
+        """Write the *strip* of *page*, or spill it until *page* is written."""
+        with self._lock:
+            if page == self._page:
+                self._write_strip(strip, data)
+                self._flush()
+            else:
+                self._spill(page, strip, data)
+
+    def close(self):
+        """Close the file."""
+        with self._lock:
+            if self._tif is None:
+                return
+            if self._pending:
+                LOG.warning("Closing %d unfinished MITIFF pages", len(self._pending))
+            for spill, _ in self._spills.values():
+                spill.close()
+            self._spills = {}
+            self._tif.close()
+            self._tif = None
+
+
+class _MITIFFPage(object):
+    """Target receiving the strips of a page from :func:`dask.array.store`."""
+
+    def __init__(self, writer, page, rows_per_strip):
+        self.writer = writer
+        self.page = page
+        self.rows_per_strip = rows_per_strip
+
+    def __setitem__(self, key, value):
+        rows = key[0]
+        self.writer.write_strip(self.page, rows.start // self.rows_per_strip, value)
+
+    def close(self):
+        self.writer.close()
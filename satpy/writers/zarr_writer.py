@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Writer for Zarr stores.
+
+The datasets are encoded like the :mod:`CF writer <satpy.writers.cf_writer>`
+does (attributes, grid mappings, lon/lats, time bounds, groups), but saved in
+a `Zarr`_ store. Every chunk of the datasets is a separate object of the
+store, so all the chunks are written in parallel without any lock and the
+store can be read lazily by dask, for example from an object storage:
+
+    >>> scn.save_datasets(writer='zarr', datasets=['VIS006', 'IR_108'], filename='seviri.zarr')
+    >>> ds = xr.open_zarr('seviri.zarr')
+
+The dask chunks become the chunks of the store. Irregular chunks (e.g. from
+segmented files) are rechunked to their largest size.
+
+Appending
+~~~~~~~~~
+
+Time slots can be gathered in one store with ``append_dim='time'``: the
+datasets get a time dimension from their ``start_time`` and are appended to
+the store if it already exists. This is convenient to archive the scenes of
+a :class:`~satpy.multiscene.MultiScene`:
+
+    >>> mscn.save_datasets(writer='zarr', filename='seviri_archive.zarr', append_dim='time')
+
+Metadata
+~~~~~~~~
+
+The metadata of all the groups and variables is consolidated in one object
+at the root of the store (``consolidated=True`` by default), so opening the
+store only needs one read.
+
+.. _Zarr: https://zarr.readthedocs.io/
+
+"""
+
+import logging
+from datetime import datetime
+
+import numpy as np
+import xarray as xr
+import zarr
+
+from satpy.writers.cf_writer import CFWriter, EPOCH, encode_attrs_nc
+from satpy.writers.utils import flatten_dict
+
+logger = logging.getLogger(__name__)
+
+
+def _store_exists(filename, **kwargs):
+    """Check if there is a zarr group at *filename*."""
+    try:
+        zarr.open_group(filename, mode='r', **kwargs)
+    except (KeyError, ValueError, OSError):
+        return False
+    return True
+
+
+def _with_regular_chunks(dataarray):
+    """Rechunk *dataarray* to chunks of the same size (but the last) as zarr requires."""
+    chunks = dataarray.chunks
+    if chunks is None:
+        return dataarray
+    if all(len(set(dim_chunks[:-1])) <= 1 and dim_chunks[-1] <= dim_chunks[0] for dim_chunks in chunks):
+        return dataarray
+    return dataarray.chunk({dim: max(dim_chunks) for dim, dim_chunks in zip(dataarray.dims, chunks)})
+
+
+def _add_time_dimension(dataarray):
+    """Add the ``start_time`` of *dataarray* as ``time`` coordinate, if it hasn't any."""
+    if 'time' in dataarray.coords or dataarray.attrs.get('start_time') is None:
+        return dataarray
+    return dataarray.assign_coords(time=np.datetime64(dataarray.attrs['start_time'], 'ns'))
+
+
+class ZarrWriter(CFWriter):
+    """Writer saving datasets to Zarr stores with CF metadata."""
+
+    def save_datasets(self, datasets, filename=None, groups=None, header_attrs=None, epoch=EPOCH,
+                      flatten_attrs=False, exclude_attrs=None, include_lonlats=True, pretty=False,
+                      compression=None, append_dim=None, consolidated=True, compute=True, **to_zarr_kwargs):
+        """Save the given datasets in one Zarr store.
+
+        Args:
+            datasets (list):
+                Datasets to be saved
+            filename (str):
+                Path or URL of the store
+            groups (dict):
+                Group datasets according to the given assignment: `{'group_name': ['dataset1', 'dataset2', ...]}`.
+                Group name `None` corresponds to the root of the store.
+            header_attrs:
+                Global attributes to be included
+            epoch (str):
+                Reference time for encoding of time coordinates
+            flatten_attrs (bool):
+                If True, flatten dict-type attributes
+            exclude_attrs (list):
+                List of dataset attributes to be excluded
+            include_lonlats (bool):
+                Always include latitude and longitude coordinates, even for datasets with area definition
+            pretty (bool):
+                Don't modify coordinate names, if possible.
+            compression (dict):
+                Zarr encoding of the datasets, for example ``{'compressor': numcodecs.Zstd(level=3)}``. By default
+                zarr's default compressor is used.
+            append_dim (str):
+                Dimension to append the datasets along if the store exists, usually 'time'. The datasets without
+                time coordinate get one from their ``start_time``.
+            consolidated (bool):
+                Consolidate the metadata of the whole store at its root.
+            compute (bool):
+                Write the data now, or return the :class:`dask.delayed.Delayed` objects writing it to be passed to
+                :func:`~satpy.writers.compute_writer_results`. The layout of the store is written in any case.
+            to_zarr_kwargs:
+                Passed to :meth:`xarray.Dataset.to_zarr`, e.g. ``storage_options``.
+
+        """
+        logger.info('Saving datasets to Zarr.')
+        for kwarg in ('overlay', 'decorate', 'config_files', 'engine'):
+            to_zarr_kwargs.pop(kwarg, None)
+        if append_dim == 'time':
+            datasets = [_add_time_dimension(dataset) for dataset in datasets]
+
+        if groups is None:
+            groups_ = {None: datasets}
+        else:
+            groups_ = {}
+            for dataset in datasets:
+                for group_name, group_members in groups.items():
+                    if dataset.attrs['name'] in group_members:
+                        groups_.setdefault(group_name, []).append(dataset)
+                        break
+
+        filename = filename or self.get_filename(**datasets[0].attrs)
+        encoding = {name: dict(enc) for name, enc in to_zarr_kwargs.pop('encoding', {}).items()}
+        if append_dim == 'time':
+            # appended time slots have to fit in the units of the first one
+            encoding.setdefault('time', {}).setdefault('units', epoch)
+        append = append_dim is not None and _store_exists(filename, **to_zarr_kwargs)
+
+        written = []
+        if not append:
+            root = xr.Dataset({}, attrs={})
+            if header_attrs is not None:
+                if flatten_attrs:
+                    header_attrs = flatten_dict(header_attrs)
+                root.attrs = encode_attrs_nc(header_attrs)
+            root.attrs['history'] = 'Created by pytroll/satpy on {}'.format(datetime.utcnow())
+            root.to_zarr(filename, mode='w', consolidated=False, **to_zarr_kwargs)
+
+        for group_name, group_datasets in groups_.items():
+            dataset = self._make_group_dataset(
+                group_datasets, group_name, epoch=epoch, flatten_attrs=flatten_attrs, exclude_attrs=exclude_attrs,
+                include_lonlats=include_lonlats, pretty=pretty, compression=compression)
+            dataset = dataset.map(_with_regular_chunks)
+            if append:
+                # the encoding of the existing variables is reused
+                written.append(dataset.to_zarr(filename, group=group_name, mode='a', append_dim=append_dim,
+                                               consolidated=False, compute=compute, **to_zarr_kwargs))
+            else:
+                group_encoding, _ = self.update_encoding(dataset, {'encoding': encoding})
+                written.append(dataset.to_zarr(filename, group=group_name, mode='a', encoding=group_encoding,
+                                               consolidated=False, compute=compute, **to_zarr_kwargs))
+
+        if consolidated:
+            # all the metadata is written, even if the data isn't computed yet
+            zarr.consolidate_metadata(self._get_store(filename, **to_zarr_kwargs))
+        return written if not compute else None
+
+    @staticmethod
+    def _get_store(filename, storage_options=None, **kwargs):
+        """Get the zarr store of *filename*."""
+        if storage_options:
+            return zarr.storage.FSStore(filename, **storage_options)
+        return filename
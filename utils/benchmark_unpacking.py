@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+# Copyright (c) 2020 Satpy developers
+#
+# This file is part of satpy.
+#
+# satpy is free software: you can redistribute it and/or modify it under the
+# terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# satpy is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR
+# A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License along with
+# satpy.  If not, see <http://www.gnu.org/licenses/>.
+"""Benchmark the unpacking of 10-bit SEVIRI data.
+
+The block-wise unpacking of :mod:`satpy.readers._unpack` is compared with the
+previous implementation of :func:`satpy.readers.seviri_base.dec10216` (dask
+operations on strided views of the bytes, stacked and rechunked to a single
+chunk), for the sizes of a HRIT segment, a full disk channel and a full disk
+HRV channel, given as one chunk (HRIT) or chunks of rows (native).
+
+python benchmark_unpacking.py -n 5
+
+"""
+
+import argparse
+import timeit
+
+import dask
+import dask.array as da
+import numpy as np
+
+from satpy.readers._unpack import unpack_bits
+
+SIZES = {'hrit_segment': (464, 3712),
+         'full_disk': (3712, 3712),
+         'full_disk_hrv': (11136, 5568)}
+
+
+def reference_dec10216(inbuf):
+    """Unpack 10-bit words as the previous `dec10216` did."""
+    arr10 = inbuf.astype(np.uint16)
+    arr16_len = int(len(arr10) * 4 / 5)
+    arr10_len = int((arr16_len * 5) / 4)
+    arr10 = arr10[:arr10_len]
+    arr10_0 = arr10[::5]
+    arr10_1 = arr10[1::5]
+    arr10_2 = arr10[2::5]
+    arr10_3 = arr10[3::5]
+    arr10_4 = arr10[4::5]
+    arr16_0 = (arr10_0 << 2) + (arr10_1 >> 6)
+    arr16_1 = ((arr10_1 & 63) << 4) + (arr10_2 >> 4)
+    arr16_2 = ((arr10_2 & 15) << 6) + (arr10_3 >> 2)
+    arr16_3 = ((arr10_3 & 3) << 8) + arr10_4
+    arr16 = da.stack([arr16_0, arr16_1, arr16_2, arr16_3], axis=-1).ravel()
+    return da.rechunk(arr16, arr16.shape[0])
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", "--number", type=int, default=3, help="Number of runs of each case")
+    parser.add_argument("-s", "--scheduler", default="threads", help="Dask scheduler to use")
+    args = parser.parse_args()
+
+    rng = np.random.RandomState(0)
+    print("{:<15} {:<8} {:>12} {:>12} {:>8}".format("size", "chunks", "previous (s)", "new (s)", "speedup"))
+    for name, (lines, cols) in SIZES.items():
+        line_bytes = cols * 10 // 8
+        packed = rng.randint(0, 256, lines * line_bytes).astype(np.uint8)
+        for chunking, chunks in (('single', packed.size), ('rows', 256 * line_bytes)):
+            arr = da.from_array(packed, chunks=chunks)
+            expected = reference_dec10216(arr)
+            result = unpack_bits(arr, 10)
+            np.testing.assert_array_equal(expected.compute(), result.compute())
+            with dask.config.set(scheduler=args.scheduler):
+                previous = min(timeit.repeat(lambda: reference_dec10216(arr).compute(),
+                                             number=1, repeat=args.number))
+                new = min(timeit.repeat(lambda: unpack_bits(arr, 10).compute(),
+                                        number=1, repeat=args.number))
+            print("{:<15} {:<8} {:>12.3f} {:>12.3f} {:>7.1f}x".format(name, chunking, previous, new, previous / new))
+
+
+if __name__ == '__main__':
+    main()